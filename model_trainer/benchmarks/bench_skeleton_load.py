@@ -0,0 +1,139 @@
+"""
+骨架資料載入：逐一解析 JSON（notebook 的 load_data）與 memory-map 資料集的比較。
+
+用法（於 model_trainer/ 目錄下執行）：
+    python -m benchmarks.bench_skeleton_load [--videos 300] [--frames 600]
+    python -m benchmarks.bench_skeleton_load --json-root outputs/skeletons/N01 --dataset outputs/skeletons/N01_npy
+
+未指定資料時在暫存目錄產生隨機骨架 JSON 並轉換。量測項目：
+- first window：每支影片取第一個偵測到人之後的 60 幀（notebook 訓練用的輸入）
+- all windows：每支影片所有 stride 10 的 60 幀視窗（評估用）
+檔案皆已在 page cache 中，比較的是解析與複製的成本；峰值記憶體以 tracemalloc 量測。
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+from skeleton_pipeline.convert import convert, discover_json
+from skeleton_pipeline.dataset import SkeletonDataset
+
+TIME_STEPS = 60
+STRIDE = 10
+
+def generate_json(root: str, videos: int, frames: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    for i in range(videos):
+        class_name = "fall" if i % 2 else "normal"
+        os.makedirs(os.path.join(root, class_name), exist_ok=True)
+        length = int(rng.integers(frames // 2, frames * 3 // 2))
+        data = rng.random((length, 33, 3)).astype(np.float32)
+        # 開頭幾幀偵測不到人
+        data[:int(rng.integers(0, 10))] = 0
+        with open(os.path.join(root, class_name, f"video_{i:04d}.json"), "w", encoding="utf-8") as f:
+            json.dump(data.tolist(), f)
+
+def pad_or_truncate(skeleton_data, time_steps):
+    """notebook 的 load_data 內的實作"""
+    idx = 0
+    while idx < len(skeleton_data) and all(tuple(pt) == (0, 0, 0) for pt in skeleton_data[idx]):
+        idx += 1
+    skeleton_data = skeleton_data[idx:]
+    if len(skeleton_data) >= time_steps:
+        return skeleton_data[:time_steps]
+    padding = [[(0, 0, 0)] * 33] * (time_steps - len(skeleton_data))
+    return skeleton_data + padding
+
+def json_first_window(files):
+    X = []
+    for _, path, _ in files:
+        with open(path, "r") as f:
+            X.append(pad_or_truncate(json.load(f), TIME_STEPS))
+    return np.array(X, dtype=np.float32)
+
+def json_all_windows(files):
+    total, checksum = 0, 0.0
+    for _, path, _ in files:
+        with open(path, "r") as f:
+            skeleton_data = json.load(f)
+        for start in range(0, len(skeleton_data) - TIME_STEPS + 1, STRIDE):
+            window = np.array(skeleton_data[start:start + TIME_STEPS], dtype=np.float32)
+            checksum += float(window[-1, 0, 0])
+            total += 1
+    return total, checksum
+
+def mmap_first_window(path):
+    dataset = SkeletonDataset(path)
+    X = np.zeros((len(dataset), TIME_STEPS, 33, 3), dtype=np.float32)
+    for i in range(len(dataset)):
+        frames = dataset.video(i, skip_leading_empty=True)[:TIME_STEPS]
+        X[i, :len(frames)] = frames
+    return X
+
+def mmap_all_windows(path):
+    dataset = SkeletonDataset(path)
+    total, checksum = 0, 0.0
+    for i in range(len(dataset)):
+        windows = dataset.windows(i, TIME_STEPS, STRIDE)
+        checksum += float(windows[:, -1, 0, 0].sum())
+        total += len(windows)
+    return total, checksum
+
+def measure(func, *args, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 1024 / 1024, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json-root", default=None)
+    parser.add_argument("--dataset", default=None)
+    parser.add_argument("--videos", type=int, default=300)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_root = args.json_root
+        if json_root is None:
+            json_root = os.path.join(tmp, "json")
+            generate_json(json_root, args.videos, args.frames)
+        files = discover_json(json_root, ["normal", "fall"])
+
+        dataset = args.dataset
+        if dataset is None:
+            dataset = os.path.join(tmp, "npy")
+            start = time.perf_counter()
+            convert(files, dataset)
+            print(f"convert: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+        json_mb = sum(os.path.getsize(path) for _, path, _ in files) / 1024 / 1024
+        npy_mb = os.path.getsize(os.path.join(dataset, "skeletons.npy")) / 1024 / 1024
+        print(f"videos={len(files)} json={json_mb:.1f}MB npy={npy_mb:.1f}MB", file=sys.stderr)
+
+        for name, legacy, mapped in (
+            ("first window", json_first_window, mmap_first_window),
+            ("all windows", json_all_windows, mmap_all_windows),
+        ):
+            t_json, m_json, r_json = measure(legacy, files, repeat=args.repeat)
+            t_mmap, m_mmap, r_mmap = measure(mapped, dataset, repeat=args.repeat)
+            if name == "first window":
+                assert np.array_equal(r_json, r_mmap), "first window 結果不一致"
+            else:
+                assert r_json[0] == r_mmap[0] and np.isclose(r_json[1], r_mmap[1]), "all windows 結果不一致"
+            print(f"{name:<13} json={t_json * 1000:9.1f}ms peak={m_json:7.1f}MB | "
+                  f"mmap={t_mmap * 1000:8.1f}ms peak={m_mmap:6.1f}MB | x{t_json / t_mmap:.0f}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+訓練視窗的產生方式比較：notebook 先以 Python list 建出所有視窗再 fit_transform，
+與 WindowGenerator 由 memmap 逐批產生（串流 fit scaler + 一個 epoch）。
+
+用法（於 model_trainer/ 目錄下執行）：
+    python -m benchmarks.bench_window_pipeline [--videos 60] [--frames 600] [--stride 10]
+    python -m benchmarks.bench_window_pipeline --dataset outputs/skeletons/N01_npy
+
+同時確認兩者產生的模型輸入數值一致；峰值記憶體以 tracemalloc 量測。
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from benchmarks.bench_skeleton_load import generate_json
+from skeleton_pipeline.convert import convert, discover_json
+from skeleton_pipeline.dataset import SkeletonDataset
+from skeleton_pipeline.windows import WindowGenerator, fit_scaler, window_index
+
+def calculate_acceleration(skeleton_data):
+    """notebook 的實作"""
+    acceleration = []
+    for i in range(1, len(skeleton_data)):
+        frame_accel = [
+            ((p2[0] - p1[0]) ** 2 + (p2[1] - p1[1]) ** 2) ** 0.5
+            for p1, p2 in zip(skeleton_data[i - 1], skeleton_data[i])
+        ]
+        acceleration.append(frame_accel)
+    return acceleration
+
+def legacy_windows(dataset, index):
+    """與 notebook 相同：所有視窗先轉成 list、逐幀 np.hstack，最後整批 fit_transform"""
+    X = []
+    for start, valid in zip(index.starts, index.valid):
+        window = dataset.frames[start:start + valid].tolist()
+        window += [[(0, 0, 0)] * 33] * (index.time_steps - valid)
+        accel = calculate_acceleration(window)
+        accel = [[0] * 33] * (index.time_steps - len(accel)) + accel
+        X.append([np.hstack((np.ravel(frame), a)) for frame, a in zip(window, accel)])
+    X = np.array(X)
+    scaler = MinMaxScaler()
+    X_norm = scaler.fit_transform(X.reshape(X.shape[0], -1))
+    return X_norm.reshape(X.shape[0], index.time_steps, -1), index.labels
+
+def streaming_windows(dataset, index, batch_size):
+    """串流 fit scaler 後跑一個 epoch，只保留 checksum"""
+    scaler = fit_scaler(dataset, index)
+    generator = WindowGenerator(dataset, index, scaler, batch_size=batch_size, shuffle=True, seed=0)
+    batches, checksum = 0, 0.0
+    for X, _ in generator():
+        checksum += float(X.sum(dtype=np.float64))
+        batches += 1
+    return batches, checksum
+
+def measure(func, *args):
+    start = time.perf_counter()
+    tracemalloc.start()
+    result = func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return time.perf_counter() - start, peak / 1024 / 1024, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default=None)
+    parser.add_argument("--videos", type=int, default=60)
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--time-steps", type=int, default=60)
+    parser.add_argument("--stride", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.dataset
+        if path is None:
+            json_root = os.path.join(tmp, "json")
+            generate_json(json_root, args.videos, args.frames)
+            path = os.path.join(tmp, "npy")
+            convert(discover_json(json_root, ["normal", "fall"]), path)
+
+        dataset = SkeletonDataset(path)
+        index = window_index(dataset, args.time_steps, args.stride)
+        print(f"videos={len(dataset)} windows={len(index)} T={args.time_steps} stride={args.stride}",
+              file=sys.stderr)
+
+        t_legacy, m_legacy, (X_legacy, _) = measure(legacy_windows, dataset, index)
+        t_stream, m_stream, (batches, checksum) = measure(streaming_windows, dataset, index, args.batch_size)
+
+        # 數值一致性：不 shuffle 時逐批結果應與 notebook 的 fit_transform 相同
+        scaler = fit_scaler(dataset, index)
+        X_stream = np.concatenate([X for X, _ in WindowGenerator(dataset, index, scaler, shuffle=False)()])
+        max_diff = float(np.abs(X_stream - X_legacy).max())
+        assert max_diff < 1e-4, f"模型輸入不一致（max diff {max_diff}）"
+        assert np.isclose(checksum, X_legacy.sum(dtype=np.float64), rtol=1e-4)
+
+        print(f"legacy (lists + fit_transform): {t_legacy:7.2f}s peak={m_legacy:8.1f}MB", file=sys.stderr)
+        print(f"streaming ({batches} batches):   {t_stream:7.2f}s peak={m_stream:8.1f}MB  "
+              f"x{t_legacy / t_stream:.0f} faster, max diff={max_diff:.2e}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
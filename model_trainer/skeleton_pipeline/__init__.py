@@ -0,0 +1,9 @@
+"""
+離線訓練資料處理工具（在 model_trainer/ 目錄下執行）：
+
+    python -m skeleton_pipeline.extract      # 影片 → 每支影片一個骨架 JSON
+    python -m skeleton_pipeline.convert      # 骨架 JSON → memory-map 資料集（SkeletonDataset）
+    python -m skeleton_pipeline.train        # 由資料集串流產生視窗訓練模型
+"""
+from .config import CLASS_LABELS, NUM_LANDMARKS, VIDEO_EXTENSIONS
+from .dataset import SkeletonDataset
@@ -0,0 +1,52 @@
+"""
+訓練視窗的資料擴增（對應 notebook 的 apply_all_augmentations_for_normal / apply_all_augmentations_for_fall）：
+
+- mirror：左右鏡像，x → 1 - x
+- noise：x、y 各加上 ±noise_level 的均勻雜訊後限制在 [0, 1]
+
+notebook 兩個類別都回傳 [原始, 鏡像, 雜訊] 三個版本（加速 / 減速版本有計算但沒有使用，這裡不移植）。
+與 notebook 不同的是偵測不到人的幀（全 0）維持全 0，不會被鏡像成 x=1 或加上雜訊，
+補 0 的幀因此與未擴增的視窗一致。
+
+擴增在每一批讀出後就地套用，不需要先把擴增版本寫到磁碟或放進記憶體。
+"""
+import numpy as np
+
+VARIANT_ORIGINAL = 0
+VARIANT_MIRROR = 1
+VARIANT_NOISE = 2
+
+AUGMENTATIONS = {
+    "mirror": VARIANT_MIRROR,
+    "noise": VARIANT_NOISE,
+}
+# notebook 兩個類別使用相同的擴增
+DEFAULT_AUGMENTATIONS = ("mirror", "noise")
+NOISE_LEVEL = 0.01
+
+def _detected(skeleton: np.ndarray) -> np.ndarray:
+    """(..., 33, 3) → (..., 1, 1) 的遮罩，該幀有偵測到人時為 True"""
+    return skeleton.reshape(skeleton.shape[:-2] + (-1,)).any(axis=-1)[..., None, None]
+
+def mirror_skeleton(skeleton: np.ndarray) -> np.ndarray:
+    """就地左右鏡像 (..., 33, 3)，回傳同一個陣列"""
+    skeleton[..., 0] = np.where(_detected(skeleton)[..., 0], 1 - skeleton[..., 0], 0)
+    return skeleton
+
+def add_noise_skeleton(skeleton: np.ndarray, rng: np.random.Generator,
+                       noise_level: float = NOISE_LEVEL) -> np.ndarray:
+    """就地在 x、y 加上均勻雜訊 (..., 33, 3)，回傳同一個陣列"""
+    detected = _detected(skeleton)
+    noise = rng.uniform(-noise_level, noise_level, size=skeleton[..., :2].shape).astype(skeleton.dtype)
+    skeleton[..., :2] = np.where(detected, np.clip(skeleton[..., :2] + noise, 0, 1), 0)
+    return skeleton
+
+def apply_variants(skeleton: np.ndarray, variants: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """依每個視窗的 variant 編號就地擴增 (B, T, 33, 3)"""
+    mirror = variants == VARIANT_MIRROR
+    if mirror.any():
+        skeleton[mirror] = mirror_skeleton(skeleton[mirror])
+    noise = variants == VARIANT_NOISE
+    if noise.any():
+        skeleton[noise] = add_noise_skeleton(skeleton[noise], rng)
+    return skeleton
@@ -0,0 +1,13 @@
+"""與訓練 notebook 相同的預設路徑與常數（路徑相對於 model_trainer/）"""
+
+# 原始影片：medias/train_video/<類別>/*.mp4
+VIDEO_ROOT = "medias/train_video"
+# 骨架 JSON：outputs/skeletons/N01/<類別>/<影片檔名>.json
+SKELETON_ROOT = "outputs/skeletons/N01"
+
+# 類別資料夾名稱 → 標籤（與 notebook 的 load_data 相同：normal=0、fall=1）
+CLASS_LABELS = {"normal": 0, "fall": 1}
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+
+# MediaPipe Pose 的關鍵點數量，每點為 (x, y, visibility)
+NUM_LANDMARKS = 33
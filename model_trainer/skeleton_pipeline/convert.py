@@ -0,0 +1,122 @@
+"""
+把 skeleton_pipeline.extract / notebook 產生的骨架 JSON 轉成 memory-map 資料集（見 dataset.py）：
+
+    cd model_trainer
+    python -m skeleton_pipeline.convert [--json-root outputs/skeletons/N01] [--output outputs/skeletons/N01_npy]
+
+每次只解析一個 JSON 並附加寫入暫存檔，記憶體用量與資料集大小無關。
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import List
+import numpy as np
+from .config import CLASS_LABELS, SKELETON_ROOT
+from .dataset import DTYPE, FRAME_SHAPE, FRAMES_NAME, INDEX_NAME, INDEX_VERSION, count_leading_empty
+
+DATASET_ROOT = f"{SKELETON_ROOT}_npy"
+# 由暫存檔複製到 .npy 時每次處理的幀數
+COPY_CHUNK_FRAMES = 65536
+
+def load_skeleton_json(path: str) -> np.ndarray:
+    """讀取一支影片的骨架 JSON，回傳 float32 (幀數, 33, 3)"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    frames = np.asarray(data, dtype=DTYPE)
+    if frames.size == 0:
+        return np.empty((0,) + FRAME_SHAPE, dtype=DTYPE)
+    if frames.shape[1:] != FRAME_SHAPE:
+        raise ValueError(f"{path} 的骨架格式不符：{frames.shape}")
+    return frames
+
+def discover_json(json_root: str, classes: List[str]) -> List[tuple]:
+    """回傳 [(名稱, JSON 路徑, 標籤)]，依路徑排序"""
+    files = []
+    for class_name in classes:
+        folder = os.path.join(json_root, class_name)
+        if not os.path.isdir(folder):
+            print(f"⚠️ 找不到骨架資料夾：{folder}", file=sys.stderr)
+            continue
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(".json"):
+                files.append((f"{class_name}/{os.path.splitext(name)[0]}", os.path.join(folder, name),
+                              CLASS_LABELS[class_name]))
+    return files
+
+def convert(files: List[tuple], output: str) -> dict:
+    """
+    轉換 JSON 為資料集並回傳索引內容。
+    先把每支影片的 float32 資料依序附加到暫存檔，得知總幀數後再寫成 .npy，
+    skeletons.npy 與 index.json 都先寫成 .part，完成後才改名，index.json 最後替換：
+    中途中斷時舊的 index.json 不會搭配到不完整的資料，兩者不一致時 SkeletonDataset 會拒絕載入。
+    """
+    os.makedirs(output, exist_ok=True)
+    videos = []
+    total = 0
+    fd, raw_path = tempfile.mkstemp(prefix=".skeletons.", suffix=".raw", dir=output)
+    npy_part = os.path.join(output, f".{FRAMES_NAME}.part")
+    index_part = os.path.join(output, f".{INDEX_NAME}.part")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            for name, path, label in files:
+                frames = load_skeleton_json(path)
+                raw.write(np.ascontiguousarray(frames).tobytes())
+                videos.append({
+                    "name": name,
+                    "label": label,
+                    "offset": total,
+                    "frames": len(frames),
+                    "leading_empty": count_leading_empty(frames),
+                })
+                total += len(frames)
+
+        shape = (total,) + FRAME_SHAPE
+        target = np.lib.format.open_memmap(npy_part, mode="w+", dtype=DTYPE, shape=shape)
+        if total:
+            source = np.memmap(raw_path, dtype=DTYPE, mode="r", shape=shape)
+            for start in range(0, total, COPY_CHUNK_FRAMES):
+                target[start:start + COPY_CHUNK_FRAMES] = source[start:start + COPY_CHUNK_FRAMES]
+            del source
+        target.flush()
+        del target
+
+        index = {
+            "version": INDEX_VERSION,
+            "dtype": np.dtype(DTYPE).name,
+            "frame_shape": list(FRAME_SHAPE),
+            "total_frames": total,
+            "videos": videos,
+        }
+        with open(index_part, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+        os.replace(npy_part, os.path.join(output, FRAMES_NAME))
+        os.replace(index_part, os.path.join(output, INDEX_NAME))
+    finally:
+        for path in (raw_path, npy_part, index_part):
+            if os.path.exists(path):
+                os.remove(path)
+    return index
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="骨架 JSON 轉換為 memory-map 資料集")
+    parser.add_argument("--json-root", default=SKELETON_ROOT, help=f"骨架 JSON 目錄（預設 {SKELETON_ROOT}）")
+    parser.add_argument("--output", default=DATASET_ROOT, help=f"資料集輸出目錄（預設 {DATASET_ROOT}）")
+    parser.add_argument("--classes", nargs="+", default=list(CLASS_LABELS), choices=list(CLASS_LABELS))
+    args = parser.parse_args(argv)
+
+    files = discover_json(args.json_root, args.classes)
+    if not files:
+        print("❌ 沒有可轉換的骨架 JSON", file=sys.stderr)
+        return 1
+    start = time.perf_counter()
+    index = convert(files, args.output)
+    size_mb = os.path.getsize(os.path.join(args.output, FRAMES_NAME)) / 1024 / 1024
+    print(f"已轉換 {len(index['videos'])} 支影片、{index['total_frames']} 幀 → {args.output} "
+          f"（{size_mb:.1f} MB，{time.perf_counter() - start:.1f} 秒）", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
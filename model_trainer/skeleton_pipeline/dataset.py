@@ -0,0 +1,94 @@
+"""
+以 memory-map 讀取的骨架資料集，取代每次訓練前重新解析所有骨架 JSON：
+
+    <dataset>/skeletons.npy   float32 (總幀數, 33, 3)，所有影片依序首尾相接
+    <dataset>/index.json      每支影片的起始位置（offset）、幀數、標籤與名稱
+
+讀取時以 np.load(mmap_mode="r") 開啟，取影片或滑動視窗都是原陣列的 view，不會複製資料，
+也只有實際用到的部分才會從磁碟讀入。
+"""
+import os
+import json
+from typing import List, NamedTuple
+import numpy as np
+from .config import NUM_LANDMARKS
+
+FRAMES_NAME = "skeletons.npy"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+FRAME_SHAPE = (NUM_LANDMARKS, 3)
+DTYPE = np.float32
+
+class VideoEntry(NamedTuple):
+    name: str           # <類別>/<影片檔名>（不含副檔名）
+    label: int
+    offset: int         # 在 skeletons.npy 中的第一幀
+    frames: int
+    leading_empty: int  # 開頭偵測不到人（全為 0）的幀數，對應 notebook 的 pad_or_truncate
+
+def count_leading_empty(frames: np.ndarray) -> int:
+    """開頭連續全為 0 的幀數"""
+    if len(frames) == 0:
+        return 0
+    detected = np.flatnonzero(frames.reshape(len(frames), -1).any(axis=1))
+    return int(detected[0]) if len(detected) else len(frames)
+
+def read_index(path: str) -> List[VideoEntry]:
+    with open(os.path.join(path, INDEX_NAME), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != INDEX_VERSION:
+        raise ValueError(f"不支援的資料集索引版本：{data.get('version')}")
+    return [VideoEntry(**video) for video in data["videos"]]
+
+class SkeletonDataset:
+    """
+    唯讀的骨架資料集：
+
+        dataset = SkeletonDataset("outputs/skeletons/N01_npy")
+        frames = dataset.video(0)                    # (幀數, 33, 3) 的 view
+        windows = dataset.windows(0, 60, stride=10)  # (視窗數, 60, 33, 3) 的 view
+    """
+    def __init__(self, path: str, mmap_mode: str = "r"):
+        self.path = path
+        self.entries = read_index(path)
+        self.frames = np.load(os.path.join(path, FRAMES_NAME), mmap_mode=mmap_mode)
+        if self.frames.shape[1:] != FRAME_SHAPE or self.frames.dtype != DTYPE:
+            raise ValueError(f"骨架資料格式不符：{self.frames.shape} {self.frames.dtype}")
+        self.labels = np.array([entry.label for entry in self.entries], dtype=np.int64)
+        self.offsets = np.array([entry.offset for entry in self.entries], dtype=np.int64)
+        self.lengths = np.array([entry.frames for entry in self.entries], dtype=np.int64)
+        # 轉換中途中斷時 skeletons.npy 可能已換新而 index.json 仍是舊的
+        if int(self.lengths.sum()) != len(self.frames):
+            raise ValueError(f"索引與骨架資料不一致：索引 {int(self.lengths.sum())} 幀，資料 {len(self.frames)} 幀，請重新轉換")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def names(self) -> List[str]:
+        return [entry.name for entry in self.entries]
+
+    def video(self, index: int, skip_leading_empty: bool = False) -> np.ndarray:
+        """一支影片的所有幀（view）；skip_leading_empty 時從第一個偵測到人的幀開始"""
+        entry = self.entries[index]
+        start = entry.offset + (entry.leading_empty if skip_leading_empty else 0)
+        return self.frames[start:entry.offset + entry.frames]
+
+    def window(self, index: int, start: int, length: int) -> np.ndarray:
+        """影片中從 start 開始、長度 length 的片段（view），超出影片長度時拋出 IndexError"""
+        entry = self.entries[index]
+        if start < 0 or start + length > entry.frames:
+            raise IndexError(f"視窗 [{start}, {start + length}) 超出影片 {entry.name} 的 {entry.frames} 幀")
+        return self.frames[entry.offset + start:entry.offset + start + length]
+
+    def windows(self, index: int, length: int, stride: int = 1, skip_leading_empty: bool = False) -> np.ndarray:
+        """
+        影片的所有滑動視窗，形狀 (視窗數, length, 33, 3)，為原陣列的 strided view；
+        影片短於 length 時回傳 0 個視窗。
+        """
+        frames = self.video(index, skip_leading_empty)
+        if len(frames) < length:
+            return np.empty((0, length) + FRAME_SHAPE, dtype=DTYPE)
+        view = np.lib.stride_tricks.sliding_window_view(frames, length, axis=0)
+        # sliding_window_view 把視窗維度放在最後：(視窗數, 33, 3, length) → (視窗數, length, 33, 3)
+        return np.moveaxis(view, -1, 1)[::stride]
@@ -0,0 +1,198 @@
+"""
+批次擷取訓練影片的骨架資料，取代在 notebook 中逐支執行 process_and_save_skeleton_data：
+
+    cd model_trainer
+    python -m skeleton_pipeline.extract --workers 6
+
+- 以 process pool 同時處理多支影片，每個 worker 各自載入 cv2 / MediaPipe Pose
+- 輸出格式與 notebook 相同：每支影片一個 JSON，內容為每幀 33 個 (x, y, visibility)，
+  偵測不到人的幀補 (0, 0, 0)
+- manifest 記錄每支影片的內容 hash 與結果，每完成一支就寫入；
+  重新執行時略過內容未變更且已完成的影片，中斷後可直接接續
+"""
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, NamedTuple
+from .config import CLASS_LABELS, NUM_LANDMARKS, SKELETON_ROOT, VIDEO_EXTENSIONS, VIDEO_ROOT
+from .files import atomic_write_json
+from .manifest import STATUS_DONE, STATUS_FAILED, Manifest
+
+MANIFEST_NAME = "manifest.json"
+
+class VideoTask(NamedTuple):
+    key: str            # 相對於影片根目錄的路徑，例如 fall/IMG_0001.mp4
+    video_path: str
+    output: str         # 相對於輸出根目錄的路徑，例如 fall/IMG_0001.json
+    output_path: str
+    label: int
+    sha256: str
+
+# ---- worker 行程 ----
+
+def _init_worker():
+    """
+    worker 行程啟動時才載入 cv2 / mediapipe，主行程不需要這些套件。
+    每個 worker 只用一條 OpenCV 執行緒，平行度由 process pool 決定，避免互搶 CPU。
+    """
+    import cv2
+    cv2.setNumThreads(1)
+
+def _extract_frames(video_path: str) -> List[list]:
+    import cv2
+    import numpy as np
+    import mediapipe as mp
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"無法開啟影片：{video_path}")
+
+    empty_frame = [(0, 0, 0)] * NUM_LANDMARKS
+    skeleton_data = []
+    # 每支影片使用新的 Pose，追蹤狀態不會延續到下一支影片
+    with mp.solutions.pose.Pose() as pose:
+        try:
+            while True:
+                success, frame = cap.read()
+                if not success or frame is None:
+                    break
+                rgb_image = np.ascontiguousarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                results = pose.process(rgb_image)
+                if results.pose_landmarks:
+                    skeleton_data.append([(lm.x, lm.y, lm.visibility) for lm in results.pose_landmarks.landmark])
+                else:
+                    skeleton_data.append(empty_frame)
+        finally:
+            cap.release()
+    return skeleton_data
+
+def process_video(video_path: str, output_path: str) -> dict:
+    """擷取一支影片的骨架並寫入 JSON，回傳幀數與耗時"""
+    start = time.perf_counter()
+    skeleton_data = _extract_frames(video_path)
+    atomic_write_json(output_path, skeleton_data)
+    return {"frames": len(skeleton_data), "seconds": time.perf_counter() - start}
+
+# ---- 主行程 ----
+
+def discover_videos(video_root: str, classes: List[str]) -> List[tuple]:
+    """回傳 [(key, 影片路徑, 類別)]，依路徑排序讓每次執行的順序一致"""
+    videos = []
+    for class_name in classes:
+        folder = os.path.join(video_root, class_name)
+        if not os.path.isdir(folder):
+            print(f"⚠️ 找不到影片資料夾：{folder}", file=sys.stderr)
+            continue
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(VIDEO_EXTENSIONS):
+                videos.append((f"{class_name}/{name}", os.path.join(folder, name), class_name))
+    return videos
+
+def plan_tasks(videos: List[tuple], manifest: Manifest, output_root: str, force: bool = False):
+    """計算內容 hash，分成需要處理與可略過的影片"""
+    tasks, skipped = [], []
+    for key, video_path, class_name in videos:
+        sha256 = manifest.content_hash(key, video_path)
+        if not force and manifest.is_current(key, sha256, output_root):
+            skipped.append(key)
+            continue
+        output = f"{class_name}/{os.path.splitext(os.path.basename(video_path))[0]}.json"
+        tasks.append(VideoTask(
+            key=key,
+            video_path=video_path,
+            output=output,
+            output_path=os.path.join(output_root, output),
+            label=CLASS_LABELS[class_name],
+            sha256=sha256,
+        ))
+    return tasks, skipped
+
+class Progress:
+    """顯示完成數量與吞吐量（影片/秒、幀/秒）"""
+    def __init__(self, total: int, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.done = 0
+        self.failed = 0
+        self.frames = 0
+        self.started = time.perf_counter()
+
+    def update(self, key: str, frames: int = 0, error: str = None):
+        self.done += 1
+        self.frames += frames
+        if error:
+            self.failed += 1
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        result = f"❌ {error}" if error else f"{frames} frames"
+        print(
+            f"[{self.done}/{self.total}] {key}: {result} | "
+            f"{self.done / elapsed:.2f} videos/s, {self.frames / elapsed:.1f} frames/s",
+            file=self.stream, flush=True
+        )
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        return (
+            f"完成 {self.done - self.failed} 支、失敗 {self.failed} 支，共 {self.frames} 幀，"
+            f"耗時 {elapsed:.1f} 秒（{self.done / max(elapsed, 1e-9):.2f} videos/s，"
+            f"{self.frames / max(elapsed, 1e-9):.1f} frames/s）"
+        )
+
+def run(tasks: List[VideoTask], manifest: Manifest, workers: int, progress: Progress):
+    """在 process pool 中處理影片，每完成一支就更新 manifest"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(process_video, task.video_path, task.output_path): task for task in tasks}
+        try:
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    manifest.record(task.key, task.video_path, task.sha256, STATUS_FAILED, None, task.label,
+                                    error=str(e))
+                    progress.update(task.key, error=str(e))
+                else:
+                    manifest.record(task.key, task.video_path, task.sha256, STATUS_DONE, task.output, task.label,
+                                    frames=result["frames"], seconds=result["seconds"])
+                    progress.update(task.key, frames=result["frames"])
+                manifest.save()
+        except KeyboardInterrupt:
+            # 已完成的影片都已寫入 manifest，下次執行會從剩下的影片繼續
+            for future in futures:
+                future.cancel()
+            raise
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="批次擷取訓練影片的 MediaPipe 骨架資料")
+    parser.add_argument("--video-root", default=VIDEO_ROOT, help=f"影片根目錄（預設 {VIDEO_ROOT}）")
+    parser.add_argument("--output-root", default=SKELETON_ROOT, help=f"骨架 JSON 輸出目錄（預設 {SKELETON_ROOT}）")
+    parser.add_argument("--classes", nargs="+", default=list(CLASS_LABELS), choices=list(CLASS_LABELS),
+                        help="要處理的類別資料夾")
+    parser.add_argument("--manifest", default=None, help=f"manifest 路徑（預設 <output-root>/{MANIFEST_NAME}）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="同時處理的影片數")
+    parser.add_argument("--force", action="store_true", help="忽略 manifest，全部重新處理")
+    return parser
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    manifest = Manifest.load(args.manifest or os.path.join(args.output_root, MANIFEST_NAME))
+
+    videos = discover_videos(args.video_root, args.classes)
+    tasks, skipped = plan_tasks(videos, manifest, args.output_root, force=args.force)
+    print(f"共 {len(videos)} 支影片：{len(tasks)} 支待處理，{len(skipped)} 支未變更略過", file=sys.stderr)
+    if not tasks:
+        return 0
+
+    progress = Progress(len(tasks))
+    try:
+        run(tasks, manifest, max(1, args.workers), progress)
+    except KeyboardInterrupt:
+        print(f"\n已中斷，{progress.summary()}；重新執行即可接續", file=sys.stderr)
+        return 130
+    print(progress.summary(), file=sys.stderr)
+    return 1 if progress.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+模型特徵計算使用與 server 推論相同的實作（pose_normalize.py），
+確保訓練與線上推論的特徵（座標 + 相鄰幀位移、scaler 縮放）完全一致。
+
+skeleton_pipeline/pose_normalize.py 是 server/app/utils/pose_normalize.py 的複本（只依賴 numpy），
+model_trainer 不需要 server 的原始碼或 app 套件即可執行；
+兩份檔案必須保持相同，由 model_trainer/tests/test_pose_normalize_copy.py 檢查。
+"""
+from .pose_normalize import FEATURE_DIM, build_features, prepare_model_inputs, scale_features
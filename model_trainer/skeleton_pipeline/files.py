@@ -0,0 +1,32 @@
+import os
+import json
+import hashlib
+import tempfile
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def file_sha256(path: str) -> str:
+    """分段讀取計算檔案內容的 sha256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def atomic_write_json(path: str, data, **dump_kwargs):
+    """
+    先寫入同資料夾的暫存檔再以 os.replace 改名，
+    中途中斷時 path 仍是上一次完整的內容。
+    """
+    dest_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, part_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".part", dir=dest_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.chmod(part_path, 0o644)
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
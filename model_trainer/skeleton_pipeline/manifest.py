@@ -0,0 +1,77 @@
+import os
+import json
+import time
+from typing import Dict, Optional
+from .files import atomic_write_json, file_sha256
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+class Manifest:
+    """
+    記錄每支影片的處理結果，讓中斷的批次可以接續執行：
+
+        {"version": 1, "videos": {"fall/IMG_0001.mp4": {
+            "sha256": ..., "size": ..., "mtime_ns": ..., "status": "done",
+            "output": "fall/IMG_0001.json", "frames": 412, "label": 1, "seconds": 8.2}}}
+
+    key 與 output 皆為相對路徑（分別相對於影片根目錄與輸出根目錄），搬移整個資料夾後仍可沿用。
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, videos: Dict[str, dict] = None):
+        self.path = path
+        self.videos = videos or {}
+
+    @classmethod
+    def load(cls, path: str) -> "Manifest":
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != cls.VERSION:
+            raise ValueError(f"不支援的 manifest 版本：{data.get('version')}")
+        return cls(path, data.get("videos", {}))
+
+    def save(self):
+        """每處理完一支影片就寫入一次，以原子性改名避免中斷時留下損壞的 manifest"""
+        atomic_write_json(self.path, {"version": self.VERSION, "videos": self.videos}, ensure_ascii=False, indent=1)
+
+    def content_hash(self, key: str, video_path: str) -> str:
+        """
+        影片內容的 sha256；大小與修改時間都和上次相同時直接沿用記錄的值，
+        避免每次執行都重新讀完所有影片。
+        """
+        stat = os.stat(video_path)
+        entry = self.videos.get(key)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return entry["sha256"]
+        return file_sha256(video_path)
+
+    def is_current(self, key: str, sha256: str, output_root: str) -> bool:
+        """影片內容未變更、上次處理成功且輸出檔仍存在"""
+        entry = self.videos.get(key)
+        return (
+            entry is not None
+            and entry.get("status") == STATUS_DONE
+            and entry.get("sha256") == sha256
+            and os.path.exists(os.path.join(output_root, entry["output"]))
+        )
+
+    def record(self, key: str, video_path: str, sha256: str, status: str, output: Optional[str],
+               label: int, frames: int = 0, seconds: float = 0.0, error: str = None):
+        stat = os.stat(video_path)
+        entry = {
+            "sha256": sha256,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "status": status,
+            "output": output,
+            "label": label,
+            "frames": frames,
+            "seconds": round(seconds, 3),
+            "updated_at": time.time(),
+        }
+        if error:
+            entry["error"] = error
+        self.videos[key] = entry
@@ -0,0 +1,26 @@
+"""
+WindowGenerator 包成 tf.data.Dataset：特徵在 generator 中整批計算，
+tf.data 的 prefetch 讓下一批在 GPU/CPU 訓練當前批次時就先準備好。
+"""
+from .features import FEATURE_DIM
+from .windows import WindowGenerator
+
+def make_tf_dataset(generator: WindowGenerator, prefetch=None):
+    """
+    :param generator: 已設定好 batch_size / shuffle 的 WindowGenerator
+    :param prefetch: 預先準備的 batch 數，預設 tf.data.AUTOTUNE
+    """
+    import tensorflow as tf
+
+    time_steps = generator.index.time_steps
+    batch_dim = generator.batch_size if generator.drop_remainder else None
+    dataset = tf.data.Dataset.from_generator(
+        generator,
+        output_signature=(
+            tf.TensorSpec(shape=(batch_dim, time_steps, FEATURE_DIM), dtype=tf.float32),
+            tf.TensorSpec(shape=(batch_dim,), dtype=tf.float32),
+        ),
+    )
+    # 讓 Keras 知道每個 epoch 的 batch 數，進度條與 steps_per_epoch 才正確
+    dataset = dataset.apply(tf.data.experimental.assert_cardinality(len(generator)))
+    return dataset.prefetch(tf.data.AUTOTUNE if prefetch is None else prefetch)
@@ -0,0 +1,120 @@
+"""
+以 memory-map 資料集串流訓練跌倒偵測模型（模型結構與 notebook 的 build_lstm_model / build_cnn_lstm_model 相同）：
+
+    cd model_trainer
+    python -m skeleton_pipeline.train --dataset outputs/skeletons/N01_npy --model cnn_lstm --epochs 10
+
+視窗與特徵在訓練時逐批產生（WindowGenerator + tf.data prefetch），記憶體用量與資料集大小無關。
+輸出的模型（.h5）與 scaler（.pkl）可直接給 server 使用。
+
+與 notebook 的差異：
+- 視窗長度預設 120 幀，與 server 推論的 DEFAULT_TIME_STEPS 相同；notebook 使用 60（--time-steps 60 可重現），
+  但以 60 幀訓練的模型必須搭配 server 設定相同的 time_steps。
+- 訓練 / 驗證集依影片分層切分（--val-fraction），notebook 逐視窗切分。
+- 擴增（鏡像、雜訊）只套用在訓練集，偵測不到人的幀維持全 0；notebook 未使用的加速 / 減速版本沒有移植。
+"""
+import os
+import sys
+import pickle
+import argparse
+from .dataset import SkeletonDataset
+from .augment import AUGMENTATIONS, DEFAULT_AUGMENTATIONS
+from .config import CLASS_LABELS
+from .features import FEATURE_DIM
+from .tf_data import make_tf_dataset
+from .windows import WindowGenerator, augment_index, fit_scaler, split_by_video, window_index
+
+# selective_accuracy：分數落在 (THRESHOLD_LOW, THRESHOLD_HIGH) 之間視為「不確定」，算作答錯
+THRESHOLD_LOW = 0.4
+THRESHOLD_HIGH = 0.6
+
+def selective_accuracy(y_true, y_pred):
+    """只計算模型有把握（分數 > 0.6 或 < 0.4）且判斷正確的比例（與 notebook 相同）"""
+    import tensorflow as tf
+
+    y_true = tf.cast(tf.reshape(y_true, [-1]), tf.bool)
+    y_pred = tf.reshape(y_pred, [-1])
+    confident = tf.logical_or(y_pred > THRESHOLD_HIGH, y_pred < THRESHOLD_LOW)
+    correct = tf.equal(y_true, y_pred > THRESHOLD_HIGH)
+    return tf.reduce_mean(tf.cast(tf.logical_and(confident, correct), tf.float32))
+
+def build_lstm_model(input_shape):
+    from tensorflow.keras import layers, models
+
+    model = models.Sequential()
+    model.add(layers.LSTM(128, input_shape=input_shape, return_sequences=True))
+    model.add(layers.LSTM(64))
+    model.add(layers.Dropout(0.5))
+    model.add(layers.Dense(1, activation='sigmoid'))
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+def build_cnn_lstm_model(input_shape):
+    from tensorflow.keras import layers, models
+
+    model = models.Sequential()
+    model.add(layers.Conv1D(filters=64, kernel_size=3, activation='relu', input_shape=input_shape))
+    model.add(layers.MaxPooling1D(pool_size=2))
+    model.add(layers.Conv1D(filters=128, kernel_size=3, activation='relu'))
+    model.add(layers.MaxPooling1D(pool_size=2))
+    model.add(layers.Dropout(0.5))
+    model.add(layers.LSTM(64, return_sequences=True))
+    model.add(layers.LSTM(64))
+    model.add(layers.Dropout(0.5))
+    model.add(layers.Dense(1, activation='sigmoid'))
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=[selective_accuracy])
+    return model
+
+MODEL_BUILDERS = {
+    "lstm": build_lstm_model,
+    "cnn_lstm": build_cnn_lstm_model,
+}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="以 memory-map 骨架資料集串流訓練跌倒偵測模型")
+    parser.add_argument("--dataset", default="outputs/skeletons/N01_npy")
+    parser.add_argument("--model", choices=list(MODEL_BUILDERS), default="cnn_lstm")
+    parser.add_argument("--time-steps", type=int, default=120, help="視窗長度，需與 server 推論設定相同（notebook 為 60）")
+    parser.add_argument("--stride", type=int, default=10, help="滑動視窗間隔（幀）")
+    parser.add_argument("--val-fraction", type=float, default=0.2, help="各類別切出作為驗證集的影片比例，0 表示不切分")
+    parser.add_argument("--augment", nargs="*", choices=list(AUGMENTATIONS), default=list(DEFAULT_AUGMENTATIONS),
+                        help="訓練集的資料擴增，不帶參數表示不擴增")
+    parser.add_argument("--augment-classes", nargs="+", choices=list(CLASS_LABELS), default=list(CLASS_LABELS),
+                        help="要擴增的類別（notebook 兩個類別都擴增）")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--model-path", default="outputs/models/cnn_lstm_fall_detection_model_N01_1.h5")
+    parser.add_argument("--scaler-path", default="outputs/models/scaler_N01_1.pkl")
+    args = parser.parse_args(argv)
+
+    dataset = SkeletonDataset(args.dataset)
+    index = window_index(dataset, args.time_steps, args.stride)
+    if not len(index):
+        print("❌ 資料集中沒有可用的視窗", file=sys.stderr)
+        return 1
+    print(f"{len(dataset)} 支影片，{len(index)} 個視窗（fall {int(index.labels.sum())}）", file=sys.stderr)
+
+    train, val = split_by_video(index, args.val_fraction, seed=args.seed)
+    train = augment_index(train, args.augment, labels=[CLASS_LABELS[name] for name in args.augment_classes])
+    print(f"訓練 {len(train)} 個視窗（含擴增），驗證 {len(val)} 個視窗", file=sys.stderr)
+
+    # scaler 只以訓練集擬合，驗證集不參與
+    scaler = fit_scaler(dataset, train, seed=args.seed)
+    generator = WindowGenerator(dataset, train, scaler, batch_size=args.batch_size, seed=args.seed)
+    validation = None
+    if len(val):
+        validation = make_tf_dataset(WindowGenerator(dataset, val, scaler, batch_size=args.batch_size, shuffle=False))
+    model = MODEL_BUILDERS[args.model]((args.time_steps, FEATURE_DIM))
+    model.fit(make_tf_dataset(generator), validation_data=validation, epochs=args.epochs)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.model_path)), exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.abspath(args.scaler_path)), exist_ok=True)
+    model.save(args.model_path)
+    with open(args.scaler_path, "wb") as f:
+        pickle.dump(scaler, f)
+    print(f"模型已儲存：{args.model_path}，scaler：{args.scaler_path}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
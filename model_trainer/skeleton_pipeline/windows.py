@@ -0,0 +1,189 @@
+"""
+由 SkeletonDataset 逐批產生訓練視窗，不必先在記憶體中建出所有視窗：
+
+    index = window_index(dataset, time_steps=120, stride=10)
+    train, val = split_by_video(index, val_fraction=0.2, seed=42)
+    train = augment_index(train)          # 原始 + 鏡像 + 雜訊，與 notebook 相同
+    scaler = fit_scaler(dataset, train, seed=42)
+    for X, y in WindowGenerator(dataset, train, scaler, batch_size=32)():
+        ...   # X: (B, 120, 132) float32，y: (B,) float32
+
+記憶體中只有視窗索引（每個視窗 4 個整數）與當下這一批的資料；
+特徵（座標 + 相鄰幀位移）與 scaler 縮放以向量化方式整批計算，與 server 推論使用同一份實作。
+"""
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from .augment import DEFAULT_AUGMENTATIONS, AUGMENTATIONS, VARIANT_ORIGINAL, apply_variants
+from .dataset import FRAME_SHAPE, SkeletonDataset
+from .features import FEATURE_DIM, build_features, prepare_model_inputs
+
+class WindowIndex(NamedTuple):
+    starts: np.ndarray  # 視窗第一幀在 dataset.frames 中的位置
+    valid: np.ndarray   # 視窗中實際有資料的幀數，其餘於尾端補 0
+    labels: np.ndarray
+    videos: np.ndarray  # 視窗所屬的影片編號
+    time_steps: int
+    variants: Optional[np.ndarray] = None  # 每個視窗的擴增方式（augment.VARIANT_*），None 表示都不擴增
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def subset(self, mask) -> "WindowIndex":
+        variants = None if self.variants is None else self.variants[mask]
+        return WindowIndex(self.starts[mask], self.valid[mask], self.labels[mask], self.videos[mask],
+                           self.time_steps, variants)
+
+    def with_variant(self, variant: int) -> "WindowIndex":
+        """所有視窗都使用同一種擴增方式的複本（__len__ 為視窗數，不能用 NamedTuple._replace）"""
+        return WindowIndex(self.starts, self.valid, self.labels, self.videos, self.time_steps,
+                           np.full(len(self), variant, dtype=np.int64))
+
+def window_index(dataset: SkeletonDataset, time_steps: int = 120, stride: int = 1,
+                 skip_leading_empty: bool = True, videos: Iterable[int] = None) -> WindowIndex:
+    """
+    列出每支影片所有 stride 間隔的滑動視窗。
+    與 notebook 的 pad_or_truncate 相同：預設略過開頭偵測不到人的幀，
+    影片短於 time_steps 時取一個尾端補 0 的視窗；整支影片都偵測不到人則略過。
+    """
+    starts, valid, labels, owners = [], [], [], []
+    for video in (range(len(dataset)) if videos is None else videos):
+        entry = dataset.entries[video]
+        skip = entry.leading_empty if skip_leading_empty else 0
+        length = entry.frames - skip
+        if length <= 0:
+            continue
+        if length >= time_steps:
+            offsets = np.arange(0, length - time_steps + 1, stride, dtype=np.int64)
+            window_valid = np.full(len(offsets), time_steps, dtype=np.int64)
+        else:
+            offsets = np.zeros(1, dtype=np.int64)
+            window_valid = np.array([length], dtype=np.int64)
+        starts.append(entry.offset + skip + offsets)
+        valid.append(window_valid)
+        labels.append(np.full(len(offsets), entry.label, dtype=np.int64))
+        owners.append(np.full(len(offsets), video, dtype=np.int64))
+
+    if not starts:
+        empty = np.empty(0, dtype=np.int64)
+        return WindowIndex(empty, empty, empty, empty, time_steps)
+    return WindowIndex(np.concatenate(starts), np.concatenate(valid), np.concatenate(labels),
+                       np.concatenate(owners), time_steps)
+
+def split_by_video(index: WindowIndex, val_fraction: float = 0.2,
+                   seed: Optional[int] = None) -> Tuple[WindowIndex, WindowIndex]:
+    """
+    依影片切分訓練 / 驗證集，各類別分別抽出 val_fraction 的影片（分層抽樣）。
+    notebook 以 train_test_split 逐視窗切分，同一支影片重疊的視窗會同時出現在兩邊；
+    這裡以整支影片為單位，驗證分數才反映沒看過的影片。
+    """
+    rng = np.random.default_rng(seed)
+    val_videos = []
+    for label in np.unique(index.labels):
+        videos = np.unique(index.videos[index.labels == label])
+        rng.shuffle(videos)
+        count = int(round(len(videos) * val_fraction))
+        # 每個類別至少留一支影片在訓練集
+        val_videos.append(videos[:min(count, len(videos) - 1)])
+    is_val = np.isin(index.videos, np.concatenate(val_videos) if val_videos else [])
+    return index.subset(~is_val), index.subset(is_val)
+
+def augment_index(index: WindowIndex, augmentations: Sequence[str] = DEFAULT_AUGMENTATIONS,
+                  labels: Iterable[int] = None) -> WindowIndex:
+    """
+    將 labels 類別（None 為全部類別）的每個視窗加上 augmentations 指定的擴增版本，
+    只增加索引，實際的擴增在讀出每一批時才套用。
+    """
+    base = index if index.variants is not None else index.with_variant(VARIANT_ORIGINAL)
+    selected = base.subset(base.variants == VARIANT_ORIGINAL)
+    if labels is not None:
+        selected = selected.subset(np.isin(selected.labels, list(labels)))
+    parts = [base]
+    for name in augmentations:
+        if name not in AUGMENTATIONS:
+            raise ValueError(f"未知的資料擴增：{name}（可用：{', '.join(AUGMENTATIONS)}）")
+        parts.append(selected.with_variant(AUGMENTATIONS[name]))
+    return WindowIndex(*(np.concatenate([getattr(part, field) for part in parts])
+                         for field in ("starts", "valid", "labels", "videos")),
+                       index.time_steps, np.concatenate([part.variants for part in parts]))
+
+def gather_windows(frames: np.ndarray, starts: np.ndarray, valid: np.ndarray, time_steps: int,
+                   out: np.ndarray = None) -> np.ndarray:
+    """由 memmap 一次取出多個視窗，回傳 (B, time_steps, 33, 3)，超出有效長度的幀為 0"""
+    steps = np.arange(time_steps)
+    mask = steps < valid[:, None]
+    positions = np.where(mask, starts[:, None] + steps, 0)
+    if out is None:
+        out = np.empty((len(starts), time_steps) + FRAME_SHAPE, dtype=np.float32)
+    out[...] = frames[positions.ravel()].reshape(out.shape)
+    if not mask.all():
+        out[~mask] = 0
+    return out
+
+def fit_scaler(dataset: SkeletonDataset, index: WindowIndex, batch_size: int = 256, scaler=None,
+               seed: Optional[int] = None):
+    """
+    以 partial_fit 分批擬合 MinMaxScaler（與 notebook 相同，以整個視窗攤平為一筆樣本），
+    不需要一次載入所有視窗。index 含擴增版本時會先套用擴增，與訓練看到的資料一致。
+    """
+    rng = np.random.default_rng(seed)
+    if scaler is None:
+        from sklearn.preprocessing import MinMaxScaler
+        scaler = MinMaxScaler()
+    skeleton = np.empty((batch_size, index.time_steps) + FRAME_SHAPE, dtype=np.float32)
+    features = np.empty((batch_size, index.time_steps, FEATURE_DIM), dtype=np.float32)
+    for begin in range(0, len(index), batch_size):
+        end = min(begin + batch_size, len(index))
+        count = end - begin
+        gather_windows(dataset.frames, index.starts[begin:end], index.valid[begin:end], index.time_steps,
+                       out=skeleton[:count])
+        if index.variants is not None:
+            apply_variants(skeleton[:count], index.variants[begin:end], rng)
+        build_features(skeleton[:count], out=features[:count])
+        scaler.partial_fit(features[:count].reshape(count, -1))
+    return scaler
+
+class WindowGenerator:
+    """
+    可重複呼叫的 batch 產生器（每次呼叫為一個 epoch），可直接交給 tf.data.Dataset.from_generator。
+    shuffle 時每個 epoch 以 (seed, epoch) 重新排列整個視窗索引，等同完整的 shuffle，不受 buffer 大小限制；
+    index 含擴增版本時，雜訊同樣以 (seed, epoch) 產生，每個 epoch 不同。
+    """
+    def __init__(self, dataset: SkeletonDataset, index: WindowIndex, scaler, batch_size: int = 32,
+                 shuffle: bool = True, seed: Optional[int] = None, drop_remainder: bool = False):
+        self.dataset = dataset
+        self.index = index
+        self.scaler = scaler
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_remainder = drop_remainder
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        """每個 epoch 的 batch 數"""
+        if self.drop_remainder:
+            return len(self.index) // self.batch_size
+        return -(-len(self.index) // self.batch_size)
+
+    def __call__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        order = np.arange(len(self.index))
+        rng = np.random.default_rng(None if self.seed is None else (self.seed, self.epoch))
+        if self.shuffle:
+            rng.shuffle(order)
+        self.epoch += 1
+
+        time_steps = self.index.time_steps
+        for begin in range(0, len(order), self.batch_size):
+            batch = order[begin:begin + self.batch_size]
+            if self.drop_remainder and len(batch) < self.batch_size:
+                break
+            # 依在檔案中的位置排序後讀取，memmap 的讀取較連續
+            batch = np.sort(batch)
+            skeleton = gather_windows(self.dataset.frames, self.index.starts[batch], self.index.valid[batch],
+                                      time_steps)
+            if self.index.variants is not None:
+                apply_variants(skeleton, self.index.variants[batch], rng)
+            # 每批使用新的輸出陣列：下游（tf.data prefetch）可能還持有上一批
+            features = np.empty((len(batch), time_steps, FEATURE_DIM), dtype=np.float32)
+            prepare_model_inputs(skeleton, self.scaler, out=features)
+            yield features, self.index.labels[batch].astype(np.float32)
@@ -0,0 +1,7 @@
+"""讓 skeleton_pipeline 可以被匯入（與在 model_trainer/ 下以 python -m 執行相同）"""
+import os
+import sys
+
+TRAINER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if TRAINER_ROOT not in sys.path:
+    sys.path.insert(0, TRAINER_ROOT)
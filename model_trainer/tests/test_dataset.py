@@ -0,0 +1,63 @@
+import json
+import os
+import numpy as np
+import pytest
+from skeleton_pipeline.convert import convert
+from skeleton_pipeline.dataset import FRAMES_NAME, INDEX_NAME, SkeletonDataset, count_leading_empty
+
+def write_video(folder, name, frames):
+    path = folder / f"{name}.json"
+    path.write_text(json.dumps(frames.tolist()))
+    return str(path)
+
+@pytest.fixture
+def videos():
+    rng = np.random.default_rng(0)
+    first = rng.random((6, 33, 3), dtype=np.float32)
+    first[:2] = 0
+    return [("fall/a", first, 1), ("normal/empty", np.empty((0, 33, 3), dtype=np.float32), 0),
+            ("normal/b", rng.random((4, 33, 3), dtype=np.float32), 0)]
+
+def test_count_leading_empty():
+    frames = np.zeros((5, 33, 3), dtype=np.float32)
+    assert count_leading_empty(frames) == 5
+    frames[3, 0, 0] = 0.5
+    assert count_leading_empty(frames) == 3
+    assert count_leading_empty(frames[:0]) == 0
+
+def test_convert_round_trip(tmp_path, videos):
+    files = [(name, write_video(tmp_path, name.replace("/", "_"), frames), label) for name, frames, label in videos]
+    output = tmp_path / "npy"
+    index = convert(files, str(output))
+    assert index["total_frames"] == 10
+    # 只留下最終檔案，沒有暫存檔
+    assert sorted(os.listdir(output)) == [INDEX_NAME, FRAMES_NAME]
+
+    dataset = SkeletonDataset(str(output))
+    assert dataset.names == ["fall/a", "normal/empty", "normal/b"]
+    assert dataset.lengths.tolist() == [6, 0, 4]
+    assert dataset.entries[0].leading_empty == 2
+    np.testing.assert_array_equal(dataset.video(0), videos[0][1])
+    np.testing.assert_array_equal(dataset.video(0, skip_leading_empty=True), videos[0][1][2:])
+    assert len(dataset.video(1)) == 0
+    np.testing.assert_array_equal(dataset.video(2), videos[2][1])
+
+def test_windows_are_views(tmp_path, videos):
+    files = [(name, write_video(tmp_path, name.replace("/", "_"), frames), label) for name, frames, label in videos]
+    convert(files, str(tmp_path / "npy"))
+    dataset = SkeletonDataset(str(tmp_path / "npy"))
+    windows = dataset.windows(0, 3, stride=2)
+    assert windows.shape == (2, 3, 33, 3)
+    np.testing.assert_array_equal(windows[1], videos[0][1][2:5])
+    assert dataset.windows(2, 5).shape == (0, 5, 33, 3)
+    with pytest.raises(IndexError):
+        dataset.window(2, 2, 3)
+
+def test_rejects_mismatched_index(tmp_path, videos):
+    files = [(name, write_video(tmp_path, name.replace("/", "_"), frames), label) for name, frames, label in videos]
+    output = tmp_path / "npy"
+    convert(files, str(output))
+    # 模擬中途中斷：skeletons.npy 已換新但 index.json 還是舊的
+    np.save(output / FRAMES_NAME, np.zeros((3, 33, 3), dtype=np.float32))
+    with pytest.raises(ValueError, match="不一致"):
+        SkeletonDataset(str(output))
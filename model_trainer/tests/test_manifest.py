@@ -0,0 +1,53 @@
+import json
+import pytest
+from skeleton_pipeline.manifest import STATUS_DONE, STATUS_FAILED, Manifest
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "videos" / "fall" / "a.mp4"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"video-bytes")
+    return path
+
+def test_load_missing_returns_empty(tmp_path):
+    manifest = Manifest.load(str(tmp_path / "manifest.json"))
+    assert manifest.videos == {}
+
+def test_record_save_and_reload(tmp_path, video):
+    output_root = tmp_path / "out"
+    (output_root / "fall").mkdir(parents=True)
+    (output_root / "fall" / "a.json").write_text("[]")
+    path = str(tmp_path / "manifest.json")
+
+    manifest = Manifest.load(path)
+    sha = manifest.content_hash("fall/a.mp4", str(video))
+    manifest.record("fall/a.mp4", str(video), sha, STATUS_DONE, "fall/a.json", label=1, frames=3, seconds=0.5)
+    manifest.save()
+
+    reloaded = Manifest.load(path)
+    assert reloaded.videos["fall/a.mp4"]["frames"] == 3
+    assert reloaded.is_current("fall/a.mp4", sha, str(output_root))
+    # 內容變更或輸出檔遺失時需要重新處理
+    assert not reloaded.is_current("fall/a.mp4", "other", str(output_root))
+    (output_root / "fall" / "a.json").unlink()
+    assert not reloaded.is_current("fall/a.mp4", sha, str(output_root))
+
+def test_failed_entry_is_not_current(tmp_path, video):
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    manifest.record("fall/a.mp4", str(video), "sha", STATUS_FAILED, None, label=1, error="boom")
+    assert manifest.videos["fall/a.mp4"]["error"] == "boom"
+    assert not manifest.is_current("fall/a.mp4", "sha", str(tmp_path))
+
+def test_content_hash_reuses_recorded_value(tmp_path, video):
+    manifest = Manifest(str(tmp_path / "manifest.json"))
+    manifest.record("fall/a.mp4", str(video), "cached", STATUS_DONE, "fall/a.json", label=1)
+    # 大小與修改時間未變時沿用記錄的 sha256，不重新讀檔
+    assert manifest.content_hash("fall/a.mp4", str(video)) == "cached"
+    video.write_bytes(b"changed-content")
+    assert manifest.content_hash("fall/a.mp4", str(video)) != "cached"
+
+def test_rejects_unknown_version(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"version": 99, "videos": {}}))
+    with pytest.raises(ValueError):
+        Manifest.load(str(path))
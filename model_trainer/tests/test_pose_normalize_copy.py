@@ -0,0 +1,12 @@
+import os
+import pytest
+
+TRAINER_COPY = os.path.join(os.path.dirname(__file__), "..", "skeleton_pipeline", "pose_normalize.py")
+SERVER_SOURCE = os.path.join(os.path.dirname(__file__), "..", "..", "server", "app", "utils", "pose_normalize.py")
+
+def test_matches_server_pose_normalize():
+    """skeleton_pipeline/pose_normalize.py 是 server 版本的複本，修改時兩邊需同步"""
+    if not os.path.exists(SERVER_SOURCE):
+        pytest.skip("找不到 server 原始碼")
+    with open(TRAINER_COPY, "rb") as trainer, open(SERVER_SOURCE, "rb") as server:
+        assert trainer.read() == server.read(), "請將 server/app/utils/pose_normalize.py 複製到 skeleton_pipeline/"
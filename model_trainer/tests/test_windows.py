@@ -0,0 +1,113 @@
+import json
+import numpy as np
+import pytest
+from skeleton_pipeline.augment import VARIANT_MIRROR, VARIANT_NOISE, VARIANT_ORIGINAL
+from skeleton_pipeline.convert import convert
+from skeleton_pipeline.dataset import SkeletonDataset
+from skeleton_pipeline.features import FEATURE_DIM, build_features
+from skeleton_pipeline.windows import (
+    WindowGenerator, augment_index, fit_scaler, gather_windows, split_by_video, window_index
+)
+
+# (幀數, 開頭偵測不到人的幀數, 標籤)
+VIDEOS = [(30, 0, 0), (12, 3, 1), (5, 0, 0), (4, 4, 1), (25, 2, 1), (18, 0, 0)]
+
+@pytest.fixture
+def dataset(tmp_path):
+    rng = np.random.default_rng(0)
+    files = []
+    for i, (frames, empty, label) in enumerate(VIDEOS):
+        data = rng.random((frames, 33, 3), dtype=np.float32)
+        data[:empty] = 0
+        path = tmp_path / f"video{i}.json"
+        path.write_text(json.dumps(data.tolist()))
+        files.append((f"video{i}", str(path), label))
+    convert(files, str(tmp_path / "npy"))
+    return SkeletonDataset(str(tmp_path / "npy"))
+
+def naive_windows(dataset, time_steps, stride):
+    """notebook 的寫法：略過開頭空白幀後逐一切出視窗，不足 time_steps 時尾端補 0"""
+    windows, labels = [], []
+    for video in range(len(dataset)):
+        frames = np.array(dataset.video(video, skip_leading_empty=True))
+        if not len(frames):
+            continue
+        if len(frames) < time_steps:
+            padded = np.zeros((time_steps, 33, 3), dtype=np.float32)
+            padded[:len(frames)] = frames
+            windows.append(padded)
+            labels.append(dataset.entries[video].label)
+            continue
+        for start in range(0, len(frames) - time_steps + 1, stride):
+            windows.append(frames[start:start + time_steps])
+            labels.append(dataset.entries[video].label)
+    return np.array(windows), np.array(labels)
+
+@pytest.mark.parametrize("time_steps, stride", [(10, 1), (10, 4), (8, 3)])
+def test_window_index_and_gather_match_naive(dataset, time_steps, stride):
+    index = window_index(dataset, time_steps, stride)
+    expected, labels = naive_windows(dataset, time_steps, stride)
+    assert len(index) == len(expected)
+    # 整支影片都偵測不到人（video3）時不產生視窗
+    assert 3 not in index.videos
+    np.testing.assert_array_equal(index.labels, labels)
+    np.testing.assert_array_equal(gather_windows(dataset.frames, index.starts, index.valid, time_steps), expected)
+
+def test_gather_windows_reuses_output(dataset):
+    index = window_index(dataset, 10, 5)
+    out = np.full((len(index), 10, 33, 3), np.nan, dtype=np.float32)
+    assert gather_windows(dataset.frames, index.starts, index.valid, 10, out=out) is out
+    assert not np.isnan(out).any()
+
+def test_split_by_video_is_stratified_and_disjoint(dataset):
+    index = window_index(dataset, 5, 1)
+    train, val = split_by_video(index, val_fraction=0.5, seed=1)
+    assert len(train) + len(val) == len(index)
+    assert not set(train.videos) & set(val.videos)
+    assert set(val.labels) == {0, 1}
+    assert set(train.labels) == {0, 1}
+
+def test_augment_index_adds_variants(dataset):
+    index = window_index(dataset, 10, 5)
+    augmented = augment_index(index, labels=[1])
+    fall = int((index.labels == 1).sum())
+    assert len(augmented) == len(index) + 2 * fall
+    assert np.bincount(augmented.variants).tolist() == [len(index), fall, fall]
+    with pytest.raises(ValueError):
+        augment_index(index, ["bogus"])
+
+def test_generator_applies_augmentation(dataset):
+    index = window_index(dataset, 10, 5).subset(slice(0, 1))
+    augmented = augment_index(index)
+    identity = fit_scaler(dataset, index)
+    identity.scale_[:], identity.min_[:] = 1, 0
+    X, _ = next(WindowGenerator(dataset, augmented, identity, batch_size=8, shuffle=False, seed=0)())
+    variants = augmented.variants.tolist()
+    original = X[variants.index(VARIANT_ORIGINAL)]
+    mirrored = X[variants.index(VARIANT_MIRROR)]
+    noisy = X[variants.index(VARIANT_NOISE)]
+    np.testing.assert_allclose(mirrored[:, 0:99:3], 1 - original[:, 0:99:3], atol=1e-6)
+    assert 0 < np.abs(noisy - original)[:, :99].max() <= 0.01 + 1e-6
+
+def test_generator_matches_features(dataset):
+    index = window_index(dataset, 10, 2)
+    scaler = fit_scaler(dataset, index, batch_size=7)
+    skeleton = gather_windows(dataset.frames, index.starts, index.valid, 10)
+    flat = build_features(skeleton).reshape(len(index), -1)
+    np.testing.assert_allclose(scaler.data_min_, flat.min(axis=0))
+    np.testing.assert_allclose(scaler.data_max_, flat.max(axis=0))
+
+    generator = WindowGenerator(dataset, index, scaler, batch_size=4, shuffle=False)
+    batches = list(generator())
+    assert len(batches) == len(generator)
+    X = np.concatenate([x for x, _ in batches])
+    assert X.shape == (len(index), 10, FEATURE_DIM)
+    np.testing.assert_allclose(X.reshape(len(index), -1), scaler.transform(flat), rtol=1e-5, atol=1e-5)
+
+def test_generator_shuffle_is_reproducible(dataset):
+    index = window_index(dataset, 10, 2)
+    scaler = fit_scaler(dataset, index)
+    first = [y for _, y in WindowGenerator(dataset, index, scaler, batch_size=4, seed=3)()]
+    second = [y for _, y in WindowGenerator(dataset, index, scaler, batch_size=4, seed=3)()]
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
@@ -1,10 +1,22 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from app.db import Database
+from app.service.fall_inference_scheduler import fall_scheduler
+from app.service.model_warmup import model_warmup
+from app.service.role_id_service import RoleCache
+from app.service.news_audio_service import news_audio_service
+from app.service.post_audio_service import post_audio_service
+from app.service.notification_queue import notification_queue
+from app.utils.pose_worker_pool import pose_pool
+from app.utils.line_client import line_client
+from app.utils.request_metrics import RequestMetricsMiddleware
+from app.utils.upload_utils import BodySizeLimitMiddleware
+from app.utils.logging_utils import setup_logging, shutdown_logging, RequestIdMiddleware
 from .routes.ws_pose_router import ws_pose_router
 from .routes.video_routes import video_router
-from .routes.fall_routes import fall_router
+from .routes.fall_routes import fall_router, clear_temp_directory
 from .routes.gait_routes import gait_router
 from .routes.watchlist_routes import watchlist_router
 from .routes.user_routes import user_router
@@ -13,16 +25,46 @@ from .routes.news_voice_routes import news_voice_router
 from .routes.reels_routes import reels_router
 from .routes.auth_routes import auth_router
 from .routes.emergency_contacts_routes import contact_router 
+from .routes.metrics_routes import metrics_router
+from .routes.health_routes import health_router
 
 # 啟動與關閉時處理連線池
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # create_app 已設定過時不會重複設定；前一次 lifespan 結束後重新進入時會重新啟動
+    setup_logging()
     await Database.init_pool()
+    # 角色表很小且幾乎不變，啟動時先載入快取
+    await RoleCache.load()
+    await line_client.start()
+    await notification_queue.start()
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, clear_temp_directory)
+    # pose worker、跌倒模型與推論排程器在背景載入，不阻塞啟動；就緒狀態見 /ready
+    model_warmup.start()
+    await news_audio_service.start()
+    await post_audio_service.start()
     yield
+    await news_audio_service.stop()
+    await model_warmup.stop()
+    await fall_scheduler.stop()
+    await loop.run_in_executor(None, pose_pool.shutdown)
+    await notification_queue.stop()
+    await line_client.close()
     await Database.close_pool()
+    # 最後寫出佇列中剩餘的 log
+    shutdown_logging()
 
 def create_app():
+    # log 由背景執行緒寫出，event loop 上只做放入佇列；在建立 app 時就設定，
+    # 否則 lifespan 之前的紀錄只會經過 logging 的 lastResort（僅 WARNING 以上）
+    setup_logging()
     app = FastAPI(lifespan=lifespan)
+    # 在表單解析前限制上傳大小，避免超大影片先被完整寫入暫存檔
+    app.add_middleware(BodySizeLimitMiddleware)
+    app.add_middleware(RequestMetricsMiddleware)
+    # 最外層：讓 metrics 與路由中的 log 都帶有 request_id
+    app.add_middleware(RequestIdMiddleware)
     app.include_router(video_router)
     app.include_router(fall_router)
     app.include_router(gait_router)
@@ -34,4 +76,6 @@ def create_app():
     app.include_router(auth_router)
     app.include_router(contact_router)
     app.include_router(ws_pose_router)
+    app.include_router(metrics_router)
+    app.include_router(health_router)
     return app
\ No newline at end of file
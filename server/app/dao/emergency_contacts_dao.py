@@ -1,4 +1,5 @@
 import aiomysql
+from typing import Any, Dict, List, Optional
 from ..exceptions import DatabaseError, NotFoundError, AlreadyExistsError
 
 async def insert_emergency_contacts(conn, user_id: int, contact_id: int, priority: int, relationship: str) -> bool:
@@ -28,6 +29,40 @@ async def select_contacts_by_user_id(conn, user_id: int):
     except Exception as e:
         raise DatabaseError(f"查詢照護關係失敗: {e}")
 
+async def select_contact_relations(conn, user_id: int, role_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    以單一查詢取得使用者雙向照護關係中的對方資料（emergency_contacts ⋈ users）。
+    角色名稱由 service 層的角色快取補上，不在此查詢 role 表。
+    :param role_id: 可選，只回傳該角色的聯絡人
+    :return: 每筆包含對方的使用者資料、priority 與 relationship
+    """
+    role_filter = " AND u.role_id = %s" if role_id is not None else ""
+    query = f"""
+        SELECT u.user_id, u.name, u.phone, u.role_id, u.line_id,
+               ec.priority, ec.relationship
+        FROM emergency_contacts ec
+        JOIN users u ON u.user_id = ec.contact_id
+        WHERE ec.user_id = %s{role_filter}
+        UNION ALL
+        SELECT u.user_id, u.name, u.phone, u.role_id, u.line_id,
+               ec.priority, ec.relationship
+        FROM emergency_contacts ec
+        JOIN users u ON u.user_id = ec.user_id
+        WHERE ec.contact_id = %s AND ec.user_id <> %s{role_filter}
+    """
+    values = [user_id]
+    if role_id is not None:
+        values.append(role_id)
+    values.extend([user_id, user_id])
+    if role_id is not None:
+        values.append(role_id)
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, tuple(values))
+            return list(await cursor.fetchall())
+    except Exception as e:
+        raise DatabaseError(f"查詢照護關係失敗: {e}")
+
 async def select_contact_by_pair(conn, user_id: int, contact_id: int):
     try:
         async with conn.cursor(aiomysql.DictCursor) as cursor:
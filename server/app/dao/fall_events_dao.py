@@ -1,8 +1,11 @@
+import logging
 import datetime
 from typing import Any, Dict, List, Optional
 from ..exceptions import DatabaseError, NotFoundError
 import aiomysql
 
+logger = logging.getLogger(__name__)
+
 async def insert_fall_event(
     conn,
     user_id: int,
@@ -29,7 +32,7 @@ async def insert_fall_event(
             await cursor.execute(query, values)
             await conn.commit()
             record_id = cursor.lastrowid
-            print(f"[INFO] 新增跌倒事件成功: record_id={record_id}")
+            logger.info("新增跌倒事件成功: record_id=%s", record_id)
             return record_id
     except Exception as e:
         raise DatabaseError(f"新增跌倒事件失敗: {e}")
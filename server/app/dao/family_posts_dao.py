@@ -0,0 +1,25 @@
+from typing import Optional
+from ..exceptions import DatabaseError
+import aiomysql
+
+async def select_latest_post_content(conn, account_name: str) -> Optional[str]:
+    """
+    查詢指定帳號最新一則社群貼文的內容。
+    :param conn: 資料庫連線物件
+    :param account_name: 發文帳號名稱
+    :return: 貼文內容，沒有貼文則回傳 None
+    :raises DatabaseError: 資料庫操作發生錯誤時
+    """
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            query = """
+                SELECT content FROM family_posts
+                WHERE account_name = %s
+                ORDER BY post_time DESC
+                LIMIT 1
+            """
+            await cursor.execute(query, (account_name,))
+            result = await cursor.fetchone()
+            return result["content"] if result else None
+    except Exception as e:
+        raise DatabaseError(f"查詢最新貼文失敗: {e}")
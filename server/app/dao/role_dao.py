@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, Optional
 from ..exceptions import DatabaseError, NotFoundError
 import aiomysql
 
@@ -22,4 +22,19 @@ async def select_role_name_by_id(conn, role_id: int) -> str:
         raise
     except Exception as e:
         # 發生資料庫錯誤時，拋出自訂 DatabaseError
-        raise DatabaseError(f"查詢角色名稱失敗: {e}")
\ No newline at end of file
+        raise DatabaseError(f"查詢角色名稱失敗: {e}")
+
+async def select_all_roles(conn) -> Dict[int, str]:
+    """
+    查詢所有角色。
+    :param conn: 資料庫連線物件
+    :return: {role_id: role_name}
+    :raises DatabaseError: 資料庫操作發生錯誤時
+    """
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute("SELECT role_id, role_name FROM role")
+            rows = await cursor.fetchall()
+            return {row["role_id"]: row["role_name"] for row in rows}
+    except Exception as e:
+        raise DatabaseError(f"查詢角色列表失敗: {e}")
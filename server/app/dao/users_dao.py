@@ -1,9 +1,12 @@
+import logging
 import datetime
 import aiomysql
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from mysql.connector import IntegrityError
 from ..exceptions import DatabaseError, NotFoundError, AlreadyExistsError
 
+logger = logging.getLogger(__name__)
+
 async def insert_user(
     conn,
     name: str,
@@ -32,15 +35,15 @@ async def insert_user(
             await cursor.execute(query, values)
             await conn.commit()
             user_id = await cursor.lastrowid
-            print(f"[INFO] 新增使用者成功: user_id={user_id}")
+            logger.info("新增使用者成功: user_id=%s", user_id)
             return user_id
     except IntegrityError as e:
         if "Duplicate entry" in str(e) and "phone" in str(e):
-            print(f"[ERROR] 帳號已被註冊: {phone}")
+            logger.warning("帳號已被註冊: %s", phone)
             raise AlreadyExistsError("帳號已被註冊")
         raise DatabaseError(f"資料庫完整性錯誤: {e}")
     except Exception as e:
-        print(f"[ERROR] 新增使用者失敗: {e}")
+        logger.error("新增使用者失敗: %s", e)
         raise DatabaseError(f"新增使用者失敗: {e}")
 
 async def update_user(conn, user_id: int, **kwargs) -> bool:
@@ -71,7 +74,7 @@ async def update_user(conn, user_id: int, **kwargs) -> bool:
     except NotFoundError:
         raise
     except Exception as e:
-        print(f"[ERROR] 更新使用者失敗: {e}")
+        logger.error("更新使用者失敗: %s", e)
         raise DatabaseError(f"更新使用者失敗: {e}")
 
 async def select_user_by_phone(conn, phone: str) -> Dict[str, Any]:
@@ -89,7 +92,7 @@ async def select_user_by_phone(conn, phone: str) -> Dict[str, Any]:
     except NotFoundError:
         raise
     except Exception as e:
-        print(f"[ERROR] 查詢使用者資料失敗: {e}")
+        logger.error("查詢使用者資料失敗: %s", e)
         raise DatabaseError(f"查詢使用者資料失敗: {e}")
     
 async def select_user_by_id(conn, user_id: int) -> Dict[str, Any]:
@@ -107,7 +110,7 @@ async def select_user_by_id(conn, user_id: int) -> Dict[str, Any]:
     except NotFoundError:
         raise
     except Exception as e:
-        print(f"[ERROR] 查詢使用者資料失敗: {e}")
+        logger.error("查詢使用者資料失敗: %s", e)
         raise DatabaseError(f"查詢使用者資料失敗: {e}")
 
 async def delete_user(conn, phone: str) -> bool:
@@ -125,5 +128,19 @@ async def delete_user(conn, phone: str) -> bool:
     except NotFoundError:
         raise
     except Exception as e:
-        print(f"[ERROR] 刪除使用者失敗: {e}")
-        raise DatabaseError(f"刪除使用者失敗: {e}")
\ No newline at end of file
+        logger.error("刪除使用者失敗: %s", e)
+        raise DatabaseError(f"刪除使用者失敗: {e}")
+
+
+async def select_line_ids_by_role(conn, role_id: int) -> List[str]:
+    """
+    查詢指定角色所有已綁定 LINE 的使用者 line_id。
+    """
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            query = "SELECT line_id FROM users WHERE role_id = %s AND line_id IS NOT NULL AND line_id <> ''"
+            await cursor.execute(query, (role_id,))
+            return [row["line_id"] for row in await cursor.fetchall()]
+    except Exception as e:
+        logger.error("查詢 LINE 使用者失敗: %s", e)
+        raise DatabaseError(f"查詢 LINE 使用者失敗: {e}")
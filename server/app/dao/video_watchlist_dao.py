@@ -1,9 +1,12 @@
+import logging
 import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Set, Iterable
 from ..exceptions import DatabaseError, NotFoundError, AlreadyExistsError
 import aiomysql
 from aiomysql import IntegrityError
 
+logger = logging.getLogger(__name__)
+
 async def insert_video_watchlist(
     conn,
     record_id: int,
@@ -27,15 +30,15 @@ async def insert_video_watchlist(
             )
             await cursor.execute(query, values)
             await conn.commit()
-            print(f"[INFO] 新增影片到觀看清單成功: record_id={record_id}")
+            logger.info("新增影片到觀看清單成功: record_id=%s", record_id)
             return record_id
     except IntegrityError as e:
         if "Duplicate entry" in str(e):
-            print(f"[ERROR] 觀看清單已存在: user_id={user_id}, record_id={record_id}, video_type={video_type}")
+            logger.warning("觀看清單已存在: user_id=%s, record_id=%s, video_type=%s", user_id, record_id, video_type)
             raise AlreadyExistsError("該影片已在觀看清單中")
         raise DatabaseError(f"資料庫完整性錯誤: {e}")
     except Exception as e:
-        print(f"[ERROR] 新增影片到觀看清單失敗: {e}")
+        logger.error("新增影片到觀看清單失敗: %s", e)
         raise DatabaseError(f"新增影片到觀看清單失敗: {e}")
 
 async def select_watchlist_entry_by_user_and_record(conn, user_id: int, record_id: int):
@@ -57,9 +60,30 @@ async def select_watchlist_entry_by_user_and_record(conn, user_id: int, record_i
     except NotFoundError:
         raise
     except Exception as e:
-        print(f"[ERROR] 查詢觀看清單失敗: {e}")
+        logger.error("查詢觀看清單失敗: %s", e)
         raise DatabaseError(f"查詢觀看清單失敗: {e}")
 
+async def select_watchlisted_record_ids(conn, user_id: int, record_ids: Iterable[int]) -> Set[int]:
+    """
+    一次查詢多筆 record_id 是否在指定 user_id 的觀看清單，回傳已收藏的 record_id 集合。
+    """
+    record_ids = list(dict.fromkeys(record_ids))
+    if not record_ids:
+        return set()
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            placeholders = ", ".join(["%s"] * len(record_ids))
+            query = f"""
+                SELECT DISTINCT record_id FROM video_watchlist
+                WHERE user_id = %s AND record_id IN ({placeholders})
+            """
+            await cursor.execute(query, (user_id, *record_ids))
+            rows = await cursor.fetchall()
+            return {row["record_id"] for row in rows}
+    except Exception as e:
+        logger.error("批次查詢觀看清單失敗: %s", e)
+        raise DatabaseError(f"批次查詢觀看清單失敗: {e}")
+
 async def select_watchlist_record_ids_by_user(conn, user_id: int, video_type: str) -> List[int]:
     """
     根據 user_id 查詢觀看清單，回傳所有符合條件的 record_id 清單。
@@ -74,9 +98,49 @@ async def select_watchlist_record_ids_by_user(conn, user_id: int, video_type: st
             rows = await cursor.fetchall()
             return [row["record_id"] for row in rows] if rows else []
     except Exception as e:
-        print(f"[ERROR] 查詢觀看清單失敗: {e}")
+        logger.error("查詢觀看清單失敗: %s", e)
         raise DatabaseError(f"查詢觀看清單失敗: {e}")
 
+async def select_watchlist_fall_events(
+    conn,
+    user_id: int,
+    video_type: str,
+    before_added_at: Optional[datetime.datetime] = None,
+    before_record_id: Optional[int] = None,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    以單一 JOIN 查詢觀看清單中的跌倒影片資料，依 added_at 由新到舊排序。
+    傳入上一頁最後一筆的 (added_at, record_id) 即可取得下一頁（keyset pagination）。
+    """
+    query = """
+        SELECT f.record_id, f.user_id, f.detected_time, f.location, f.pose_before_fall,
+               f.video_filename, w.added_at
+        FROM video_watchlist w
+        JOIN fall_events f ON f.record_id = w.record_id
+        WHERE w.user_id = %s AND w.video_type = %s
+    """
+    values = [user_id, video_type]
+    if before_added_at is not None:
+        if before_record_id is None:
+            query += " AND w.added_at < %s"
+            values.append(before_added_at)
+        else:
+            query += " AND (w.added_at < %s OR (w.added_at = %s AND w.record_id < %s))"
+            values.extend([before_added_at, before_added_at, before_record_id])
+    query += " ORDER BY w.added_at DESC, w.record_id DESC"
+    if limit is not None:
+        query += " LIMIT %s"
+        values.append(limit)
+
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(query, tuple(values))
+            return list(await cursor.fetchall())
+    except Exception as e:
+        logger.error("查詢觀看清單影片資料失敗: %s", e)
+        raise DatabaseError(f"查詢觀看清單影片資料失敗: {e}")
+
 async def delete_watchlist_by_id(
     conn,
     user_id: int,
@@ -101,5 +165,5 @@ async def delete_watchlist_by_id(
     except NotFoundError:
         raise
     except Exception as e:
-        print(f"[ERROR] 刪除收藏失敗: {e}")
+        logger.error("刪除收藏失敗: %s", e)
         raise DatabaseError(f"刪除收藏失敗: {e}")
\ No newline at end of file
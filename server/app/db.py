@@ -1,30 +1,130 @@
+import logging
 import os
+import sys
+import time
 import asyncio
 from dotenv import load_dotenv
 from aiomysql import create_pool
 from contextlib import asynccontextmanager
+from .utils.metrics import registry
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
 USE_POOL_TIMEOUT = os.getenv("USE_POOL_TIMEOUT", "false").lower() == "true"
 POOL_TIMEOUT = int(os.getenv("POOL_TIMEOUT", 5))  # 預設 timeout 5 秒
+DB_POOL_MINSIZE = int(os.getenv("DB_POOL_MINSIZE", 1))
+DB_POOL_MAXSIZE = int(os.getenv("DB_POOL_MAXSIZE", 10))
+# 連線閒置超過幾秒就在取出時關閉重連（-1 為不回收），需小於 MySQL 的 wait_timeout
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 3600))
+# 連線閒置超過幾秒才在取出時 ping 檢查（0 為每次都 ping，-1 為不檢查）
+DB_POOL_PING_IDLE = float(os.getenv("DB_POOL_PING_IDLE", 30))
+DB_CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", 10))
+
+def _pool_gauge(attr: str):
+    def read():
+        pool = Database._pool
+        return getattr(pool, attr) if pool is not None else 0
+    return read
+
+def _pool_in_use():
+    pool = Database._pool
+    return pool.size - pool.freesize if pool is not None else 0
+
+pool_acquire_seconds = registry.histogram("db_pool_acquire_seconds", "從連線池取得連線的等待時間（秒）")
+pool_ping_failures = registry.counter("db_pool_ping_failures_total", "取出時 ping 失敗而重建的連線數")
+pool_acquire_timeouts = registry.counter("db_pool_acquire_timeouts_total", "取得連線逾時次數")
+registry.gauge("db_pool_size", "連線池目前的連線數", fn=_pool_gauge("size"))
+registry.gauge("db_pool_free", "連線池中閒置的連線數", fn=_pool_gauge("freesize"))
+registry.gauge("db_pool_in_use", "使用中的連線數", fn=_pool_in_use)
+registry.gauge("db_pool_maxsize", "連線池的最大連線數", fn=_pool_gauge("maxsize"))
+db_query_seconds = registry.histogram("db_query_duration_seconds", "SQL 執行時間（秒），依呼叫的 DAO 函式分類", ("query",))
+db_query_errors = registry.counter("db_query_errors_total", "SQL 執行失敗次數，依呼叫的 DAO 函式分類", ("query",))
+
+class _TimedCursor:
+    """
+    記錄 execute / executemany 耗時的 cursor 代理，其餘屬性直接轉給原本的 cursor。
+    label 取呼叫 execute 的函式名稱（即 DAO 函式），序列數量固定且容易對應程式碼。
+    """
+    __slots__ = ("_cursor",)
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __aiter__(self):
+        return self._cursor.__aiter__()
+
+    async def _timed(self, method, caller, *args):
+        start = time.perf_counter()
+        try:
+            return await method(*args)
+        except Exception:
+            db_query_errors.inc(1, caller)
+            raise
+        finally:
+            db_query_seconds.observe(time.perf_counter() - start, caller)
+
+    def execute(self, query, args=None):
+        return self._timed(self._cursor.execute, sys._getframe(1).f_code.co_name, query, args)
+
+    def executemany(self, query, args):
+        return self._timed(self._cursor.executemany, sys._getframe(1).f_code.co_name, query, args)
+
+class _TimedCursorContext:
+    """conn.cursor(...) 的回傳值：同時支援 await 與 async with"""
+    __slots__ = ("_context", "_cursor")
+
+    def __init__(self, context):
+        self._context = context
+        self._cursor = None
+
+    def __await__(self):
+        cursor = yield from self._context.__await__()
+        return _TimedCursor(cursor)
+
+    async def __aenter__(self):
+        self._cursor = await self._context.__aenter__()
+        return _TimedCursor(self._cursor)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self._context.__aexit__(exc_type, exc, tb)
+
+class _TimedConnection:
+    """Database.connection() 交給 DAO 的連線代理，cursor 會記錄 SQL 執行時間"""
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *cursors):
+        return _TimedCursorContext(self._conn.cursor(*cursors))
 
 class Database:
     _pool = None
 
     @classmethod
     async def init_pool(cls):
-        """初始化連線池"""
+        """初始化連線池，並預先建立 minsize 條連線"""
         cls._pool = await create_pool(
             host=os.getenv("DB_HOST"),
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD"),
             db=os.getenv("DB_NAME"),
-            minsize=1,
-            maxsize=10,
+            minsize=DB_POOL_MINSIZE,
+            maxsize=DB_POOL_MAXSIZE,
+            pool_recycle=DB_POOL_RECYCLE,
+            connect_timeout=DB_CONNECT_TIMEOUT,
             autocommit=True,
         )
-        print("[✅] Connection pool initialized")
+        logger.info("Connection pool initialized (min=%d, max=%d, warm=%d)",
+                    DB_POOL_MINSIZE, DB_POOL_MAXSIZE, cls._pool.freesize)
 
     @classmethod
     async def close_pool(cls):
@@ -32,44 +132,88 @@ class Database:
         if cls._pool:
             cls._pool.close()
             await cls._pool.wait_closed()
-            print("[❎] Connection pool closed")
+            cls._pool = None
+            logger.info("Connection pool closed")
+
+    @classmethod
+    async def _acquire(cls):
+        if USE_POOL_TIMEOUT:
+            return await asyncio.wait_for(cls._pool.acquire(), timeout=POOL_TIMEOUT)
+        return await cls._pool.acquire()
+
+    @classmethod
+    async def _is_alive(cls, conn) -> bool:
+        """閒置過久的連線先 ping 確認仍可使用"""
+        if DB_POOL_PING_IDLE < 0 or asyncio.get_event_loop().time() - conn.last_usage < DB_POOL_PING_IDLE:
+            return True
+        try:
+            await conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
 
     @classmethod
     async def get_connection(cls):
-        """取得連線，可選 timeout 控制"""
+        """取得連線，可選 timeout 控制；失效的連線會關閉並重新取得"""
         if cls._pool is None:
             raise RuntimeError("❌ Connection pool not initialized")
 
+        start = time.perf_counter()
         try:
-            if USE_POOL_TIMEOUT:
-                return await asyncio.wait_for(cls._pool.acquire(), timeout=POOL_TIMEOUT)
-            else:
-                return await cls._pool.acquire()
+            # 最多換 maxsize + 1 次，確保整個池的連線都失效時仍能建立新連線
+            for _ in range(cls._pool.maxsize + 1):
+                conn = await cls._acquire()
+                if await cls._is_alive(conn):
+                    return conn
+                pool_ping_failures.inc()
+                # 關閉後歸還，連線池會丟棄這條連線，下一次 acquire 會補上新連線
+                conn.close()
+                await cls._pool.release(conn)
+            raise RuntimeError("❌ Unable to get a healthy database connection")
         except asyncio.TimeoutError:
+            pool_acquire_timeouts.inc()
             raise RuntimeError("❌ Connection pool acquire timed out")
+        finally:
+            pool_acquire_seconds.observe(time.perf_counter() - start)
 
     @classmethod
     async def release_connection(cls, conn):
         """釋放連線"""
         if cls._pool and conn:
-            cls._pool.release(conn)
+            await cls._pool.release(conn)
 
     @classmethod
     @asynccontextmanager
     async def connection(cls):
-        """可使用 async with 的連線操作"""
+        """可使用 async with 的連線操作；SQL 執行時間會記錄到 db_query_duration_seconds"""
         conn = await cls.get_connection()
         try:
-            yield conn
+            yield _TimedConnection(conn)
         finally:
             await cls.release_connection(conn)
 
+    @classmethod
+    def status(cls) -> dict:
+        """目前連線池狀態"""
+        if cls._pool is None:
+            return {"initialized": False}
+        return {
+            "initialized": True,
+            "size": cls._pool.size,
+            "free": cls._pool.freesize,
+            "in_use": cls._pool.size - cls._pool.freesize,
+            "minsize": cls._pool.minsize,
+            "maxsize": cls._pool.maxsize,
+            "acquire": pool_acquire_seconds.snapshot(),
+            "ping_failures": pool_ping_failures.value(),
+            "acquire_timeouts": pool_acquire_timeouts.value(),
+        }
+
     @classmethod
     def debug_status(cls):
-        """列出目前 pool 狀態（僅供除錯用）"""
-        if cls._pool:
-            print(f"[🌀] Pool size      : {cls._pool.size}")
-            print(f"[🔒] Used          : {cls._pool._used}")
-            print(f"[🆓] Free          : {cls._pool.freesize}")
+        """記錄目前 pool 狀態（僅供除錯用）"""
+        status = cls.status()
+        if status["initialized"]:
+            logger.info("Pool size=%d used=%d free=%d", status["size"], status["in_use"], status["free"])
         else:
-            print("❌ Pool not initialized.")
+            logger.info("Pool not initialized.")
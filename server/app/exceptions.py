@@ -16,6 +16,12 @@ class ValidationError(Exception):
     """
     pass
 
+class PayloadTooLargeError(ValidationError):
+    """上傳內容超過大小上限時使用，例如影片檔案過大。
+    主要用於上傳處理（utils 層），routes 層轉換為 413 回應。
+    """
+    pass
+
 class DatabaseError(Exception):
     """資料庫操作發生錯誤時使用，例如連線失敗或 SQL 執行錯誤。
     主要用於 dao 層（資料庫存取），service 層可捕捉並轉換為更高層錯誤。
@@ -1,14 +1,132 @@
+import logging
 import os
 import pickle
-from tensorflow import keras
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
 
 # 模型與 Scaler 的路徑
 MODEL_PATH = "models/cnn_lstm_fall_detection_model.h5"
 SCALER_PATH = "models/cnn_scaler.pkl"
+# 匯出後的輕量模型（python -m tools.export_fall_model 產生）
+ONNX_MODEL_PATH = os.getenv("FALL_ONNX_MODEL_PATH", "models/cnn_lstm_fall_detection_model.onnx")
+TFLITE_MODEL_PATH = os.getenv("FALL_TFLITE_MODEL_PATH", "models/cnn_lstm_fall_detection_model.tflite")
+
+# 推論引擎：keras（完整 TensorFlow）、onnx（onnxruntime）、tflite（tflite-runtime 或 tf.lite）
+FALL_MODEL_RUNTIME = os.getenv("FALL_MODEL_RUNTIME", "keras").lower()
+# onnx / tflite 推論使用的執行緒數（0 為由 runtime 自行決定）
+FALL_MODEL_THREADS = int(os.getenv("FALL_MODEL_THREADS", 0))
+
+# 模型未提供輸入長度時使用的預設時間步數
+DEFAULT_TIME_STEPS = 120
+
+class OnnxFallModel:
+    """
+    onnxruntime 推論，提供與 Keras 模型相同的 predict / input_shape 介面。
+    InferenceSession.run 可多執行緒同時呼叫。
+    """
+    def __init__(self, path: str, threads: int = FALL_MODEL_THREADS):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self._session = ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        # 動態維度在 onnxruntime 中是字串（例如 "batch"）或 None，統一轉為 None
+        self.input_shape = tuple(dim if isinstance(dim, int) else None for dim in model_input.shape)
+
+    def predict(self, x, verbose=0):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        return self._session.run(None, {self._input_name: x})[0]
+
+class TFLiteFallModel:
+    """
+    TFLite 推論，提供與 Keras 模型相同的 predict / input_shape 介面。
+    Interpreter 不可多執行緒共用，predict 以 lock 保護；batch 大小改變時才重新配置 tensor。
+    """
+    def __init__(self, path: str, threads: int = FALL_MODEL_THREADS):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+
+        self._interpreter = Interpreter(model_path=path, num_threads=threads if threads > 0 else None)
+        self._input = self._interpreter.get_input_details()[0]
+        self._output_index = self._interpreter.get_output_details()[0]["index"]
+        shape = self._input.get("shape_signature", self._input["shape"])
+        self.input_shape = (None,) + tuple(int(dim) if dim > 0 else None for dim in shape[1:])
+        self._batch_size = None
+        self._lock = threading.Lock()
+
+    def predict(self, x, verbose=0):
+        x = np.ascontiguousarray(x, dtype=np.float32)
+        with self._lock:
+            if x.shape[0] != self._batch_size:
+                self._interpreter.resize_tensor_input(self._input["index"], x.shape)
+                self._interpreter.allocate_tensors()
+                self._batch_size = x.shape[0]
+            self._interpreter.set_tensor(self._input["index"], x)
+            self._interpreter.invoke()
+            return self._interpreter.get_tensor(self._output_index).copy()
+
+def _load_keras_model(path: str = MODEL_PATH):
+    # TensorFlow 匯入很慢，只有使用 keras runtime 時才載入
+    from tensorflow import keras
+    # 只做推論不需要 optimizer / metrics；訓練時使用自訂的 selective_accuracy，不載入 compile 設定才讀得到
+    return keras.models.load_model(path, compile=False)
+
+MODEL_LOADERS = {
+    "keras": _load_keras_model,
+    "onnx": lambda: OnnxFallModel(ONNX_MODEL_PATH),
+    "tflite": lambda: TFLiteFallModel(TFLITE_MODEL_PATH),
+}
 
 # 載入模型與 Scaler
-def load_fall_model():
-    model = keras.models.load_model(MODEL_PATH)
+def load_fall_model(runtime: str = None):
+    """
+    依 FALL_MODEL_RUNTIME 載入模型，回傳 (model, scaler)。
+    三種 runtime 的 model 都提供 predict(x, verbose=0) 與 input_shape。
+    """
+    runtime = (runtime or FALL_MODEL_RUNTIME).lower()
+    if runtime not in MODEL_LOADERS:
+        raise ValueError(f"不支援的 FALL_MODEL_RUNTIME：{runtime}（可用：{', '.join(MODEL_LOADERS)}）")
+    model = MODEL_LOADERS[runtime]()
     with open(SCALER_PATH, "rb") as f:
         scaler = pickle.load(f)
-    return model, scaler
\ No newline at end of file
+    return model, scaler
+
+class FallModel:
+    """
+    跌倒偵測模型與 Scaler 的共用實例，於 lifespan 啟動時載入一次。
+    """
+    _model = None
+    _scaler = None
+
+    @classmethod
+    def init_model(cls):
+        """載入模型與 Scaler（同步，會阻塞，請於 executor 中呼叫）"""
+        cls._model, cls._scaler = load_fall_model()
+        logger.info("Fall model loaded (runtime=%s)", FALL_MODEL_RUNTIME)
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return cls._model is not None
+
+    @classmethod
+    def get(cls):
+        """取得 (model, scaler)，尚未載入時拋出 RuntimeError"""
+        if cls._model is None:
+            raise RuntimeError("❌ Fall model not initialized")
+        return cls._model, cls._scaler
+
+    @classmethod
+    def time_steps(cls) -> int:
+        """模型輸入的時間步數（由模型 input_shape 取得）"""
+        model, _ = cls.get()
+        shape = getattr(model, "input_shape", None)
+        if shape and len(shape) == 3 and shape[1]:
+            return int(shape[1])
+        return DEFAULT_TIME_STEPS
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List
@@ -7,6 +8,8 @@ from ..service.emergency_contacts_service import (
     remove_contact
 )
 
+logger = logging.getLogger(__name__)
+
 contact_router = APIRouter()
 
 class CreateContactRequest(BaseModel):
@@ -37,16 +40,14 @@ async def get_contacts(
     role: int = Query(None, description="要過濾的角色ID（選填）")
 ):
     try:
-        print(f"[DEBUG] 查詢 user_phone={user_phone}, role={role}")
+        logger.debug("查詢 user_phone=%s, role=%s", user_phone, role)
         contacts = await get_contact_relations(user_phone, role)
         return contacts
     except ValueError as ve:
-        print(f"[ERROR] ValueError: {ve}")
+        logger.warning("ValueError: %s", ve)
         raise HTTPException(status_code=404, detail=str(ve))
     except Exception as e:
-        import traceback
-        print(f"[EXCEPTION] 發生例外:")
-        traceback.print_exc()
+        logger.exception("查詢照護關係時發生例外")
         raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
 
 @contact_router.delete("/contact")
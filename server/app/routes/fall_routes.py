@@ -1,9 +1,7 @@
 import os
 import shutil
-import tempfile
 import datetime
-import cv2
-from fastapi import APIRouter, HTTPException, UploadFile, Form, Query
+from fastapi import APIRouter, HTTPException, UploadFile, Form, Query, Request
 from fastapi.responses import JSONResponse, FileResponse
 from typing import Optional, List
 from ..service.fall_event_service import (
@@ -11,24 +9,26 @@ from ..service.fall_event_service import (
     get_video_filename_for_fall_event,
     add_fall_event_with_video
 )
+from ..service.fall_inference_service import detect_fall_in_video
+from ..service.model_warmup import model_warmup
+from ..utils.upload_utils import save_upload_file
+from ..utils.conditional_response import cached_file_response
+from ..exceptions import ValidationError, PayloadTooLargeError, NotFoundError
 
 fall_router = APIRouter()
 
 TEMP_VIDEO_DIR = "sources/tmp"
 VIDEOS_DIR = "sources/fall_videos"
 
-# 清空 tmp 資料夾
+# 清空 tmp 資料夾（於 lifespan 啟動時呼叫，匯入模組不再有副作用）
 def clear_temp_directory():
     if os.path.exists(TEMP_VIDEO_DIR):
         shutil.rmtree(TEMP_VIDEO_DIR)  # 刪除整個資料夾
     os.makedirs(TEMP_VIDEO_DIR, exist_ok=True)  # 重新建立空的資料夾
 
-# 在應用程式啟動時清空暫存區
-clear_temp_directory()
-
 @fall_router.post("/fall_video")
 async def detect_fall_video(
-    user_id: str = Form(..., description="使用者 ID"),
+    user_id: int = Form(..., description="使用者 ID"),
     video: UploadFile = Form(..., description="上傳的 MP4 影片檔案")
 ):
     """
@@ -36,41 +36,55 @@ async def detect_fall_video(
     """
     if not video.filename.lower().endswith(".mp4"):
         raise HTTPException(status_code=400, detail="檔案格式不符，請上傳 MP4 影片")
-
+    if not model_warmup.is_ready():
+        raise HTTPException(status_code=503, detail="模型載入中，請稍後再試", headers={"Retry-After": "5"})
+
+    # 先寫入暫存資料夾，推論完成且寫入資料庫後才留在影片資料夾；任何失敗都會清除檔案
+    video_filename = f"{user_id}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.mp4"
+    temp_path = None
+    moved_path = None
+    committed = False
     try:
-        # 將上傳的影片存成 temporary 檔
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4", dir=TEMP_VIDEO_DIR) as tmp:
-            video_path = tmp.name
-            tmp.write(await video.read())
-
-        # 取得影片的 FPS 與幀數
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
+        try:
+            temp_path = await save_upload_file(video, TEMP_VIDEO_DIR, video_filename)
+        except PayloadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # 串流解碼影片並以 CNN-LSTM 模型對滑動視窗評分
+        try:
+            detection = await detect_fall_in_video(temp_path)
+        except ValueError:
             raise HTTPException(status_code=400, detail="影片讀取失敗")
-        video_fps = int(cap.get(cv2.CAP_PROP_FPS))
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        cap.release()
-
-        # 模擬處理邏輯（實際邏輯應該調用服務層函數）
-        prediction_result = "fall" if frame_count > 100 else "non-fall"
+        prediction_result = "fall" if detection["is_fall"] else "non-fall"
 
-        # 儲存影片檔案
+        # 通知可能馬上附上影片連結，因此在寫入資料庫前先移入影片資料夾
         os.makedirs(VIDEOS_DIR, exist_ok=True)
-        video_filename = f"{user_id}_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.mp4"
-        video_path = os.path.join(VIDEOS_DIR, video_filename)
-        shutil.move(tmp.name, video_path)
+        moved_path = os.path.join(VIDEOS_DIR, video_filename)
+        os.replace(temp_path, moved_path)
+        temp_path = None
 
         # 儲存到資料庫
         await add_fall_event_with_video(
             user_id=user_id,
             location="客廳",
             pose_before_fall="走路中",
-            video_filename=video_filename
+            video_filename=video_filename,
+            notify=detection["is_fall"]
         )
+        committed = True
 
-        return {"id": user_id, "result": prediction_result}
+        return {"id": user_id, "result": prediction_result, "score": detection["max_score"]}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
+    finally:
+        if not committed:
+            for path in (temp_path, moved_path):
+                if path is not None and os.path.exists(path):
+                    os.unlink(path)
 
 @fall_router.get("/fall_videos_data")
 async def get_merged_fall_videos(
@@ -98,12 +112,18 @@ async def get_merged_fall_videos(
         raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
 
 @fall_router.get("/fall_video_file")
-async def get_merged_fall_video_file(record_id: int = Query(..., description="資料庫中的 record_id")):
+async def get_merged_fall_video_file(
+    request: Request,
+    record_id: int = Query(..., description="資料庫中的 record_id")
+):
     """
-    取得合併後的跌倒影片檔案。
+    取得合併後的跌倒影片檔案，支援 Range 分段下載與條件式 GET。
     """
     try:
-        video_filename = await get_fall_event_video_filename_by_record_id(record_id)
+        try:
+            video_filename = await get_fall_event_video_filename_by_record_id(record_id)
+        except NotFoundError:
+            video_filename = None
         if not video_filename:
             raise HTTPException(status_code=404, detail="找不到影片")
 
@@ -111,10 +131,8 @@ async def get_merged_fall_video_file(record_id: int = Query(..., description="
         if not os.path.exists(video_path):
             raise HTTPException(status_code=404, detail="影片檔案不存在於伺服器")
 
-        return FileResponse(
-            path=video_path,
-            media_type="video/mp4",
-            filename=video_filename
-        )
+        return cached_file_response(request, video_path, media_type="video/mp4", filename=video_filename)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
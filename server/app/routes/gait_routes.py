@@ -3,6 +3,8 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, UploadFile, Form
 from fastapi.responses import JSONResponse
 from ..db import Database
+from ..utils.upload_utils import save_upload_file
+from ..exceptions import ValidationError, PayloadTooLargeError
 
 gait_router = APIRouter()
 GAIT_VIDEO_FOLDER = os.path.join("static", "gait_instability_videos")
@@ -25,11 +27,14 @@ async def add_gait_instability(
         detected_time_obj = datetime.strptime(detected_time, "%Y-%m-%d %H:%M:%S")
         timestamp = detected_time_obj.strftime('%Y%m%d_%H%M%S')
         filename = f"user{user_id}_{timestamp}.mp4"
-        save_path = os.path.join(GAIT_VIDEO_FOLDER, filename)
 
-        # 儲存影片檔案
-        with open(save_path, "wb") as f:
-            f.write(await video.read())
+        # 以串流方式儲存影片檔案
+        try:
+            await save_upload_file(video, GAIT_VIDEO_FOLDER, filename)
+        except PayloadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         # 儲存資料到資料庫
         async with Database.connection() as conn:
@@ -45,5 +50,7 @@ async def add_gait_instability(
             content={"message": "步態不穩事件已新增成功", "video_filename": filename},
             status_code=200
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
\ No newline at end of file
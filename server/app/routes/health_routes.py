@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ..db import Database
+from ..service.model_warmup import model_warmup
+from ..service.notification_queue import notification_queue
+from ..utils.metrics import registry
+
+health_router = APIRouter()
+
+registry.gauge("models_ready", "推論模型是否已完成 warm-up（1 為就緒）", fn=lambda: int(model_warmup.is_ready()))
+
+@health_router.get("/ready")
+async def ready():
+    """
+    就緒檢查：資料庫連線池已建立且模型已完成 warm-up 時回傳 200，否則回傳 503。
+    server 啟動後資料庫 / CRUD 路由即可使用，模型在背景載入，完成前影片與串流推論會回應 503 / 1013。
+    """
+    status = model_warmup.status()
+    status["database"] = Database.status()["initialized"]
+    status["notification_workers"] = notification_queue.alive_workers()
+    status["ready"] = status["ready"] and status["database"]
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+from ..db import Database
+from ..service.emergency_contacts_service import alert_contact_index
+from ..service.fall_event_service import video_filename_cache
+from ..service.post_audio_service import post_audio_service
+from ..utils.metrics import registry
+
+metrics_router = APIRouter()
+
+def _cache_stats() -> dict:
+    return {
+        "video_filename": video_filename_cache.stats(),
+        "alert_contacts": alert_contact_index.stats(),
+        "post_audio": post_audio_service.cache.stats(),
+    }
+
+def _cache_metric(field: str):
+    return lambda: {(name,): stats[field] for name, stats in _cache_stats().items()}
+
+registry.counter("cache_hits_total", "行程內快取命中次數", ("cache",), fn=_cache_metric("hits"))
+registry.counter("cache_misses_total", "行程內快取未命中次數", ("cache",), fn=_cache_metric("misses"))
+registry.gauge(
+    "cache_entries", "行程內快取目前的項目數", ("cache",),
+    fn=lambda: {(name,): stats.get("size", stats.get("files", 0)) for name, stats in _cache_stats().items()}
+)
+
+@metrics_router.get("/metrics")
+async def metrics():
+    """
+    Prometheus text format 的服務指標。
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@metrics_router.get("/metrics/db_pool")
+async def db_pool_metrics():
+    """
+    資料庫連線池目前的使用狀況。
+    """
+    return JSONResponse(content=Database.status())
@@ -1,39 +1,19 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, FileResponse
-from pathlib import Path
-from openai import OpenAI
-from datetime import datetime
-import os
-from ..utils.news_utils import generate_daily_summary
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+from ..service.news_audio_service import news_audio_service
+from ..utils.conditional_response import cached_file_response
 
 news_voice_router = APIRouter()
 
-VOICE_OUTPUT_DIR = Path(__file__).resolve().parent.parent.parent / 'static/news_audio'
-VOICE_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
 @news_voice_router.post("/generate_news_audio")
-async def generate_news_audio():
+async def generate_news_audio(force: bool = Query(False, description="是否重新產生今日語音")):
     """
     生成今日新聞語音摘要。
+    今日語音已存在時直接回傳；同時多個請求只會觸發一次產生。
     """
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     try:
-        today_str = datetime.today().strftime("%Y%m%d")
-        speech_file_path = VOICE_OUTPUT_DIR / f"news_{today_str}.mp3"
-
-        if speech_file_path.exists():
-            speech_file_path.unlink()
-
-        summary = generate_daily_summary()
-
-        with client.audio.speech.with_streaming_response.create(
-            model="gpt-4o-mini-tts",
-            voice="nova",
-            input=summary,
-            instructions="請用溫暖親切的語氣唸出今日新聞摘要。",
-            speed=0.8
-        ) as response:
-            response.stream_to_file(speech_file_path)
+        summary = await news_audio_service.ensure(force=force)
+        speech_file_path = news_audio_service.audio_path()
 
         return JSONResponse(content={
             "status": "success",
@@ -45,18 +25,22 @@ async def generate_news_audio():
         raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
 
 @news_voice_router.get("/play_today_news_audio")
-async def play_today_news_audio():
+async def play_today_news_audio(request: Request):
     """
     播放今日新聞語音摘要。
     """
-    today_str = datetime.today().strftime("%Y%m%d")
-    speech_file_path = VOICE_OUTPUT_DIR / f"news_{today_str}.mp3"
+    speech_file_path = news_audio_service.audio_path()
 
     if not speech_file_path.exists():
+        if news_audio_service.in_cooldown():
+            raise HTTPException(status_code=503, detail="今日語音摘要產生失敗，請稍後再試")
+        # 尚未產生時於背景開始產生，稍後再請求即可取得
+        news_audio_service.generate_in_background()
         raise HTTPException(status_code=404, detail="尚未產生今日語音摘要")
 
-    return FileResponse(
-        path=speech_file_path,
+    return cached_file_response(
+        request,
+        path=str(speech_file_path),
         media_type="audio/mpeg",
         filename=speech_file_path.name
-    )
\ No newline at end of file
+    )
@@ -1,68 +1,84 @@
-import os
-from fastapi import APIRouter, HTTPException
+import logging
+import uuid
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
-from datetime import datetime
+from pydantic import BaseModel
 from ..db import Database
-import httpx
+from ..dao.users_dao import select_line_ids_by_role
+from ..service.fall_alert_service import build_fall_alert_message, acknowledge_fall_alert, CAREGIVER_ROLE_ID
+from ..service.notification_queue import notification_queue, fall_job_key
+from ..exceptions import NotFoundError, AuthenticationError, PermissionDeniedError
 
-notify_line_router = APIRouter()
-
-LINE_CHANNEL_ACCESS_TOKEN = os.getenv("LINE_CHANNEL_ACCESS_TOKEN")
+logger = logging.getLogger(__name__)
 
-async def push_line_message(user_id: str, message: str) -> int:
-    """
-    傳送 LINE 訊息給指定的使用者。
-    """
-    url = "https://api.line.me/v2/bot/message/push"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {LINE_CHANNEL_ACCESS_TOKEN}"
-    }
-    payload = {
-        "to": user_id,
-        "messages": [
-            {
-                "type": "text",
-                "text": message
-            }
-        ]
-    }
+notify_line_router = APIRouter()
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url, headers=headers, json=payload)
-        print(f"傳送給 {user_id}，狀態碼：{response.status_code}")
-        if response.status_code != 200:
-            print(f"回應內容：{response.text}")
-        return response.status_code
+class AckFallAlertRequest(BaseModel):
+    record_id: int
+    # 確認者（緊急聯絡人）的登入資訊
+    phone: str
+    password: str
 
 @notify_line_router.post("/notify_line")
 async def notify_line():
     """
-    發送跌倒事件通知給 LINE 使用者。
+    手動發送跌倒事件通知給 LINE 使用者。
+    通知寫入佇列後立即回應，由背景 worker 送出；偵測到跌倒時會自動通知，不需呼叫此 API。
     """
     try:
-        detected_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        message = f"""⚠️ 注意！偵測到跌倒事件 ⚠️
-時間：{detected_time}
-請立即檢查爺爺奶奶的狀況，確保他們安全無恙。"""
+        message = build_fall_alert_message()
 
         async with Database.connection() as conn:
-            async with conn.cursor() as cursor:
-                await cursor.execute("SELECT line_id FROM users WHERE role_id = 2")
-                user_ids = [row["line_id"] for row in await cursor.fetchall()]
+            user_ids = await select_line_ids_by_role(conn, CAREGIVER_ROLE_ID)
 
-        success_list, fail_list = [], []
-        for uid in user_ids:
-            status = await push_line_message(uid, message)
-            (success_list if status == 200 else fail_list).append(uid)
+        job_key = f"manual:{uuid.uuid4().hex}"
+        queued = await notification_queue.enqueue(job_key, user_ids, message)
 
         return JSONResponse(content={
-            "status": "ok",
-            "sent": success_list,
-            "failed": fail_list,
+            "status": "queued",
+            "job_key": job_key,
+            "queued": queued,
             "message": message
-        }, status_code=200)
+        }, status_code=202)
+
+    except Exception as e:
+        logger.exception("發送失敗：%s", e)
+        raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
 
+@notify_line_router.get("/notify_line/status")
+async def notify_line_status(
+    record_id: int = Query(None, description="跌倒事件的 record_id"),
+    job_key: str = Query(None, description="手動通知回傳的 job_key")
+):
+    """
+    查詢通知的送出狀態（pending / sending / sent / dead）。
+    """
+    if record_id is None and not job_key:
+        raise HTTPException(status_code=400, detail="請提供 record_id 或 job_key")
+    try:
+        jobs = await notification_queue.status(fall_job_key(record_id) if record_id is not None else job_key)
+        if not jobs:
+            raise HTTPException(status_code=404, detail="找不到通知紀錄")
+        return JSONResponse(content={"jobs": jobs, "queue": await notification_queue.stats()})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
+
+@notify_line_router.post("/fall_alert/ack")
+async def ack_fall_alert(data: AckFallAlertRequest):
+    """
+    緊急聯絡人確認已處理跌倒事件，停止通知後續優先順序的聯絡人。
+    只有該事件長者的緊急聯絡人可以確認。
+    """
+    try:
+        cancelled = await acknowledge_fall_alert(data.record_id, data.phone, data.password)
+        return {"message": "已確認跌倒事件", "record_id": data.record_id, "cancelled": cancelled}
+    except AuthenticationError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except PermissionDeniedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        print(f"[錯誤] 發送失敗：{str(e)}")
-        raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
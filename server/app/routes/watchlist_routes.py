@@ -1,14 +1,19 @@
+from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query, Body
 from pydantic import BaseModel
 from typing import Optional
 from ..service.video_watchlist_service import (
     add_video_to_watchlist,
     remove_video_from_watchlist,
-    get_watchlist_video_data_by_id
+    get_watchlist_video_data
 )
 
 watchlist_router = APIRouter()
 
+# 觀看清單每頁預設與最大筆數
+WATCHLIST_PAGE_SIZE = 20
+WATCHLIST_MAX_PAGE_SIZE = 100
+
 class AddToWatchlistRequest(BaseModel):
     user_id: int
     record_id: int
@@ -22,16 +27,30 @@ class DeleteFromWatchlistRequest(BaseModel):
 @watchlist_router.get("/watchlist")
 async def get_watchlist_data(
     user_id: int = Query(..., description="使用者 ID"),
-    video_type: str = Query(..., description="影片類型")
+    video_type: str = Query(..., description="影片類型"),
+    limit: int = Query(WATCHLIST_PAGE_SIZE, ge=1, le=WATCHLIST_MAX_PAGE_SIZE,
+                       description=f"每頁筆數（1-{WATCHLIST_MAX_PAGE_SIZE}）"),
+    before_added_at: Optional[str] = Query(None, description="上一頁最後一筆的 added_at (yyyy-mm-dd HH:MM:SS)"),
+    before_record_id: Optional[int] = Query(None, description="上一頁最後一筆的 record_id")
 ):
     """
-    取得使用者的觀看清單資料。
+    取得使用者的觀看清單資料，依加入時間由新到舊排序。
+    以上一頁最後一筆的 added_at 與 record_id 取得下一頁。
     """
     try:
-        watchlist_data = await get_watchlist_video_data_by_id(user_id, video_type)
-        if not watchlist_data:
+        before = None
+        if before_added_at:
+            try:
+                before = datetime.fromisoformat(before_added_at)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="before_added_at 格式錯誤")
+
+        rows = await get_watchlist_video_data(user_id, video_type, before, before_record_id, limit)
+        if not rows:
             return {"message": "沒有找到任何收藏"}
-        return watchlist_data
+        return rows
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"伺服器錯誤: {str(e)}")
 
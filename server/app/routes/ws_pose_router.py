@@ -1,27 +1,126 @@
-from fastapi import APIRouter, WebSocket, Query
+import os
+import json
+import logging
+import asyncio
+from typing import Dict
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
+from ..fall_model import FallModel
+from ..service.fall_inference_scheduler import fall_scheduler
+from ..service.fall_inference_service import FALL_THRESHOLD, INFERENCE_STRIDE
+from ..service.model_warmup import model_warmup
+from ..utils.pose_normalize import NUM_LANDMARKS, scale_features
+from ..utils.pose_frame_protocol import decode_pose_frame
+from ..utils.skeleton_ring_buffer import SkeletonRingBuffer
+from ..utils.logging_utils import LogSampler
 from ..utils.ws_connection_manager import ws_manager
 
+logger = logging.getLogger(__name__)
+
 ws_pose_router = APIRouter()
 
+# 每收到幾幀回傳一次跌倒分數
+POSE_SCORE_INTERVAL = int(os.getenv("POSE_SCORE_INTERVAL", INFERENCE_STRIDE))
+
+# 每個 user_id 一個環形緩衝區，同一使用者的多條連線共用
+pose_buffers: Dict[str, SkeletonRingBuffer] = {}
+# 每個 user_id 正在等待結果的推論工作，前一次尚未完成時不再送出新視窗
+scoring_tasks: Dict[str, asyncio.Task] = {}
+# 逐幀發生的錯誤每個使用者每 10 秒最多記錄一筆
+frame_log_sampler = LogSampler(interval=10.0)
+
+def parse_keypoints(message: str) -> np.ndarray:
+    """
+    解析單幀骨架 JSON：{"keypoints": [[x, y, visibility], ...]} 或直接為 33x3 陣列。
+    """
+    payload = json.loads(message)
+    if isinstance(payload, dict):
+        payload = payload.get("keypoints")
+    frame = np.asarray(payload, dtype=np.float32)
+    if frame.shape != (NUM_LANDMARKS, 3):
+        raise ValueError(f"keypoints 必須為 {NUM_LANDMARKS}x3 陣列")
+    return frame
+
+def parse_message(message: dict) -> np.ndarray:
+    """
+    解析 websocket 訊息：二進位幀（見 pose_frame_protocol）或 JSON 文字。
+    """
+    if message.get("bytes") is not None:
+        _, frame = decode_pose_frame(message["bytes"])
+        if frame.shape != (NUM_LANDMARKS, 3):
+            raise ValueError(f"關節數必須為 {NUM_LANDMARKS}，每個關節 3 個欄位")
+        return frame
+    return parse_keypoints(message.get("text") or "")
+
+async def score_window(user_id: str, buffer: SkeletonRingBuffer):
+    """
+    取出目前視窗送進批次推論排程器，並將分數推送給該使用者。
+    """
+    try:
+        _, scaler = FallModel.get()
+        frame_index = buffer.frame_count
+        window = scale_features(buffer.window(), scaler)
+        score = await fall_scheduler.submit(window)
+        await ws_manager.send_json({
+            "type": "fall_score",
+            "frame": frame_index,
+            "score": score,
+            "is_fall": score >= FALL_THRESHOLD
+        }, user_id)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        suppressed = frame_log_sampler.allow(("score", user_id))
+        if suppressed is not None:
+            logger.warning("推論失敗：%s", e, extra={"user_id": user_id, "suppressed": suppressed})
+
 @ws_pose_router.websocket("/ws/pose")
 async def websocket_pose(
     websocket: WebSocket,
     user_id: str = Query(..., description="用戶唯一識別ID")
 ):
     """
-    WebSocket 路由：管理連線、斷線、訊息收發，並用 user_id 區分使用者。
+    WebSocket 路由：接收逐幀骨架點（二進位幀或 JSON），寫入使用者的環形緩衝區，每 N 幀推送一次跌倒分數。
     """
+    if not model_warmup.is_ready():
+        # 模型尚在背景載入：以 1013 (Try Again Later) 關閉，客戶端稍後重連
+        await websocket.accept()
+        await websocket.close(code=1013, reason="model warming up")
+        return
     await ws_manager.connect(user_id, websocket)
+    buffer = pose_buffers.get(user_id)
+    if buffer is None:
+        buffer = pose_buffers[user_id] = SkeletonRingBuffer(FallModel.time_steps())
     try:
         while True:
-            # 等待接收訊息
-            data = await websocket.receive_text()
-            print(f"[{user_id}] 收到訊息：{data}")
+            # 等待接收訊息（二進位幀或 JSON 文字）
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            try:
+                frame = parse_message(message)
+            except ValueError as e:
+                suppressed = frame_log_sampler.allow(("parse", user_id))
+                if suppressed is not None:
+                    logger.info("骨架資料格式錯誤：%s", e, extra={"user_id": user_id, "suppressed": suppressed})
+                await websocket.send_json({"type": "error", "message": f"骨架資料格式錯誤：{e}"})
+                continue
 
-            # 回傳給同一個用戶（或你可以 broadcast，或再做動作分析等處理）
-            await ws_manager.send_personal_message("資料已送達", user_id)
-    except Exception as e:
-        print(f"[{user_id}] 斷線/例外：{e}")
+            buffer.append(frame)
+            if not buffer.is_full or buffer.frame_count % POSE_SCORE_INTERVAL != 0:
+                continue
+            task = scoring_tasks.get(user_id)
+            if task is None or task.done():
+                scoring_tasks[user_id] = asyncio.create_task(score_window(user_id, buffer))
+    except WebSocketDisconnect as e:
+        logger.info("websocket 斷線 code=%s", e.code, extra={"user_id": user_id})
+    except Exception:
+        logger.exception("websocket 例外", extra={"user_id": user_id})
     finally:
         ws_manager.disconnect(user_id, websocket)
-        print(f"[{user_id}] 已斷開連線")
+        if not ws_manager.get_user_connections(user_id):
+            pose_buffers.pop(user_id, None)
+            task = scoring_tasks.pop(user_id, None)
+            if task is not None:
+                task.cancel()
+        logger.info("已斷開連線", extra={"user_id": user_id})
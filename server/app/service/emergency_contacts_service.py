@@ -1,14 +1,62 @@
+import os
 import aiomysql
+from typing import List
 from ..db import Database
 from ..dao.emergency_contacts_dao import (
     insert_emergency_contacts,
-    select_contacts_by_user_id,
+    select_contact_relations,
     select_contact_by_pair,
     delete_contact
 )
-from ..dao.users_dao import select_user_by_id, select_user_by_phone
-from ..dao.role_dao import select_role_name_by_id
+from ..dao.users_dao import select_user_by_phone
+from .role_id_service import RoleCache
 from ..exceptions import NotFoundError, AlreadyExistsError, DatabaseError
+from ..utils.cache_utils import TTLCache
+
+# 長者 user_id（一律轉為 int）→ 依 priority 分層的聯絡人 line_id；
+# 新增或刪除關係、使用者更新 line_id 或刪除帳號時會清除對應項目
+ALERT_CONTACT_CACHE_TTL = float(os.getenv("ALERT_CONTACT_CACHE_TTL", 3600))
+alert_contact_index = TTLCache(maxsize=4096, ttl=ALERT_CONTACT_CACHE_TTL)
+
+def invalidate_alert_contacts(*user_ids: int):
+    """照護關係異動時清除雙方的聯絡人索引"""
+    for user_id in user_ids:
+        alert_contact_index.invalidate(int(user_id))
+
+async def select_alert_contact_owners(conn, user_id: int) -> List[int]:
+    """
+    回傳聯絡人索引中可能含有此使用者 line_id 的 user_id（本人與所有照護關係對象）。
+    使用者變更 line_id 或刪除帳號時，須在異動前查出並於異動後以 invalidate_alert_contacts 清除，
+    避免警報繼續送到舊的 LINE 帳號。
+    """
+    rows = await select_contact_relations(conn, user_id)
+    return [int(user_id)] + [row["user_id"] for row in rows]
+
+async def get_alert_contact_tiers(elder_id: int) -> List[List[str]]:
+    """
+    取得長者的緊急聯絡人 line_id，依 priority 由小到大分層（同一 priority 為同一層）。
+    結果快取在記憶體中，發送警報時不需查詢資料庫。
+    """
+    # 快取 key 與 invalidate_alert_contacts 一致使用 int，避免 "7" 與 7 各存一份而清除不到
+    elder_id = int(elder_id)
+    tiers = alert_contact_index.get(elder_id)
+    if tiers is not None:
+        return tiers
+
+    async with Database.connection() as conn:
+        rows = await select_contact_relations(conn, elder_id)
+
+    tiers, seen = {}, set()
+    # priority 未設定的聯絡人排在最後一層
+    for row in sorted(rows, key=lambda r: (r["priority"] is None, r["priority"] or 0)):
+        line_id = row["line_id"]
+        if not line_id or line_id in seen:
+            continue
+        seen.add(line_id)
+        tiers.setdefault(row["priority"], []).append(line_id)
+    tiers = list(tiers.values())
+    alert_contact_index.set(elder_id, tiers)
+    return tiers
 
 
 async def add_contact_by_phone(user_phone, contact_phone, priority, relationship):
@@ -39,6 +87,7 @@ async def add_contact_by_phone(user_phone, contact_phone, priority, relationship
             success = await insert_emergency_contacts(conn, user_id, contact_id, priority, relationship)
             if not success:
                 raise DatabaseError("新增關係失敗")
+            invalidate_alert_contacts(user_id, contact_id)
             return "新增成功"
         except Exception as e:
             raise DatabaseError(f"新增照護關係時發生錯誤: {e}")
@@ -55,60 +104,24 @@ async def get_contact_relations(user_phone: int, role: int = None) -> list:
         if not user:
             raise NotFoundError(f"phone {user_phone} 不存在")
 
-        user_id = user["user_id"]
-
-        try:
-            contacts_as_user = await select_contacts_by_user_id(conn, user_id)
-        except NotFoundError:
-            contacts_as_user = []
-
-        contacts_as_contact = []
-        try:
-            async with conn.cursor(aiomysql.DictCursor) as cursor:
-                query = "SELECT * FROM emergency_contacts WHERE contact_id = %s"
-                await cursor.execute(query, (user_id,))
-                contacts_as_contact = list(await cursor.fetchall())
-        except Exception as e:
-            print(f"[ERROR] 查詢照護關係失敗: {e}")
-
-        all_contacts = contacts_as_user + contacts_as_contact
-        unique = {}
-        for c in all_contacts:
-            key = (c["user_id"], c["contact_id"])
-            unique[key] = c
-
-        result = []
-        for c in unique.values():
-            other_id = c["contact_id"] if c["user_id"] == user_id else c["user_id"]
-
-            try:
-                other_user = await select_user_by_id(conn, other_id)
-            except NotFoundError:
-                continue
-
-            try:
-                role_name = await select_role_name_by_id(conn, other_user["role_id"])
-            except NotFoundError:
-                role_name = "未知角色"
-
-            contact_info = {
-                "user_id": other_user["user_id"],
-                "name": other_user.get("name"),
-                "phone": other_user.get("phone"),
-                "role_id": other_user.get("role_id"),
-                "role_name": role_name,
-                "line_id": other_user.get("line_id"),
-                "priority": c["priority"],
-                "relationship": c["relationship"]
-            }
-            result.append(contact_info)
-
-        # ⬇️ 這裡做條件過濾
-        if role is not None:
-            # 支援 role 為 int 或 str（習慣上資料庫 role_id 多為 int）
-            result = [c for c in result if c["role_id"] == role]
-
-        return result
+        # 雙向關係與聯絡人資料以單一 JOIN 查詢取得，角色過濾也在 SQL 中完成
+        rows = await select_contact_relations(conn, user["user_id"], role)
+
+    result = []
+    for row in rows:
+        # 角色名稱來自記憶體中的角色快取，不再逐筆查詢 role 表
+        role_name = await RoleCache.get_name(row["role_id"])
+        result.append({
+            "user_id": row["user_id"],
+            "name": row["name"],
+            "phone": row["phone"],
+            "role_id": row["role_id"],
+            "role_name": role_name or "未知角色",
+            "line_id": row["line_id"],
+            "priority": row["priority"],
+            "relationship": row["relationship"]
+        })
+    return result
 
 async def remove_contact(user_phone: int, contact_phone: int) -> str:
     async with Database.connection() as conn:
@@ -142,6 +155,7 @@ async def remove_contact(user_phone: int, contact_phone: int) -> str:
             success2 = await delete_contact(conn, contact_id, user_id)
             if not (success1 or success2):
                 raise DatabaseError("刪除失敗")
+            invalidate_alert_contacts(user_id, contact_id)
             return "刪除成功"
         except Exception as e:
             raise DatabaseError(f"刪除照護關係時發生錯誤: {e}")
@@ -0,0 +1,71 @@
+import logging
+import os
+from datetime import datetime
+from ..db import Database
+from ..dao.users_dao import select_user_by_phone
+from ..dao.fall_events_dao import select_fall_event_by_id
+from ..exceptions import NotFoundError, AuthenticationError, PermissionDeniedError
+from .emergency_contacts_service import get_alert_contact_tiers
+from .notification_queue import notification_queue, fall_job_key
+
+logger = logging.getLogger(__name__)
+
+# 接收手動廣播通知的角色（照護者）
+CAREGIVER_ROLE_ID = 2
+# 上一層聯絡人多久沒有確認（秒）就通知下一層
+ALERT_TIER_TIMEOUT = float(os.getenv("ALERT_TIER_TIMEOUT", 120))
+
+def build_fall_alert_message(detected_time: datetime = None, location: str = None) -> str:
+    detected_time = (detected_time or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    location_line = f"\n地點：{location}" if location else ""
+    return f"""⚠️ 注意！偵測到跌倒事件 ⚠️
+時間：{detected_time}{location_line}
+請立即檢查爺爺奶奶的狀況，確保他們安全無恙。"""
+
+async def enqueue_fall_alert(record_id: int, user_id: int, location: str = None) -> int:
+    """
+    將跌倒事件的 LINE 通知寫入通知佇列，只通知該長者的緊急聯絡人。
+    聯絡人依 priority 分層：第一層立即送出，之後每層延後 ALERT_TIER_TIMEOUT 秒，
+    期間有人確認（acknowledge_fall_alert）就取消尚未送出的層級。
+    以 (record_id, 收件者) 去重，同一事件重複呼叫不會重複通知。
+    :return: 新增的通知筆數
+    """
+    tiers = await get_alert_contact_tiers(user_id)
+    if not tiers:
+        logger.warning("使用者 %s 沒有可通知的緊急聯絡人，record_id=%s", user_id, record_id)
+        return 0
+
+    message = build_fall_alert_message(location=location)
+    job_key = fall_job_key(record_id)
+    queued = 0
+    for level, recipients in enumerate(tiers):
+        queued += await notification_queue.enqueue(
+            job_key, recipients, message, record_id=record_id, delay=level * ALERT_TIER_TIMEOUT
+        )
+    return queued
+
+async def acknowledge_fall_alert(record_id: int, phone: str, password: str) -> int:
+    """
+    聯絡人確認已處理跌倒事件，取消尚未送出的後續層級。
+    確認者需以電話與密碼驗證身分，且必須是該事件長者的緊急聯絡人（在通知層級中）。
+    :return: 取消的通知筆數
+    :raises AuthenticationError: 電話或密碼錯誤
+    :raises PermissionDeniedError: 不是該事件的緊急聯絡人
+    :raises NotFoundError: 找不到跌倒事件
+    """
+    async with Database.connection() as conn:
+        try:
+            contact = await select_user_by_phone(conn, phone)
+        except NotFoundError:
+            contact = None
+        if contact is None or contact["password"] != password:
+            raise AuthenticationError("電話或密碼錯誤")
+        event = await select_fall_event_by_id(conn, record_id)
+
+    tiers = await get_alert_contact_tiers(event["user_id"])
+    if not contact["line_id"] or not any(contact["line_id"] in tier for tier in tiers):
+        raise PermissionDeniedError("不是此跌倒事件的緊急聯絡人")
+
+    cancelled = await notification_queue.cancel(fall_job_key(record_id))
+    logger.info("跌倒事件已確認 record_id=%s by user_id=%s，取消 %d 筆通知", record_id, contact["user_id"], cancelled)
+    return cancelled
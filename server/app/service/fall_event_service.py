@@ -1,25 +1,36 @@
+import logging
 from ..dao.fall_events_dao import (
     insert_fall_event,
     select_fall_event_records_by_user_and_time_range,
     select_fall_event_video_filename_by_id
 )
-from ..dao.video_watchlist_dao import select_watchlist_entry_by_user_and_record
+from ..dao.video_watchlist_dao import select_watchlisted_record_ids
 from ..db import Database
 from ..exceptions import DatabaseError, NotFoundError
+from ..utils.cache_utils import TTLCache
+from .fall_alert_service import enqueue_fall_alert
+
+logger = logging.getLogger(__name__)
+
+# record_id → 影片檔名；檔名寫入後不會變動，快取可避免 Range 請求每次都查資料庫
+video_filename_cache = TTLCache(maxsize=4096, ttl=3600)
 
 async def add_fall_event_with_video(
     user_id: int,
     location: str,
     pose_before_fall: str,
-    video_filename: str
+    video_filename: str,
+    notify: bool = True
 ) -> int:
     """
     將跌倒事件影片資訊存入資料庫，包含位置與跌倒前姿勢。
+    notify 為 True 時會將 LINE 通知寫入通知佇列，由背景 worker 送出。
 
     :param user_id: 使用者 ID
     :param location: 跌倒地點
     :param pose_before_fall: 跌倒前的動作敘述
     :param video_filename: 儲存的影片檔案名稱
+    :param notify: 是否通知照護者
     :return: 新增的 record_id，若失敗則拋出例外
     """
     async with Database.connection() as conn:
@@ -27,14 +38,26 @@ async def add_fall_event_with_video(
             record_id = await insert_fall_event(conn, user_id, location, pose_before_fall, video_filename)
             if record_id is None:
                 raise DatabaseError("資料庫紀錄跌倒影像資料失敗")
-            return record_id
         except Exception as e:
             raise DatabaseError(f"新增跌倒事件時發生錯誤: {e}")
 
+    if notify:
+        try:
+            await enqueue_fall_alert(record_id, user_id, location)
+        except Exception as e:
+            # 事件已寫入資料庫，通知排入失敗不影響回應
+            logger.error("跌倒通知排入佇列失敗 record_id=%s: %s", record_id, e)
+    return record_id
+
 async def get_fall_event_video_filename_by_record_id(record_id: int) -> str:
+    video_filename = video_filename_cache.get(record_id)
+    if video_filename is not None:
+        return video_filename
     async with Database.connection() as conn:
         try:
-            return await select_fall_event_video_filename_by_id(conn, record_id)
+            video_filename = await select_fall_event_video_filename_by_id(conn, record_id)
+            video_filename_cache.set(record_id, video_filename)
+            return video_filename
         except NotFoundError as e:
             raise NotFoundError(str(e))
         except Exception as e:
@@ -47,12 +70,12 @@ async def get_video_filename_for_fall_event(elder_id: int, caregiver_id: int, st
     async with Database.connection() as conn:
         try:
             results = await select_fall_event_records_by_user_and_time_range(conn, elder_id, start, end, limit)
+            # 一次查出所有 record_id 的收藏狀態，避免逐筆查詢
+            watchlisted = await select_watchlisted_record_ids(
+                conn, caregiver_id, [row["record_id"] for row in results]
+            )
             for row in results:
-                record_id = row.get("record_id")
-                try:
-                    row["in_watchlist"] = await select_watchlist_entry_by_user_and_record(conn, caregiver_id, record_id) is not None
-                except NotFoundError:
-                    row["in_watchlist"] = False
+                row["in_watchlist"] = row["record_id"] in watchlisted
             return results
         except NotFoundError:
             # 若查無資料，回傳空清單
@@ -0,0 +1,166 @@
+import logging
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from ..utils.pose_normalize import FEATURE_DIM
+from ..utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# 單次 model.predict 最多合併的視窗數
+MAX_BATCH_SIZE = int(os.getenv("FALL_BATCH_MAX_SIZE", 32))
+# 收到第一個視窗後，最多再等待多久湊批次（毫秒）
+MAX_WAIT_MS = float(os.getenv("FALL_BATCH_MAX_WAIT_MS", 10))
+
+fall_predict_seconds = registry.histogram("fall_predict_duration_seconds", "串流跌倒推論單次 model.predict 耗時（秒）")
+fall_batch_size = registry.histogram(
+    "fall_predict_batch_size", "串流跌倒推論每批的視窗數", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+fall_window_latency = registry.histogram("fall_window_latency_seconds", "視窗從送出到取得分數的延遲（秒）")
+fall_predict_errors = registry.counter("fall_predict_errors_total", "串流跌倒推論失敗的視窗數")
+
+class FallInferenceScheduler:
+    """
+    跌倒模型的微批次推論排程器：
+    將多個使用者同時送來的視窗合併為一次 model.predict，並把結果回傳給各自的 future。
+    """
+    def __init__(self, max_batch_size: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._model = None
+        self._queue = None
+        self._task = None
+        self._batch_buf = None
+        # 正在收集或推論中的批次；放在 self 上，排程器被取消時才能讓這些請求失敗而不是永遠等待
+        self._pending = []
+        # 模型呼叫固定在單一執行緒，避免多個 predict 互相搶 CPU
+        self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, model, time_steps: int):
+        """啟動排程器背景工作"""
+        if self.running:
+            return
+        self._model = model
+        self._queue = asyncio.Queue()
+        self._batch_buf = np.empty((self.max_batch_size, time_steps, FEATURE_DIM), dtype=np.float32)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fall-predict")
+        self._pending = []
+        self._task = asyncio.create_task(self._run())
+        logger.info("Fall inference scheduler started (batch=%d, wait=%.0fms)", self.max_batch_size, self.max_wait * 1000)
+
+    async def stop(self):
+        """停止排程器，尚未處理的視窗會收到 RuntimeError"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # _run 結束時已沒有進行中的 queue.get，佇列中剩下的視窗不會再被取走
+        while not self._queue.empty():
+            self._pending.append(self._queue.get_nowait())
+        self._fail_pending()
+        self._executor.shutdown(wait=False)
+        logger.info("Fall inference scheduler stopped")
+
+    async def submit(self, window: np.ndarray) -> float:
+        """
+        送出一個已標準化的視窗 (time_steps, 132) 或 (1, time_steps, 132)，回傳跌倒分數。
+        """
+        if not self.running:
+            raise RuntimeError("❌ Fall inference scheduler not started")
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((window, future, time.perf_counter()))
+        return await future
+
+    def _fail_pending(self):
+        for _, future, _ in self._pending:
+            if not future.done():
+                future.set_exception(RuntimeError("❌ Fall inference scheduler stopped"))
+        self._pending = []
+
+    async def _collect_batch(self):
+        batch = self._pending = []
+        batch.append(await self._queue.get())
+        deadline = time.perf_counter() + self.max_wait
+        getter = None
+        try:
+            while len(batch) < self.max_batch_size:
+                # 已在佇列中的視窗直接取出
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                # 不用 wait_for：逾時與 get 同時完成時 wait_for 可能丟掉已取出的視窗
+                getter = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait({getter}, timeout=remaining)
+                if not done:
+                    break
+                batch.append(getter.result())
+                getter = None
+        finally:
+            # 逾時或排程器被取消時，等 getter 真正結束；取消前已取出的視窗仍放進批次
+            if getter is not None:
+                getter.cancel()
+                await asyncio.wait({getter})
+                if not getter.cancelled():
+                    batch.append(getter.result())
+        # 已被呼叫端取消（例如 websocket 斷線）的請求不再送進模型
+        return [item for item in batch if not item[1].done()]
+
+    def _predict(self, size: int):
+        start = time.perf_counter()
+        predictions = self._model.predict(self._batch_buf[:size], verbose=0)
+        return np.ravel(predictions), time.perf_counter() - start
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        try:
+            while True:
+                batch = await self._collect_batch()
+                if batch:
+                    await self._process_batch(loop, batch)
+                self._pending = []
+        except asyncio.CancelledError:
+            self._fail_pending()
+            raise
+
+    async def _process_batch(self, loop, batch):
+        for i, (window, _, _) in enumerate(batch):
+            self._batch_buf[i] = window.reshape(self._batch_buf.shape[1:])
+
+        try:
+            scores, seconds = await loop.run_in_executor(self._executor, self._predict, len(batch))
+        except Exception as e:
+            fall_predict_errors.inc(len(batch))
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"模型推論失敗：{e}"))
+            return
+
+        done_at = time.perf_counter()
+        fall_predict_seconds.observe(seconds)
+        fall_batch_size.observe(len(batch))
+        for (_, future, enqueued_at), score in zip(batch, scores):
+            fall_window_latency.observe(done_at - enqueued_at)
+            if not future.done():
+                future.set_result(float(score))
+
+fall_scheduler = FallInferenceScheduler()
+
+registry.gauge(
+    "fall_scheduler_queue_size", "等待推論的視窗數",
+    fn=lambda: fall_scheduler._queue.qsize() if fall_scheduler._queue is not None else 0
+)
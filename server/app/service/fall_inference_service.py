@@ -0,0 +1,91 @@
+import os
+import time
+import asyncio
+from collections import deque
+import numpy as np
+from ..fall_model import FallModel
+from ..utils.pose_extract import iter_video_skeletons
+from ..utils.pose_normalize import FEATURE_DIM, prepare_model_input
+from ..utils.metrics import registry
+
+# 判定為跌倒的分數門檻
+FALL_THRESHOLD = float(os.getenv("FALL_THRESHOLD", 0.6))
+# 每隔幾幀做一次滑動視窗推論
+INFERENCE_STRIDE = int(os.getenv("FALL_INFERENCE_STRIDE", 10))
+# 一次送進 model.predict 的視窗數
+PREDICT_BATCH_SIZE = int(os.getenv("FALL_PREDICT_BATCH_SIZE", 32))
+
+video_inference_seconds = registry.histogram(
+    "fall_video_duration_seconds", "影片跌倒偵測耗時（秒）：total 為整支影片，predict 為模型推論部分",
+    ("stage",), buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+
+def score_video(video_path: str, model, scaler, time_steps: int,
+                stride: int = INFERENCE_STRIDE, batch_size: int = PREDICT_BATCH_SIZE) -> dict:
+    """
+    以串流方式解碼影片並提取骨架，對滑動視窗做 CNN-LSTM 推論。
+    同步函式，會阻塞，請於 executor 中呼叫。
+
+    :return: 包含最高分數、視窗數、幀數與各階段耗時的 dict
+    """
+    window = deque(maxlen=time_steps)
+    # 預先配置整批視窗的輸入 buffer，推論時不再逐視窗配置記憶體
+    batch_buf = np.empty((batch_size, time_steps, FEATURE_DIM), dtype=np.float32)
+    pending = 0
+    scores = []
+    frame_count = 0
+    inference_seconds = 0.0
+
+    def flush():
+        nonlocal inference_seconds, pending
+        if not pending:
+            return
+        start = time.perf_counter()
+        predictions = model.predict(batch_buf[:pending], verbose=0)
+        inference_seconds += time.perf_counter() - start
+        scores.extend(float(p) for p in np.ravel(predictions))
+        pending = 0
+
+    def add_window():
+        nonlocal pending
+        prepare_model_input(window, scaler, time_steps, out=batch_buf[pending])
+        pending += 1
+        if pending >= batch_size:
+            flush()
+
+    started = time.perf_counter()
+    last_scored = 0
+    for skeleton in iter_video_skeletons(video_path):
+        window.append(skeleton)
+        frame_count += 1
+        if frame_count >= time_steps and (frame_count - time_steps) % stride == 0:
+            add_window()
+            last_scored = frame_count
+
+    # 影片不足一個視窗，或最後幾幀尚未被評分時，補做一次推論
+    if frame_count and last_scored != frame_count:
+        add_window()
+    flush()
+    elapsed = time.perf_counter() - started
+
+    max_score = max(scores) if scores else 0.0
+    return {
+        "is_fall": max_score >= FALL_THRESHOLD,
+        "max_score": max_score,
+        "window_count": len(scores),
+        "frame_count": frame_count,
+        "elapsed_seconds": elapsed,
+        "inference_seconds": inference_seconds,
+    }
+
+async def detect_fall_in_video(video_path: str) -> dict:
+    """
+    使用啟動時載入的共用模型，對影片進行跌倒偵測（非同步版本）。
+    """
+    model, scaler = FallModel.get()
+    time_steps = FallModel.time_steps()
+    loop = asyncio.get_event_loop()
+    result = await loop.run_in_executor(None, score_video, video_path, model, scaler, time_steps)
+    video_inference_seconds.observe(result["elapsed_seconds"], "total")
+    video_inference_seconds.observe(result["inference_seconds"], "predict")
+    return result
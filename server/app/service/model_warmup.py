@@ -0,0 +1,144 @@
+import logging
+import os
+import time
+import asyncio
+import numpy as np
+from ..fall_model import FallModel
+from ..utils.pose_normalize import FEATURE_DIM
+from ..utils.pose_worker_pool import pose_pool
+from .fall_inference_scheduler import fall_scheduler
+
+logger = logging.getLogger(__name__)
+
+# warm-up 失敗後的重試次數（0 為不重試），以及第一次重試前的等待秒數（之後每次加倍，最多 MODEL_WARMUP_BACKOFF_MAX）
+MODEL_WARMUP_RETRIES = int(os.getenv("MODEL_WARMUP_RETRIES", 5))
+MODEL_WARMUP_BACKOFF = float(os.getenv("MODEL_WARMUP_BACKOFF", 5))
+MODEL_WARMUP_BACKOFF_MAX = float(os.getenv("MODEL_WARMUP_BACKOFF_MAX", 120))
+
+class ModelWarmup:
+    """
+    在背景載入推論相關元件，lifespan 不必等待模型載入即可開始服務資料庫 / CRUD 路由：
+
+    1. pose worker pool：啟動 worker 並各處理一張空白影像（匯入 mediapipe、載入 Pose 模型）
+    2. 跌倒模型與 Scaler：載入後以一個空白視窗呼叫 predict，完成 graph 建置
+    3. 串流推論排程器
+
+    /ready 依 status() 回報各元件狀態；需要模型的路由在就緒前回應 503。
+    失敗時（例如模型檔暫時無法讀取）以指數退避重試 MODEL_WARMUP_RETRIES 次，已完成的步驟不會重做。
+    """
+    STEPS = ("pose_pool", "fall_model", "fall_scheduler")
+
+    def __init__(self):
+        self._task = None
+        # 目前在 executor 中執行的步驟，停止時需等它結束才能釋放資源
+        self._current = None
+        self._reset()
+
+    def _reset(self):
+        self._done = {step: False for step in self.STEPS}
+        self._durations = {}
+        self._error = None
+        self._attempts = 0
+        self._started_at = None
+        self._finished_at = None
+
+    def is_ready(self) -> bool:
+        return all(self._done.values())
+
+    def status(self) -> dict:
+        return {
+            "ready": self.is_ready(),
+            "components": dict(self._done),
+            "durations": {step: round(seconds, 3) for step, seconds in self._durations.items()},
+            "error": self._error,
+            "attempts": self._attempts,
+            "elapsed": None if self._started_at is None
+            else round((self._finished_at or time.perf_counter()) - self._started_at, 3),
+        }
+
+    def start(self):
+        """啟動背景 warm-up（不等待完成）"""
+        if self._task is not None:
+            return
+        self._reset()
+        self._started_at = time.perf_counter()
+        self._task = asyncio.create_task(self._run())
+
+    async def wait_ready(self) -> bool:
+        """等待 warm-up 結束，回傳是否所有元件皆已就緒"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+        return self.is_ready()
+
+    async def stop(self):
+        """中止尚未完成的 warm-up，並等待 executor 中正在執行的步驟結束"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        if self._current is not None and not self._current.done():
+            await asyncio.wait([self._current])
+        self._task = None
+        self._current = None
+
+    async def _step(self, name: str, func):
+        loop = asyncio.get_event_loop()
+        start = time.perf_counter()
+        self._current = loop.run_in_executor(None, func)
+        # 取消 warm-up 時不連帶取消 executor future，stop() 才能等到步驟真正結束
+        await asyncio.shield(self._current)
+        self._current = None
+        self._durations[name] = time.perf_counter() - start
+
+    async def _run(self):
+        try:
+            for attempt in range(MODEL_WARMUP_RETRIES + 1):
+                self._attempts = attempt + 1
+                try:
+                    await self._warm_up()
+                    self._error = None
+                    logger.info("Models warmed up", extra={"durations": self.status()["durations"]})
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._error = str(e)
+                    # 失敗時保留錯誤供 /ready 回報，資料庫 / CRUD 路由照常服務
+                    logger.exception("模型 warm-up 失敗（第 %d 次）", attempt + 1)
+                if attempt < MODEL_WARMUP_RETRIES:
+                    await asyncio.sleep(min(MODEL_WARMUP_BACKOFF * 2 ** attempt, MODEL_WARMUP_BACKOFF_MAX))
+        finally:
+            self._finished_at = time.perf_counter()
+
+    async def _warm_up(self):
+        """依序完成尚未就緒的步驟"""
+        if not self._done["pose_pool"]:
+            # 骨架提取 worker 先於模型啟動；若以 fork 啟動，子程序不會複製模型佔用的記憶體
+            await self._step("pose_pool", self._start_pose_pool)
+            self._done["pose_pool"] = True
+        if not self._done["fall_model"]:
+            # 模型與 Scaler 只載入一次，所有請求共用
+            await self._step("fall_model", self._load_fall_model)
+            self._done["fall_model"] = True
+        if not self._done["fall_scheduler"]:
+            await fall_scheduler.start(FallModel.get()[0], FallModel.time_steps())
+            self._done["fall_scheduler"] = True
+
+    @staticmethod
+    def _start_pose_pool():
+        pose_pool.start()
+        try:
+            pose_pool.warm_up()
+        except Exception:
+            # 關閉後重試時會重新啟動 worker，避免沿用已結束的 process
+            pose_pool.shutdown()
+            raise
+
+    @staticmethod
+    def _load_fall_model():
+        FallModel.init_model()
+        model, _ = FallModel.get()
+        # 第一次 predict 會建置 graph / 配置 tensor，先在背景完成，避免第一個請求承擔延遲
+        model.predict(np.zeros((1, FallModel.time_steps(), FEATURE_DIM), dtype=np.float32), verbose=0)
+
+model_warmup = ModelWarmup()
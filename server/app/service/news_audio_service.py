@@ -0,0 +1,188 @@
+import logging
+import os
+import time
+import asyncio
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+from ..utils.file_utils import atomic_output_path, atomic_write_bytes, silent_mp3
+
+logger = logging.getLogger(__name__)
+
+NEWS_AUDIO_DIR = Path(__file__).resolve().parent.parent.parent / "static/news_audio"
+# 語音與摘要的產生來源：openai 呼叫遠端 API，stub 產生固定內容（離線測試用）
+NEWS_AUDIO_BACKEND = os.getenv("NEWS_AUDIO_BACKEND", "openai")
+# 每天幾點（本地時間）預先產生當日新聞語音
+NEWS_AUDIO_DAILY_HOUR = int(os.getenv("NEWS_AUDIO_DAILY_HOUR", 6))
+# 產生失敗後多久重試（秒）；期間播放請求不會再觸發產生
+NEWS_AUDIO_RETRY_SECONDS = float(os.getenv("NEWS_AUDIO_RETRY_SECONDS", 600))
+
+class OpenAINewsAudioBackend:
+    """以 OpenAI 產生新聞摘要與語音"""
+    name = "openai"
+
+    def summarize(self, day: date) -> str:
+        from ..util.news_summary_generator import generate_daily_summary
+        return generate_daily_summary()
+
+    def synthesize(self, text: str, output_path: str):
+        from ..utils.openai_client import get_openai_client
+        with get_openai_client().audio.speech.with_streaming_response.create(
+            model="gpt-4o-mini-tts",
+            voice="nova",
+            input=text,
+            instructions="請用溫暖親切的語氣唸出今日新聞摘要。",
+            speed=0.8
+        ) as response:
+            response.stream_to_file(output_path)
+
+class StubNewsAudioBackend:
+    """不連外的替代實作，產生固定摘要與一秒靜音 MP3"""
+    name = "stub"
+
+    def summarize(self, day: date) -> str:
+        return f"這是 {day.isoformat()} 的測試新聞摘要。"
+
+    def synthesize(self, text: str, output_path: str):
+        with open(output_path, "wb") as f:
+            f.write(silent_mp3())
+
+NEWS_AUDIO_BACKENDS = {
+    OpenAINewsAudioBackend.name: OpenAINewsAudioBackend,
+    StubNewsAudioBackend.name: StubNewsAudioBackend,
+}
+
+def create_news_audio_backend(name: str = NEWS_AUDIO_BACKEND):
+    backend_class = NEWS_AUDIO_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"不支援的新聞語音來源：{name}")
+    return backend_class()
+
+class NewsAudioService:
+    """
+    每日新聞語音摘要：
+    背景工作每天預先產生 news_YYYYMMDD.mp3，同一天同時只會有一個產生工作（single-flight），
+    其他請求共用同一個結果。阻塞的 API 呼叫與檔案寫入都在 executor 中執行。
+    """
+    def __init__(self, backend=None, output_dir: Path = NEWS_AUDIO_DIR):
+        self.backend = backend or create_news_audio_backend()
+        self.output_dir = Path(output_dir)
+        self._inflight: Dict[date, asyncio.Task] = {}
+        # 各日期最近一次產生失敗的時間（time.monotonic），冷卻期間不在背景重新產生
+        self._failed_at: Dict[date, float] = {}
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def audio_path(self, day: date = None) -> Path:
+        day = day or date.today()
+        return self.output_dir / f"news_{day.strftime('%Y%m%d')}.mp3"
+
+    def summary_path(self, day: date = None) -> Path:
+        day = day or date.today()
+        return self.output_dir / f"news_{day.strftime('%Y%m%d')}.txt"
+
+    def read_summary(self, day: date = None) -> Optional[str]:
+        try:
+            return self.summary_path(day).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _generate_sync(self, day: date) -> str:
+        summary = self.backend.summarize(day)
+        # 先寫摘要再寫語音：看得到 mp3 時摘要一定已存在
+        atomic_write_bytes(str(self.summary_path(day)), summary.encode("utf-8"))
+        with atomic_output_path(str(self.audio_path(day))) as part_path:
+            self.backend.synthesize(summary, part_path)
+        return summary
+
+    async def _generate(self, day: date) -> str:
+        loop = asyncio.get_event_loop()
+        summary = await loop.run_in_executor(None, self._generate_sync, day)
+        logger.info("News audio generated: %s (%s)", self.audio_path(day).name, self.backend.name)
+        return summary
+
+    def _on_generated(self, day: date, task: asyncio.Task):
+        if self._inflight.get(day) is task:
+            del self._inflight[day]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self._failed_at[day] = time.monotonic()
+            logger.error("News audio generation failed (%s): %s", day.isoformat(), task.exception())
+        else:
+            self._failed_at.pop(day, None)
+
+    def in_cooldown(self, day: date = None) -> bool:
+        """指定日期最近產生失敗且尚未超過 NEWS_AUDIO_RETRY_SECONDS"""
+        failed_at = self._failed_at.get(day or date.today())
+        return failed_at is not None and time.monotonic() - failed_at < NEWS_AUDIO_RETRY_SECONDS
+
+    def _start_generation(self, day: date) -> asyncio.Task:
+        task = self._inflight.get(day)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(day))
+            self._inflight[day] = task
+            task.add_done_callback(lambda t: self._on_generated(day, t))
+        return task
+
+    def generate_in_background(self, day: date = None):
+        """
+        若當日語音尚未產生也沒有在產生中，於背景開始產生。
+        最近產生失敗時，冷卻期間內不重新產生，避免每個播放請求都呼叫一次 OpenAI。
+        """
+        day = day or date.today()
+        if not self.audio_path(day).exists() and not self.in_cooldown(day):
+            self._start_generation(day)
+
+    async def ensure(self, day: date = None, force: bool = False) -> str:
+        """
+        確保指定日期（預設今天）的新聞語音存在，回傳摘要文字。
+        force=True 時重新產生；若已有產生中的工作則直接等待其結果。
+        """
+        day = day or date.today()
+        if not force and self.audio_path(day).exists():
+            return self.read_summary(day) or ""
+        # shield：單一請求中斷不會取消其他請求共用的產生工作
+        return await asyncio.shield(self._start_generation(day))
+
+    def _seconds_until_next_run(self) -> float:
+        now = datetime.now()
+        next_run = now.replace(hour=NEWS_AUDIO_DAILY_HOUR, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    async def _run_daily(self):
+        while True:
+            try:
+                await self.ensure()
+            except Exception:
+                # 錯誤已在 _on_generated 記錄
+                await asyncio.sleep(NEWS_AUDIO_RETRY_SECONDS)
+                continue
+            await asyncio.sleep(self._seconds_until_next_run())
+
+    async def start(self):
+        """啟動每日預先產生的背景工作"""
+        if self.running:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._task = asyncio.create_task(self._run_daily())
+        logger.info("News audio job started (backend=%s, daily at %02d:00)", self.backend.name, NEWS_AUDIO_DAILY_HOUR)
+
+    async def stop(self):
+        """停止背景工作"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("News audio job stopped")
+
+news_audio_service = NewsAudioService()
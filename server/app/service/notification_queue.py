@@ -0,0 +1,330 @@
+import logging
+import os
+import time
+import sqlite3
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from ..utils.line_client import line_client, text_message
+
+logger = logging.getLogger(__name__)
+
+# 通知佇列的 SQLite 檔案位置（本機持久化，重啟後未送出的通知會繼續送）
+NOTIFY_QUEUE_PATH = os.getenv(
+    "NOTIFY_QUEUE_PATH",
+    str(Path(__file__).resolve().parent.parent.parent / "data/notification_queue.sqlite3")
+)
+# 送出通知的 worker coroutine 數量
+NOTIFY_QUEUE_WORKERS = int(os.getenv("NOTIFY_QUEUE_WORKERS", 2))
+# 每次最多取出幾筆工作（同一則訊息會合併成 multicast）
+NOTIFY_CLAIM_SIZE = int(os.getenv("NOTIFY_CLAIM_SIZE", 500))
+# 單一收件者最多嘗試幾次，超過後標記為 dead
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", 8))
+# 重試等待秒數：NOTIFY_RETRY_BASE * 2^(attempts-1)，最多 NOTIFY_RETRY_MAX
+NOTIFY_RETRY_BASE = float(os.getenv("NOTIFY_RETRY_BASE", 5))
+NOTIFY_RETRY_MAX = float(os.getenv("NOTIFY_RETRY_MAX", 600))
+# 沒有工作時多久檢查一次到期的重試
+NOTIFY_POLL_INTERVAL = float(os.getenv("NOTIFY_POLL_INTERVAL", 1))
+# worker 迴圈發生非預期錯誤後的等待秒數上限（由 NOTIFY_POLL_INTERVAL 起指數增加）
+NOTIFY_ERROR_BACKOFF_MAX = float(os.getenv("NOTIFY_ERROR_BACKOFF_MAX", 60))
+
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+STATUS_CANCELLED = "cancelled"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notification_jobs (
+    job_id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_key         TEXT    NOT NULL,
+    record_id       INTEGER,
+    recipient       TEXT    NOT NULL,
+    message         TEXT    NOT NULL,
+    status          TEXT    NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL    NOT NULL,
+    last_error      TEXT,
+    created_at      REAL    NOT NULL,
+    updated_at      REAL    NOT NULL,
+    UNIQUE (job_key, recipient)
+);
+CREATE INDEX IF NOT EXISTS idx_notification_jobs_due ON notification_jobs (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_notification_jobs_record ON notification_jobs (record_id);
+"""
+
+def fall_job_key(record_id: int) -> str:
+    """跌倒事件通知的冪等鍵：同一筆 record_id 對同一位收件者只會送一次"""
+    return f"fall:{record_id}"
+
+class NotificationStore:
+    """
+    通知工作的 SQLite 儲存（同步，請透過 NotificationQueue 的單一執行緒 executor 呼叫）。
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+
+    def open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # 上次關閉時送到一半的工作重新排入佇列
+        self._conn.execute(
+            "UPDATE notification_jobs SET status = ? WHERE status = ?",
+            (STATUS_PENDING, STATUS_SENDING)
+        )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def enqueue(self, job_key: str, record_id: Optional[int], recipients: Iterable[str], message: str,
+                delay: float = 0) -> int:
+        """
+        新增工作，已存在相同 (job_key, recipient) 的工作會略過；回傳新增筆數。
+        delay 秒後才會被取出送出。
+        """
+        now = time.time()
+        rows = [
+            (job_key, record_id, recipient, message, STATUS_PENDING, now + delay, now, now)
+            for recipient in dict.fromkeys(r for r in recipients if r)
+        ]
+        with self._conn:
+            cursor = self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO notification_jobs
+                    (job_key, record_id, recipient, message, status, next_attempt_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            )
+        return cursor.rowcount
+
+    def claim(self, limit: int) -> List[sqlite3.Row]:
+        """取出到期的工作並標記為 sending"""
+        now = time.time()
+        with self._conn:
+            rows = self._conn.execute(
+                """
+                SELECT job_id, job_key, recipient, message, attempts FROM notification_jobs
+                WHERE status = ? AND next_attempt_at <= ?
+                ORDER BY next_attempt_at, job_id
+                LIMIT ?
+                """,
+                (STATUS_PENDING, now, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE notification_jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                [(STATUS_SENDING, now, row["job_id"]) for row in rows]
+            )
+        return rows
+
+    def mark_sent(self, job_ids: List[int]):
+        now = time.time()
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE notification_jobs SET status = ?, last_error = NULL, updated_at = ? WHERE job_id = ?",
+                [(STATUS_SENT, now, job_id) for job_id in job_ids]
+            )
+
+    def mark_failed(self, jobs: List[sqlite3.Row], error: str):
+        """送出失敗：未達嘗試上限者以指數退避重新排程，否則標記為 dead"""
+        now = time.time()
+        updates = []
+        for job in jobs:
+            attempts = job["attempts"] + 1
+            if attempts >= NOTIFY_MAX_ATTEMPTS:
+                updates.append((STATUS_DEAD, now, error, now, job["job_id"]))
+            else:
+                delay = min(NOTIFY_RETRY_BASE * (2 ** (attempts - 1)), NOTIFY_RETRY_MAX)
+                updates.append((STATUS_PENDING, now + delay, error, now, job["job_id"]))
+        with self._conn:
+            self._conn.executemany(
+                """
+                UPDATE notification_jobs
+                SET status = ?, next_attempt_at = ?, last_error = ?, updated_at = ?
+                WHERE job_id = ? AND status = ?
+                """,
+                [update + (STATUS_SENDING,) for update in updates]
+            )
+
+    def cancel(self, job_key: str) -> int:
+        """取消尚未送出的工作，回傳取消筆數"""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE notification_jobs SET status = ?, updated_at = ? WHERE job_key = ? AND status = ?",
+                (STATUS_CANCELLED, time.time(), job_key, STATUS_PENDING)
+            )
+        return cursor.rowcount
+
+    def select_by_job_key(self, job_key: str) -> List[dict]:
+        rows = self._conn.execute(
+            """
+            SELECT recipient, status, attempts, next_attempt_at, last_error, updated_at FROM notification_jobs
+            WHERE job_key = ? ORDER BY next_attempt_at, job_id
+            """,
+            (job_key,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_by_status(self) -> Dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) FROM notification_jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+class NotificationQueue:
+    """
+    持久化的 LINE 通知佇列：
+    呼叫端只負責寫入 SQLite 後立即返回，背景 worker 取出到期的工作並以 multicast 送出，
+    失敗的收件者依指數退避重試，行程中斷後重啟會繼續送出未完成的工作。
+    """
+    def __init__(self, path: str = NOTIFY_QUEUE_PATH, workers: int = NOTIFY_QUEUE_WORKERS, sender=None):
+        self.store = NotificationStore(path)
+        self.workers = workers
+        # sender(recipients, messages) -> (sent, failed)，預設為共用的 LINE client
+        self._sender = sender or line_client.fan_out
+        self._tasks = []
+        self._wakeup = None
+        self._stopping = False
+        # 因非預期錯誤結束而被重新啟動的 worker 次數
+        self.worker_restarts = 0
+        # SQLite 存取固定在單一執行緒，避免阻塞 event loop 也不必處理跨執行緒鎖
+        self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def alive_workers(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+    async def _call(self, func, *args):
+        return await asyncio.get_event_loop().run_in_executor(self._executor, func, *args)
+
+    def _spawn_worker(self) -> asyncio.Task:
+        task = asyncio.create_task(self._run())
+        task.add_done_callback(self._on_worker_done)
+        return task
+
+    def _on_worker_done(self, task: asyncio.Task):
+        if self._stopping or task.cancelled():
+            return
+        # _run 本身會攔截錯誤，走到這裡代表 worker 意外結束，立即補上一個新的
+        logger.error("Notification worker exited unexpectedly, restarting", exc_info=task.exception())
+        self._replace_dead_workers()
+
+    def _replace_dead_workers(self) -> int:
+        """以新的 worker 取代已結束的 worker，回傳重新啟動的數量"""
+        if self._stopping or not self._tasks:
+            return 0
+        restarted = 0
+        for index, task in enumerate(self._tasks):
+            if task.done():
+                self._tasks[index] = self._spawn_worker()
+                restarted += 1
+        self.worker_restarts += restarted
+        return restarted
+
+    async def start(self):
+        """開啟佇列並啟動 worker；已啟動時會重新啟動已結束的 worker"""
+        if self.running:
+            self._replace_dead_workers()
+            return
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notify-queue")
+        self._wakeup = asyncio.Event()
+        await self._call(self.store.open)
+        self._tasks = [self._spawn_worker() for _ in range(self.workers)]
+        logger.info("Notification queue started (%d workers, %s)", self.workers, self.store.path)
+
+    async def stop(self):
+        """停止 worker；送到一半的工作下次啟動時會重新送出"""
+        if not self._tasks:
+            return
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._call(self.store.close)
+        self._executor.shutdown(wait=True)
+        logger.info("Notification queue stopped")
+
+    async def enqueue(self, job_key: str, recipients: Iterable[str], message: str, record_id: int = None,
+                      delay: float = 0) -> int:
+        """寫入通知工作並喚醒 worker，回傳新增筆數；delay 秒後才送出"""
+        if self._executor is None:
+            raise RuntimeError("❌ Notification queue not started")
+        inserted = await self._call(self.store.enqueue, job_key, record_id, list(recipients), message, delay)
+        if inserted and delay <= 0:
+            self._wakeup.set()
+        return inserted
+
+    async def cancel(self, job_key: str) -> int:
+        """取消尚未送出的工作，回傳取消筆數"""
+        if self._executor is None:
+            raise RuntimeError("❌ Notification queue not started")
+        return await self._call(self.store.cancel, job_key)
+
+    async def status(self, job_key: str) -> List[dict]:
+        """查詢某個工作每位收件者的送出狀態"""
+        return await self._call(self.store.select_by_job_key, job_key)
+
+    async def stats(self) -> Dict[str, int]:
+        return await self._call(self.store.count_by_status)
+
+    async def _deliver(self, jobs: List[sqlite3.Row]):
+        # 同一則訊息的收件者合併送出
+        jobs = sorted(jobs, key=lambda job: (job["job_key"], job["message"]))
+        for (_, message), group in groupby(jobs, key=lambda job: (job["job_key"], job["message"])):
+            group = list(group)
+            try:
+                sent, failed = await self._sender([job["recipient"] for job in group], [text_message(message)])
+                error = "LINE API 回應失敗"
+            except Exception as e:
+                sent, failed, error = [], [job["recipient"] for job in group], str(e)
+            sent = set(sent)
+            await self._call(self.store.mark_sent, [job["job_id"] for job in group if job["recipient"] in sent])
+            failed_jobs = [job for job in group if job["recipient"] not in sent]
+            if failed_jobs:
+                await self._call(self.store.mark_failed, failed_jobs, error)
+                logger.warning("通知送出失敗 %d 筆，稍後重試：%s", len(failed_jobs), error)
+
+    async def _run(self):
+        errors = 0
+        while True:
+            jobs = []
+            try:
+                jobs = await self._call(self.store.claim, NOTIFY_CLAIM_SIZE)
+                if jobs:
+                    await self._deliver(jobs)
+                    errors = 0
+                    continue
+                errors = 0
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), NOTIFY_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # SQLite 或 sender 的非預期錯誤不讓 worker 結束，記錄後退避再繼續
+                errors += 1
+                delay = min(NOTIFY_POLL_INTERVAL * (2 ** (errors - 1)), NOTIFY_ERROR_BACKOFF_MAX)
+                logger.exception("Notification worker error, retrying in %.1fs", delay)
+                if jobs:
+                    # 已取出但尚未標記結果的工作排回佇列（已送出的不受影響）
+                    try:
+                        await self._call(self.store.mark_failed, jobs, str(e))
+                    except Exception:
+                        logger.exception("Failed to reschedule claimed notification jobs")
+                await asyncio.sleep(delay)
+
+notification_queue = NotificationQueue()
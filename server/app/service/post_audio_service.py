@@ -0,0 +1,149 @@
+import os
+import json
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict
+from ..dao.family_posts_dao import select_latest_post_content
+from ..db import Database
+from ..utils.audio_file_cache import AudioFileCache
+from ..utils.file_utils import silent_mp3
+
+REELS_AUDIO_DIR = Path(__file__).resolve().parent.parent.parent / "static/reels_audio"
+# 快取使用專屬子資料夾，不會接管或淘汰 reels_audio 中其他既有檔案
+REELS_AUDIO_CACHE_DIR = REELS_AUDIO_DIR / "tts_cache"
+REELS_AUDIO_CACHE_URL = "/static/reels_audio/tts_cache"
+# 語音來源：openai 呼叫遠端 API，stub 產生靜音 MP3（離線測試用）
+REELS_AUDIO_BACKEND = os.getenv("REELS_AUDIO_BACKEND", "openai")
+# 語音快取大小上限（MB）與檔案數上限
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", 200)) * 1024 * 1024
+TTS_CACHE_MAX_FILES = int(os.getenv("TTS_CACHE_MAX_FILES", 1000))
+
+POST_ACCOUNT_NAME = "Eric"
+NO_POST_TEXT = "最近沒有動態"
+
+class OpenAIPostSpeechBackend:
+    """以 GPT 改寫貼文並以 OpenAI TTS 轉成語音"""
+    name = "openai"
+    chat_model = "gpt-4"
+    tts_model = "tts-1"
+    voice = "nova"
+
+    def rewrite(self, content: str) -> str:
+        from ..utils.openai_client import get_openai_client
+        gpt_response = get_openai_client().chat.completions.create(
+            model=self.chat_model,
+            messages=[
+                {"role": "system", "content": "請將這段社群貼文用繁體中文讀出來。"},
+                {"role": "user", "content": content}
+            ]
+        )
+        return gpt_response.choices[0].message.content
+
+    def synthesize(self, text: str) -> bytes:
+        from ..utils.openai_client import get_openai_client
+        tts_response = get_openai_client().audio.speech.create(
+            model=self.tts_model,
+            voice=self.voice,
+            input=text,
+        )
+        return tts_response.read()
+
+class StubPostSpeechBackend:
+    """不連外的替代實作，原文照念並產生一秒靜音 MP3"""
+    name = "stub"
+    chat_model = "stub"
+    tts_model = "stub"
+    voice = "stub"
+
+    def rewrite(self, content: str) -> str:
+        return content
+
+    def synthesize(self, text: str) -> bytes:
+        return silent_mp3()
+
+POST_SPEECH_BACKENDS = {
+    OpenAIPostSpeechBackend.name: OpenAIPostSpeechBackend,
+    StubPostSpeechBackend.name: StubPostSpeechBackend,
+}
+
+def create_post_speech_backend(name: str = REELS_AUDIO_BACKEND):
+    backend_class = POST_SPEECH_BACKENDS.get(name)
+    if backend_class is None:
+        raise ValueError(f"不支援的貼文語音來源：{name}")
+    return backend_class()
+
+class PostAudioService:
+    """
+    社群貼文語音：以（貼文內容、模型、聲音）的雜湊為 key 快取在磁碟上。
+    內容沒變就直接回傳既有檔案；新內容同時只會產生一次，其他請求共用結果。
+    快取資料夾在 lifespan 的 start() 或第一次使用時才建立與掃描，匯入模組不會碰到檔案系統。
+    """
+    def __init__(self, backend=None, cache: AudioFileCache = None):
+        self.backend = backend or create_post_speech_backend()
+        self._cache = cache
+        self._cache_lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # 實際呼叫 GPT / TTS 產生語音的次數
+        self.generations = 0
+
+    @property
+    def cache(self) -> AudioFileCache:
+        if self._cache is None:
+            # 產生語音的 executor 執行緒也可能是第一個使用者
+            with self._cache_lock:
+                if self._cache is None:
+                    self._cache = AudioFileCache(REELS_AUDIO_CACHE_DIR, TTS_CACHE_MAX_BYTES, TTS_CACHE_MAX_FILES)
+        return self._cache
+
+    async def start(self):
+        """於 lifespan 啟動時建立並掃描快取資料夾（在 executor 中執行，不阻塞 event loop）"""
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, lambda: self.cache)
+
+    def cache_key(self, content: str) -> str:
+        payload = json.dumps(
+            [content, self.backend.chat_model, self.backend.tts_model, self.backend.voice],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _generate_sync(self, key: str, content: str) -> str:
+        self.generations += 1
+        spoken_text = self.backend.rewrite(content) if content != NO_POST_TEXT else content
+        return self.cache.put(key, self.backend.synthesize(spoken_text))
+
+    def _on_generated(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 取出例外，避免沒有等待者時出現未處理例外的警告
+            task.exception()
+
+    async def get_audio_for_content(self, content: str) -> str:
+        """取得貼文內容對應的語音檔路徑，未命中時產生並寫入快取"""
+        key = self.cache_key(content)
+        path = self.cache.get(key)
+        if path is not None:
+            return path
+        task = self._inflight.get(key)
+        if task is None:
+            loop = asyncio.get_event_loop()
+            task = asyncio.ensure_future(loop.run_in_executor(None, self._generate_sync, key, content))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_generated(key, t))
+        # shield：單一請求中斷不會取消其他請求共用的產生工作
+        return await asyncio.shield(task)
+
+    async def get_latest_post_audio(self, account_name: str = POST_ACCOUNT_NAME) -> str:
+        """取得指定帳號最新貼文的語音檔路徑"""
+        async with Database.connection() as conn:
+            content = await select_latest_post_content(conn, account_name)
+        return await self.get_audio_for_content(content or NO_POST_TEXT)
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "generations": self.generations,
+                "inflight": len(self._inflight), "backend": self.backend.name}
+
+post_audio_service = PostAudioService()
@@ -1,18 +1,71 @@
-from ..dao.role_dao import select_role_name_by_id
-from ..db import get_connection
+import logging
+import os
+import time
+import asyncio
+from typing import Dict, Optional
+from ..dao.role_dao import select_all_roles
+from ..db import Database
 from ..exceptions import NotFoundError, DatabaseError
 
-async def get_role_name(role_id: int) -> str:
+logger = logging.getLogger(__name__)
+
+# 角色快取的有效時間（秒）
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", 3600))
+
+class RoleCache:
     """
-    根據角色 ID 查詢角色名稱。
+    role 表的行程內快取，於 lifespan 啟動時預先載入。
+    角色資料只會由資料庫維護時直接修改（server 沒有寫入 role 表的路徑），超過 TTL 才會重新載入。
     """
-    async with get_connection() as conn:
+    _names: Dict[int, str] = {}
+    _loaded_at: Optional[float] = None
+    _lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        return cls._lock
+
+    @classmethod
+    def is_stale(cls) -> bool:
+        return cls._loaded_at is None or time.monotonic() - cls._loaded_at > ROLE_CACHE_TTL
+
+    @classmethod
+    async def refresh(cls) -> Dict[int, str]:
+        """重新從資料庫載入所有角色"""
+        async with Database.connection() as conn:
+            cls._names = await select_all_roles(conn)
+        cls._loaded_at = time.monotonic()
+        return dict(cls._names)
+
+    @classmethod
+    async def load(cls):
+        """啟動時預先載入；失敗時不中斷啟動，第一次查詢時再載入"""
         try:
-            role_name = await select_role_name_by_id(conn, role_id)
-            if role_name is None:
-                raise NotFoundError(f"找不到角色 ID {role_id} 的名稱")
-            return role_name
-        except NotFoundError:
-            raise
+            await cls.refresh()
+            logger.info("Role cache loaded (%d roles)", len(cls._names))
         except Exception as e:
-            raise DatabaseError(f"查詢角色名稱時發生錯誤: {e}")
\ No newline at end of file
+            logger.warning("Role cache preload failed: %s", e)
+
+    @classmethod
+    async def get_name(cls, role_id: int) -> Optional[str]:
+        """取得角色名稱，找不到回傳 None"""
+        if cls.is_stale():
+            # 多個請求同時遇到過期時只重新載入一次
+            async with cls._get_lock():
+                if cls.is_stale():
+                    await cls.refresh()
+        return cls._names.get(role_id)
+
+async def get_role_name(role_id: int) -> str:
+    """
+    根據角色 ID 查詢角色名稱。
+    """
+    try:
+        role_name = await RoleCache.get_name(role_id)
+    except Exception as e:
+        raise DatabaseError(f"查詢角色名稱時發生錯誤: {e}")
+    if role_name is None:
+        raise NotFoundError(f"找不到角色 ID {role_id} 的名稱")
+    return role_name
@@ -5,6 +5,7 @@ from ..dao.users_dao import (
     delete_user
 )
 from ..db import Database
+from .emergency_contacts_service import invalidate_alert_contacts, select_alert_contact_owners
 from ..exceptions import NotFoundError, DatabaseError, AlreadyExistsError
 
 async def add_user(
@@ -42,7 +43,11 @@ async def update_user_info(phone: str, **data) -> bool:
             raise NotFoundError("找不到該電話對應的使用者")
         user_id = user["user_id"]
         try:
-            return await update_user(conn, user_id, **data)
+            # 長者的聯絡人索引存的是 line_id，變更後須清除相關長者的快取
+            affected = await select_alert_contact_owners(conn, user_id) if "line_id" in data else []
+            updated = await update_user(conn, user_id, **data)
+            invalidate_alert_contacts(*affected)
+            return updated
         except NotFoundError:
             raise
         except Exception as e:
@@ -84,8 +89,13 @@ async def get_user_info(phone: str) -> dict:
 
 async def delete_user_account(phone: str) -> bool:
     async with Database.connection() as conn:
+        user = await select_user_by_phone(conn, phone)
         try:
-            return await delete_user(conn, phone)
+            # 照護關係可能隨帳號一併刪除，先查出受影響的長者再刪除
+            affected = await select_alert_contact_owners(conn, user["user_id"])
+            deleted = await delete_user(conn, phone)
+            invalidate_alert_contacts(*affected)
+            return deleted
         except NotFoundError:
             raise
         except Exception as e:
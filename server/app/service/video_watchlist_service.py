@@ -2,9 +2,8 @@ from ..dao.video_watchlist_dao import (
     insert_video_watchlist,
     delete_watchlist_by_id,
     select_watchlist_entry_by_user_and_record,
-    select_watchlist_record_ids_by_user
+    select_watchlist_fall_events
 )
-from ..dao.fall_events_dao import select_fall_event_by_id
 from ..db import Database
 from ..exceptions import DatabaseError, NotFoundError, AlreadyExistsError
 
@@ -55,6 +54,27 @@ async def remove_video_from_watchlist(user_id: int, record_id: int, video_type:
         except Exception as e:
             raise DatabaseError(f"刪除觀看清單時發生錯誤: {e}")
     
+async def get_watchlist_video_data(
+    user_id: int,
+    video_type: str,
+    before_added_at=None,
+    before_record_id: int = None,
+    limit: int = None
+) -> list:
+    """
+    取得觀看清單中的跌倒影片資料（一頁），依加入時間由新到舊排序。
+    查詢完成即歸還資料庫連線，不會在回應傳送期間持有連線。
+    """
+    async with Database.connection() as conn:
+        try:
+            return await select_watchlist_fall_events(
+                conn, user_id, video_type, before_added_at, before_record_id, limit
+            )
+        except DatabaseError:
+            raise
+        except Exception as e:
+            raise DatabaseError(f"查詢觀看清單影片資料時發生錯誤: {e}")
+
 async def get_watchlist_video_data_by_id(user_id: int, video_type: str) -> list:
     """
     根據 user_id 取得觀看清單中的跌倒影片資料。
@@ -62,20 +82,4 @@ async def get_watchlist_video_data_by_id(user_id: int, video_type: str) -> list:
     :param user_id: 使用者 ID
     :return: 包含影片資料的清單，若無資料則回傳空清單
     """
-    async with Database.connection() as conn:
-        try:
-            record_ids = await select_watchlist_record_ids_by_user(conn, user_id, video_type)
-            if not record_ids:
-                return []
-            
-            video_data = []
-            for record_id in record_ids:
-                try:
-                    fall_event = await select_fall_event_by_id(conn, record_id)
-                    if fall_event:
-                        video_data.append(fall_event)
-                except NotFoundError:
-                    continue
-            return video_data
-        except Exception as e:
-            raise DatabaseError(f"查詢觀看清單影片資料時發生錯誤: {e}")
\ No newline at end of file
+    return await get_watchlist_video_data(user_id, video_type)
@@ -1,11 +1,9 @@
-from openai import OpenAI
-from dotenv import load_dotenv
-load_dotenv()
-import os
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from ..utils.openai_client import get_openai_client
 
 def generate_daily_summary():
+    """
+    生成每日新聞摘要（同步版本，會阻塞，請於 executor 中呼叫）。
+    """
     prompt = (
         "爺爺奶奶，早安。以下是今日三則適合台灣長者收聽的重要新聞。\n"
         "請用繁體中文清楚易懂地描述，避免艱深詞彙，主題可包含天氣、健康、食安、生活資訊等。\n"
@@ -14,7 +12,7 @@ def generate_daily_summary():
         "也不需要過度強調長者身份，可以自然稱呼為『您』。"
     )
 
-    response = client.chat.completions.create(
+    response = get_openai_client().chat.completions.create(
         model="gpt-4o",
         messages=[
             {"role": "system", "content": "你是一位台灣新聞播報員，善於口語化講解新聞內容給長輩聽。"},
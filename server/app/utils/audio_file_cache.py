@@ -0,0 +1,94 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from .file_utils import atomic_write_bytes
+
+class AudioFileCache:
+    """
+    以內容雜湊為 key 的磁碟音訊快取。
+    directory 應為快取專用的資料夾：啟動時會接管其中所有 {suffix} 檔案並可能淘汰。
+    檔案名稱為 {key}{suffix}；超過 max_bytes 或 max_files 時淘汰最久未使用的檔案。
+    啟動時依檔案修改時間重建 LRU 順序，命中時會更新修改時間，重啟後順序仍然有效。
+    """
+    def __init__(self, directory: str, max_bytes: int, max_files: int = 1000, suffix: str = ".mp3"):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.suffix) and not entry.name.startswith("."):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(self.suffix)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[str]:
+        """命中時回傳檔案路徑，否則回傳 None"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # 檔案被外部刪除，視為未命中
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.hits -= 1
+                self.misses += 1
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        """以原子性方式寫入快取檔案並回傳路徑（同步，會阻塞）"""
+        path = self.path_for(key)
+        atomic_write_bytes(path, data)
+        with self._lock:
+            self._total_bytes += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep: str = None):
+        while self._entries and (self._total_bytes > self.max_bytes or len(self._entries) > self.max_files):
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
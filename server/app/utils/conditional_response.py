@@ -0,0 +1,38 @@
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Request
+from fastapi.responses import Response, FileResponse
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in header.split(",")]
+    # 弱比對：忽略 W/ 前綴
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        return int(mtime) <= parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+def cached_file_response(request: Request, path: str, media_type: str, filename: str = None) -> Response:
+    """
+    帶 ETag / Last-Modified 的檔案回應，條件式 GET 命中時回傳 304。
+    Range (206 / 416 / multipart) 與 If-Range 由 Starlette 的 FileResponse 處理，
+    If-Range 會比對這裡設定的 ETag 與 Last-Modified。
+    """
+    stat = os.stat(path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since and _not_modified_since(if_modified_since, stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(path=path, media_type=media_type, filename=filename, headers=headers, stat_result=stat)
@@ -0,0 +1,36 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+@contextmanager
+def atomic_output_path(path: str):
+    """
+    取得與 path 同資料夾的暫存檔路徑，區塊正常結束後以 os.replace 原子性地改名為 path；
+    發生例外時刪除暫存檔。讀取 path 的一方永遠不會看到寫到一半的檔案。
+    """
+    dest_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, part_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".part", dir=dest_dir)
+    os.close(fd)
+    try:
+        yield part_path
+        # mkstemp 建立的檔案權限為 0600，改為一般檔案權限
+        os.chmod(part_path, 0o644)
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+
+def atomic_write_bytes(path: str, data: bytes):
+    """以原子性方式寫入整個檔案內容"""
+    with atomic_output_path(path) as part_path:
+        with open(part_path, "wb") as f:
+            f.write(data)
+
+# MPEG-1 Layer III、128 kbps、44.1 kHz、單聲道的靜音幀（417 bytes，約 26 ms）
+_SILENT_MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC4]) + bytes(413)
+
+def silent_mp3(seconds: float = 1.0) -> bytes:
+    """產生指定長度的靜音 MP3（stub 使用）"""
+    return _SILENT_MP3_FRAME * max(1, round(seconds * 44100 / 1152))
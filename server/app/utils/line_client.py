@@ -0,0 +1,143 @@
+import logging
+import os
+import uuid
+import random
+import asyncio
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Iterable, List, Tuple
+import httpx
+
+logger = logging.getLogger(__name__)
+
+LINE_API_BASE = os.getenv("LINE_API_BASE", "https://api.line.me")
+LINE_CHANNEL_ACCESS_TOKEN = os.getenv("LINE_CHANNEL_ACCESS_TOKEN")
+# LINE multicast 單次最多 500 位收件者
+LINE_MULTICAST_SIZE = int(os.getenv("LINE_MULTICAST_SIZE", 500))
+# 同時進行中的 LINE API 請求數上限
+LINE_MAX_CONCURRENCY = int(os.getenv("LINE_MAX_CONCURRENCY", 8))
+# 遇到 429 / 5xx / 連線錯誤時的重試次數
+LINE_MAX_RETRIES = int(os.getenv("LINE_MAX_RETRIES", 3))
+# 重試的基礎等待秒數（指數退避）
+LINE_RETRY_BACKOFF = float(os.getenv("LINE_RETRY_BACKOFF", 0.5))
+LINE_TIMEOUT = float(os.getenv("LINE_TIMEOUT", 10))
+
+def _retry_after_seconds(response: httpx.Response):
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def _is_retryable(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+class LinePushClient:
+    """
+    共用的 LINE Messaging API client。
+    httpx.AsyncClient 於 lifespan 建立一次並重複使用連線；
+    收件者以 multicast 每 500 人一組送出，並以 semaphore 限制同時進行的請求數。
+    """
+    def __init__(self, base_url: str = LINE_API_BASE, access_token: str = LINE_CHANNEL_ACCESS_TOKEN,
+                 multicast_size: int = LINE_MULTICAST_SIZE, max_concurrency: int = LINE_MAX_CONCURRENCY,
+                 max_retries: int = LINE_MAX_RETRIES, retry_backoff: float = LINE_RETRY_BACKOFF):
+        self.base_url = base_url
+        self.access_token = access_token
+        self.multicast_size = multicast_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._client = None
+        self._semaphore = None
+
+    @property
+    def running(self) -> bool:
+        return self._client is not None
+
+    async def start(self, transport: httpx.AsyncBaseTransport = None):
+        """建立共用連線池；transport 可替換為本機的模擬 LINE 伺服器"""
+        if self.running:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency),
+            timeout=LINE_TIMEOUT,
+            transport=transport
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        logger.info("LINE client started (%s, concurrency=%d)", self.base_url, self.max_concurrency)
+
+    async def close(self):
+        if self._client is None:
+            return
+        await self._client.aclose()
+        self._client = None
+        logger.info("LINE client closed")
+
+    def _backoff(self, attempt: int) -> float:
+        return self.retry_backoff * (2 ** attempt) * (0.5 + random.random() / 2)
+
+    async def _post(self, path: str, payload: dict) -> int:
+        """
+        送出請求並回傳最終的 HTTP 狀態碼；429 / 5xx 會依 Retry-After 或指數退避重試。
+        連線錯誤在重試用完後回傳 0。
+        同一次送出的每次重試都帶相同的 X-Line-Retry-Key，LINE 不會重複送達；
+        409 表示先前的嘗試其實已被接受，視為成功。
+        """
+        if not self.running:
+            raise RuntimeError("❌ LINE client not started")
+        headers = {"X-Line-Retry-Key": str(uuid.uuid4())}
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                try:
+                    response = await self._client.post(path, json=payload, headers=headers)
+                except httpx.HTTPError as e:
+                    status_code, delay = 0, None
+                    logger.warning("LINE API 連線失敗：%s", e)
+                else:
+                    status_code, delay = response.status_code, _retry_after_seconds(response)
+                    if status_code == 409 and attempt > 0:
+                        logger.info("LINE API %s 已接受先前的重試請求", path)
+                        return 200
+                    if status_code != 200:
+                        logger.warning("LINE API %s 狀態碼：%s，回應內容：%s", path, status_code, response.text)
+            if status_code == 200 or (status_code and not _is_retryable(status_code)):
+                return status_code
+            if attempt < self.max_retries:
+                await asyncio.sleep(delay if delay is not None else self._backoff(attempt))
+        return status_code
+
+    async def push(self, to: str, messages: List[dict]) -> int:
+        """傳送訊息給單一使用者"""
+        return await self._post("/v2/bot/message/push", {"to": to, "messages": messages})
+
+    async def multicast(self, to: List[str], messages: List[dict]) -> int:
+        """傳送相同訊息給多位使用者（最多 multicast_size 位）"""
+        return await self._post("/v2/bot/message/multicast", {"to": to, "messages": messages})
+
+    async def fan_out(self, recipients: Iterable[str], messages: List[dict]) -> Tuple[List[str], List[str]]:
+        """
+        將同一則訊息送給所有收件者，回傳 (成功名單, 失敗名單)。
+        重複與空白的 line_id 會先排除。
+        """
+        unique = list(dict.fromkeys(r for r in recipients if r))
+        chunks = [unique[i:i + self.multicast_size] for i in range(0, len(unique), self.multicast_size)]
+        statuses = await asyncio.gather(*(self.multicast(chunk, messages) for chunk in chunks))
+
+        sent, failed = [], []
+        for chunk, status_code in zip(chunks, statuses):
+            (sent if status_code == 200 else failed).extend(chunk)
+        return sent, failed
+
+def text_message(text: str) -> dict:
+    return {"type": "text", "text": text}
+
+line_client = LinePushClient()
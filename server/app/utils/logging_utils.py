@@ -0,0 +1,182 @@
+"""
+非阻塞的結構化 log：
+
+- 程式中一律使用 logging.getLogger(__name__)，不直接 print
+- app 的 logger 只把紀錄放進佇列（QueueHandler），實際寫入 stdout 由背景執行緒（QueueListener）負責，
+  stdout 阻塞時也不會卡住 event loop
+- 輸出為一行一筆 JSON（LOG_FORMAT=text 可改為一般文字），包含 request_id 方便串起同一個請求的紀錄
+- 高頻率的 log（例如 websocket 每幀的錯誤）以 LogSampler 限制頻率
+"""
+import os
+import sys
+import copy
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# json 或 text
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+REQUEST_ID_HEADER = b"x-request-id"
+
+request_id_var: ContextVar = ContextVar("request_id", default=None)
+
+# LogRecord 內建的屬性，其餘透過 extra= 傳入的欄位會一併輸出
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+class RequestIdFilter(logging.Filter):
+    """在產生紀錄的當下（呼叫端的 context）記下 request_id"""
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        # 經過 _ExcTextQueueHandler 的紀錄只剩 exc_text；直接交給 formatter 的紀錄仍帶 exc_info
+        exc_text = record.exc_text or (self.formatException(record.exc_info) if record.exc_info else None)
+        if exc_text:
+            entry["exc_info"] = exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        return super().format(record)
+
+class _ExcTextQueueHandler(QueueHandler):
+    """
+    QueueHandler.prepare 會把 traceback 併入 message 並清掉 exc_info，listener 端的 formatter 看不到例外。
+    這裡改為只合併 msg % args，traceback 在呼叫端先轉成 exc_text（不保留 frame），由 listener 端輸出。
+    """
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class _Logging:
+    listener = None
+    handler = None
+
+def setup_logging(stream=None, level: str = LOG_LEVEL, fmt: str = LOG_FORMAT):
+    """
+    設定 app logger：QueueHandler → 佇列 → QueueListener 背景執行緒 → stream（預設 stdout）。
+    create_app() 時即呼叫，匯入與啟動階段的 INFO 紀錄也會輸出；重複呼叫不會重複加入 handler。
+    """
+    if _Logging.listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    handler = _ExcTextQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    logger = logging.getLogger("app")
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    # 不再往 root logger 傳遞，避免同一筆紀錄在 uvicorn 的 handler 再同步寫一次
+    logger.propagate = False
+
+    _Logging.listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _Logging.handler = handler
+    _Logging.listener.start()
+
+def shutdown_logging():
+    """寫出佇列中剩餘的紀錄並停止背景執行緒"""
+    if _Logging.listener is None:
+        return
+    logger = logging.getLogger("app")
+    logger.removeHandler(_Logging.handler)
+    logger.propagate = True
+    _Logging.listener.stop()
+    _Logging.listener = None
+    _Logging.handler = None
+
+class LogSampler:
+    """
+    限制高頻率 log：同一個 key 在 interval 秒內只放行一次，
+    放行時回傳期間被略過的筆數，方便寫進紀錄。
+    clock 為回傳秒數的時間來源，預設 time.monotonic（測試時可換成假時鐘）。
+    """
+    def __init__(self, interval: float = 10.0, max_keys: int = 10000, clock=time.monotonic):
+        self.interval = interval
+        self.max_keys = max_keys
+        self._clock = clock
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        """可以記錄時回傳略過的筆數（int），否則回傳 None"""
+        now = self._clock()
+        with self._lock:
+            last, suppressed = self._state.get(key, (None, 0))
+            if last is not None and now - last < self.interval:
+                self._state[key] = (last, suppressed + 1)
+                return None
+            if len(self._state) >= self.max_keys and key not in self._state:
+                self._state.clear()
+            self._state[key] = (now, 0)
+            return suppressed
+
+class RequestIdMiddleware:
+    """
+    為每個 HTTP / websocket 請求設定 request_id（沿用 X-Request-ID 標頭，沒有則產生），
+    並在回應標頭帶回，同一請求中的所有 log 都會帶有這個值。
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper if scope["type"] == "http" else send)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,187 @@
+"""
+行程內的輕量指標（Prometheus text format 輸出），供 /metrics 使用。
+
+    from app.utils.metrics import registry
+    acquire_seconds = registry.histogram("db_pool_acquire_seconds", "取得連線的等待時間")
+    acquire_seconds.observe(0.003)
+
+指標可帶 label：宣告時給 labelnames，記錄時依序傳入 label 值。
+"""
+import abc
+import math
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Tuple
+
+# 預設的延遲 bucket（秒）
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class _Metric(abc.ABC):
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+    @abc.abstractmethod
+    def render(self):
+        """回傳此指標的 Prometheus text format 各行"""
+
+class Counter(_Metric):
+    """只增不減的計數；給 fn 時於輸出當下呼叫取得目前累計值（格式同 Gauge）"""
+    type_name = "counter"
+
+    def __init__(self, name, help_text, labelnames=(), fn: Callable = None):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._fn = fn
+
+    def inc(self, amount: float = 1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = self._header()
+        if self._fn is not None:
+            result = self._fn()
+            values = result if isinstance(result, dict) else {(): result}
+        else:
+            values = self._values if self._values or self.labelnames else {(): 0}
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Gauge(_Metric):
+    """
+    可增可減的數值。給 fn 時於輸出當下呼叫取得目前值：
+    沒有 label 時 fn 回傳數字，有 label 時回傳 {label 值 tuple: 數字}。
+    """
+    type_name = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), fn: Callable = None):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple, float] = {}
+        self._fn = fn
+
+    def set(self, value: float, *labels):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, amount: float = 1, *labels):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, amount: float = 1, *labels):
+        self.inc(-amount, *labels)
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def _collect(self) -> Dict[Tuple, float]:
+        if self._fn is None:
+            return dict(self._values)
+        result = self._fn()
+        return result if isinstance(result, dict) else {(): result}
+
+    def render(self):
+        lines = self._header()
+        for labels, value in sorted(self._collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(float(value))}")
+        return lines
+
+class Histogram(_Metric):
+    """固定 bucket 的分布統計（累積 bucket、總和與次數）"""
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label 值 tuple → [各 bucket 次數..., +Inf 次數, 總和]
+        self._series: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def snapshot(self, *labels) -> dict:
+        """回傳 {"count", "sum"}，供 JSON 統計使用"""
+        series = self._series.get(labels)
+        if series is None:
+            return {"count": 0, "sum": 0.0}
+        return {"count": sum(series[:-1]), "sum": series[-1]}
+
+    def render(self):
+        lines = self._header()
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """指標註冊表；同名指標重複宣告時回傳既有的實例"""
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"指標 {name} 已註冊為 {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames=(), fn: Callable = None) -> Counter:
+        return self._register(Counter, name, help_text, labelnames, fn=fn)
+
+    def gauge(self, name: str, help_text: str, labelnames=(), fn: Callable = None) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames, fn=fn)
+
+    def histogram(self, name: str, help_text: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
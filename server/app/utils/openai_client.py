@@ -0,0 +1,21 @@
+import os
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+
+_client = None
+_lock = threading.Lock()
+
+def get_openai_client():
+    """
+    取得共用的 OpenAI client（第一次使用時才建立）。
+    OpenAI client 內部有連線池且為 thread-safe，整個行程共用一個即可。
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from openai import OpenAI
+                _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
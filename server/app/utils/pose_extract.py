@@ -0,0 +1,43 @@
+import uuid
+from collections import deque
+import numpy as np
+from .pose_worker_pool import pose_pool, POSE_RESULT_TIMEOUT
+
+NUM_LANDMARKS = 33
+# 影片解碼與骨架提取重疊進行時，最多同時在 worker 中處理的幀數
+VIDEO_PIPELINE_DEPTH = 4
+
+def iter_video_skeletons(video_path: str):
+    """
+    逐幀解碼影片並提取骨架點（同步 generator，請於 executor 中使用）。
+    每幀產出 (33, 3) 的 float32 陣列，偵測不到人時為全 0。
+    解碼在目前執行緒進行，骨架提取交給 pose worker pool，兩者重疊執行。
+    """
+    # cv2 只有處理影片時才需要，延後匯入以縮短 server 啟動時間
+    import cv2
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError(f"影片讀取失敗：{video_path}")
+
+    # 同一支影片使用同一個 stream_id，worker 會以影片模式追蹤骨架
+    stream_id = uuid.uuid4().hex
+    in_flight = deque()
+    empty = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    try:
+        while True:
+            success, frame = cap.read()
+            if not success or frame is None:
+                break
+            in_flight.append(pose_pool.submit(frame, stream_id, timeout=POSE_RESULT_TIMEOUT))
+            if len(in_flight) >= VIDEO_PIPELINE_DEPTH:
+                landmarks = pose_pool.result(in_flight.popleft())
+                yield empty.copy() if landmarks is None else landmarks
+        while in_flight:
+            landmarks = pose_pool.result(in_flight.popleft())
+            yield empty.copy() if landmarks is None else landmarks
+    finally:
+        for future in in_flight:
+            future.cancel()
+        cap.release()
+        pose_pool.end_stream(stream_id)
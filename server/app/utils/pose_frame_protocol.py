@@ -0,0 +1,67 @@
+"""
+/ws/pose 的二進位骨架幀格式（little-endian）：
+
+    offset  size  欄位
+    0       2     magic，固定為 b"PF"
+    2       1     版本，目前為 1
+    3       1     資料型別：1 = float16，2 = float32
+    4       4     序號 seq（uint32）
+    8       8     時間戳 timestamp，epoch 秒（float64）
+    16      2     關節數 landmark_count（uint16）
+    18      1     每個關節的欄位數 channels，固定為 3 (x, y, visibility)
+    19      1     保留
+    20      ...   landmark_count * channels 個浮點數
+"""
+import struct
+from collections import namedtuple
+import numpy as np
+
+MAGIC = b"PF"
+VERSION = 1
+HEADER = struct.Struct("<2sBBIdHBx")
+HEADER_SIZE = HEADER.size
+
+DTYPE_CODES = {
+    1: np.dtype("<f2"),
+    2: np.dtype("<f4"),
+}
+DTYPE_BY_NAME = {dtype.name: code for code, dtype in DTYPE_CODES.items()}
+
+PoseFrameHeader = namedtuple("PoseFrameHeader", ["seq", "timestamp", "landmark_count", "channels", "dtype"])
+
+def decode_pose_frame(data):
+    """
+    解析二進位骨架幀，回傳 (header, keypoints)。
+    keypoints 為直接指向 data 的 (landmark_count, channels) 唯讀陣列，不複製資料。
+    """
+    if len(data) < HEADER_SIZE:
+        raise ValueError("封包長度不足")
+    magic, version, dtype_code, seq, timestamp, landmark_count, channels = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("封包 magic 不符")
+    if version != VERSION:
+        raise ValueError(f"不支援的封包版本：{version}")
+    dtype = DTYPE_CODES.get(dtype_code)
+    if dtype is None:
+        raise ValueError(f"不支援的資料型別代碼：{dtype_code}")
+
+    count = landmark_count * channels
+    if len(data) != HEADER_SIZE + count * dtype.itemsize:
+        raise ValueError("封包長度與關節數不符")
+    keypoints = np.frombuffer(data, dtype=dtype, count=count, offset=HEADER_SIZE)
+    header = PoseFrameHeader(seq, timestamp, landmark_count, channels, dtype)
+    return header, keypoints.reshape(landmark_count, channels)
+
+def encode_pose_frame(keypoints, seq: int, timestamp: float, dtype: str = "float16") -> bytes:
+    """
+    將 (landmark_count, 3) 骨架點編碼為二進位幀（供邊緣裝置與測試使用）。
+    """
+    dtype_code = DTYPE_BY_NAME.get(np.dtype(dtype).name)
+    if dtype_code is None:
+        raise ValueError(f"不支援的資料型別：{dtype}")
+    array = np.ascontiguousarray(keypoints, dtype=DTYPE_CODES[dtype_code])
+    if array.ndim != 2:
+        raise ValueError("keypoints 必須為二維陣列")
+    landmark_count, channels = array.shape
+    header = HEADER.pack(MAGIC, VERSION, dtype_code, seq & 0xFFFFFFFF, timestamp, landmark_count, channels)
+    return header + array.tobytes()
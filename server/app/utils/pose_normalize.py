@@ -1,34 +1,138 @@
+import weakref
 import numpy as np
 import asyncio
 
-async def normalize_skeleton_data(skeleton_data, scaler, time_steps=120):
+NUM_LANDMARKS = 33
+# 每幀特徵：33 個關節的 (x, y, visibility) 加上 33 個關節的位移量
+FEATURE_DIM = NUM_LANDMARKS * 4
+COORD_DIM = NUM_LANDMARKS * 3
+
+# scaler 參數轉為 float32 後快取，避免每次推論重複轉型
+_scaler_params = weakref.WeakKeyDictionary()
+
+def to_skeleton_array(skeleton_data, time_steps=120, out=None):
     """
-    將骨架數據標準化並轉換為模型輸入格式（非同步版本）。
+    將骨架數據轉為 (time_steps, 33, 3) 的 float32 陣列，不足時於前方補 0。
+    :param skeleton_data: (T, 33, 3) 陣列，或每幀 33 個 (x, y, visibility) 的序列
+    :param out: 可重複使用的輸出 buffer
     """
-    if len(skeleton_data) < time_steps:
-        padding = [[(0, 0, 0)] * 33] * (time_steps - len(skeleton_data))
-        skeleton_data = padding + skeleton_data
-    else:
-        skeleton_data = skeleton_data[-time_steps:]
+    if out is None:
+        out = np.empty((time_steps, NUM_LANDMARKS, 3), dtype=np.float32)
+    count = min(len(skeleton_data), time_steps)
+    pad = time_steps - count
+    out[:pad] = 0
+    if count:
+        recent = skeleton_data if count == len(skeleton_data) else skeleton_data[len(skeleton_data) - count:]
+        if isinstance(recent, np.ndarray):
+            np.copyto(out[pad:], recent, casting="unsafe")
+        else:
+            np.stack(recent, out=out[pad:], casting="unsafe")
+    return out
+
+def build_features(skeleton, out=None, work=None):
+    """
+    由骨架陣列計算模型特徵（向量化，可含 batch 維度）。
+    :param skeleton: (..., T, 33, 3) float32
+    :param out: (..., T, 132) 輸出 buffer
+    :param work: (..., T-1, 33, 2) 位移計算用的暫存 buffer
+    :return: out
+    """
+    lead = skeleton.shape[:-2]
+    if out is None:
+        out = np.empty(lead + (FEATURE_DIM,), dtype=np.float32)
+    np.copyto(out[..., :COORD_DIM], skeleton.reshape(lead + (COORD_DIM,)), casting="unsafe")
+
+    # 相鄰兩幀 (x, y) 的位移量；視窗第一幀沒有前一幀，位移為 0
+    accel = out[..., COORD_DIM:]
+    accel[..., 0, :] = 0
+    if skeleton.shape[-3] > 1:
+        xy = skeleton[..., :2]
+        if work is None:
+            work = np.empty(xy[..., 1:, :, :].shape, dtype=np.float32)
+        np.subtract(xy[..., 1:, :, :], xy[..., :-1, :, :], out=work)
+        np.hypot(work[..., 0], work[..., 1], out=accel[..., 1:, :])
+    return out
+
+def _get_scaler_params(scaler):
+    try:
+        return _scaler_params[scaler]
+    except (KeyError, TypeError):
+        pass
+
+    params = None
+    if hasattr(scaler, "min_") and hasattr(scaler, "scale_"):
+        # MinMaxScaler：X * scale_ + min_
+        clip = getattr(scaler, "clip", False)
+        params = (
+            "minmax",
+            np.asarray(scaler.scale_, dtype=np.float32),
+            np.asarray(scaler.min_, dtype=np.float32),
+            scaler.feature_range if clip else None,
+        )
+    elif hasattr(scaler, "mean_") and hasattr(scaler, "scale_"):
+        # StandardScaler：(X - mean_) / scale_
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        params = (
+            "standard",
+            None if scale is None else np.asarray(scale, dtype=np.float32),
+            None if mean is None else np.asarray(mean, dtype=np.float32),
+            None,
+        )
 
-    accel = []
-    for i in range(1, len(skeleton_data)):
-        frame_accel = [((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)**0.5
-                       for p1, p2 in zip(skeleton_data[i - 1], skeleton_data[i])]
-        accel.append(frame_accel)
+    try:
+        _scaler_params[scaler] = params
+    except TypeError:
+        pass
+    return params
 
-    if len(accel) < time_steps:
-        accel = [[0] * 33] * (time_steps - len(accel)) + accel
+def scale_features(features, scaler):
+    """
+    對 (..., T, 132) 特徵套用 scaler（原地運算）。
+    scaler 以整個視窗攤平後 fit，因此以 (..., T * 132) 視角廣播。
+    """
+    lead = features.shape[:-2]
+    flat = features.reshape(lead + (-1,))
+    params = _get_scaler_params(scaler)
+    if params is None:
+        # 不認得的 scaler 類型，退回 sklearn 的 transform
+        scaled = scaler.transform(flat.reshape(-1, flat.shape[-1]))
+        np.copyto(flat, scaled.reshape(flat.shape), casting="unsafe")
+    elif params[0] == "minmax":
+        _, scale, offset, feature_range = params
+        flat *= scale
+        flat += offset
+        if feature_range is not None:
+            np.clip(flat, feature_range[0], feature_range[1], out=flat)
+    else:
+        _, scale, mean, _ = params
+        if mean is not None:
+            flat -= mean
+        if scale is not None:
+            flat /= scale
+    return features
 
-    combo = []
-    for i in range(time_steps):
-        skeleton_frame = np.array(skeleton_data[i]).flatten()
-        accel_frame = np.array(accel[i])
-        combo.append(np.hstack((skeleton_frame, accel_frame)))
+def prepare_model_inputs(skeletons, scaler, out=None, work=None):
+    """
+    將一批 (B, T, 33, 3) 骨架轉換為模型輸入 (B, T, 132)。
+    """
+    features = build_features(skeletons, out=out, work=work)
+    return scale_features(features, scaler)
 
-    combo = np.array(combo).reshape(1, time_steps, -1)
-    flat = combo.reshape(1, -1)
+def prepare_model_input(skeleton_data, scaler, time_steps=120, out=None):
+    """
+    將骨架數據標準化並轉換為模型輸入格式 (1, time_steps, 132)。
+    :param out: 可重複使用的 (time_steps, 132) 或 (1, time_steps, 132) 輸出 buffer
+    """
+    skeleton = to_skeleton_array(skeleton_data, time_steps)
+    if out is not None:
+        out = out.reshape(time_steps, FEATURE_DIM)
+    features = prepare_model_inputs(skeleton, scaler, out=out)
+    return features.reshape(1, time_steps, FEATURE_DIM)
 
+async def normalize_skeleton_data(skeleton_data, scaler, time_steps=120):
+    """
+    將骨架數據標準化並轉換為模型輸入格式（非同步版本）。
+    """
     loop = asyncio.get_event_loop()
-    scaled = await loop.run_in_executor(None, scaler.transform, flat)
-    return scaled.reshape(1, time_steps, -1)
\ No newline at end of file
+    return await loop.run_in_executor(None, prepare_model_input, skeleton_data, scaler, time_steps)
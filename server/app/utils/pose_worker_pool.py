@@ -0,0 +1,293 @@
+import logging
+import os
+import time
+import queue
+import threading
+import itertools
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from multiprocessing import shared_memory
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 骨架提取 worker process 數量
+POSE_WORKERS = int(os.getenv("POSE_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+# 共用記憶體中可同時處理的幀數（超過時呼叫端會等待，形成 backpressure）
+POSE_FRAME_SLOTS = int(os.getenv("POSE_FRAME_SLOTS", POSE_WORKERS * 2))
+# 單一幀的最大位元組數（預設 1080p BGR），更大的影像會先等比例縮小再送進 worker
+POSE_MAX_FRAME_BYTES = int(os.getenv("POSE_MAX_FRAME_BYTES", 1920 * 1080 * 3))
+# 等待單幀骨架結果的上限秒數
+POSE_RESULT_TIMEOUT = float(os.getenv("POSE_RESULT_TIMEOUT", 30))
+# 每個 worker 最多保留幾條影片串流的 Pose 追蹤狀態
+POSE_MAX_STREAMS_PER_WORKER = int(os.getenv("POSE_MAX_STREAMS_PER_WORKER", 8))
+# worker 啟動方式，spawn 可避免 fork 已載入 TensorFlow 的主程序
+POSE_WORKER_START_METHOD = os.getenv("POSE_WORKER_START_METHOD", "spawn")
+# 多久檢查一次 worker 是否仍存活（秒）
+POSE_WORKER_CHECK_INTERVAL = float(os.getenv("POSE_WORKER_CHECK_INTERVAL", 1.0))
+
+def _worker_main(shm_name, slot_bytes, task_queue, result_queue, max_streams):
+    """
+    worker process 主迴圈：每個 process 擁有自己的 MediaPipe Pose 實例。
+    單張影像使用 static_image_mode，影片串流則依 stream_id 保留追蹤狀態。
+    """
+    import cv2
+    import mediapipe as mp
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    image_pose = mp.solutions.pose.Pose(static_image_mode=True)
+    stream_poses = OrderedDict()
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            if task[0] == "end_stream":
+                stream_pose = stream_poses.pop(task[1], None)
+                if stream_pose is not None:
+                    stream_pose.close()
+                continue
+
+            _, slot, ticket, shape, stream_id = task
+            try:
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+                if stream_id is None:
+                    pose = image_pose
+                else:
+                    pose = stream_poses.get(stream_id)
+                    if pose is None:
+                        pose = stream_poses[stream_id] = mp.solutions.pose.Pose(static_image_mode=False)
+                        while len(stream_poses) > max_streams:
+                            stream_poses.popitem(last=False)[1].close()
+                    stream_poses.move_to_end(stream_id)
+
+                results = pose.process(rgb_frame)
+                landmarks = None
+                if results.pose_landmarks:
+                    landmarks = np.array(
+                        [(lm.x, lm.y, lm.visibility) for lm in results.pose_landmarks.landmark],
+                        dtype=np.float32
+                    )
+                result_queue.put((slot, ticket, landmarks, None))
+            except Exception as e:
+                result_queue.put((slot, ticket, None, str(e)))
+    finally:
+        image_pose.close()
+        for stream_pose in stream_poses.values():
+            stream_pose.close()
+        shm.close()
+
+class PoseWorkerPool:
+    """
+    MediaPipe Pose 的多 process 骨架提取池。
+    影像透過共用記憶體交給 worker，結果以 Future 回傳；
+    共用記憶體 slot 用完時，呼叫端會等待直到有 slot 釋放。
+
+    結果收集執行緒同時監看 worker：worker 意外結束時，交給它的 Future 以 RuntimeError 結束、
+    slot 放回可用佇列，並重新啟動該 worker。每次派送都帶有 ticket，
+    已結束的 worker 殘留在佇列中的結果不會誤判為之後使用同一個 slot 的請求。
+    """
+    def __init__(self, workers: int = POSE_WORKERS, slots: int = POSE_FRAME_SLOTS,
+                 max_frame_bytes: int = POSE_MAX_FRAME_BYTES):
+        self.workers = workers
+        self.slots = max(slots, workers)
+        self.max_frame_bytes = max_frame_bytes
+        self._processes = []
+        self._task_queues = []
+        self._result_queue = None
+        self._shm = None
+        self._free_slots = None
+        # slot → (ticket, worker 編號, Future)
+        self._futures = {}
+        self._collector = None
+        self._ctx = None
+        self._stopping = False
+        self._round_robin = itertools.count()
+        self._tickets = itertools.count()
+        self._lock = threading.Lock()
+        self.restarts = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._processes)
+
+    def start(self):
+        """啟動 worker processes（同步，會阻塞）"""
+        if self.running:
+            return
+        self._ctx = multiprocessing.get_context(POSE_WORKER_START_METHOD)
+        self._stopping = False
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slots * self.max_frame_bytes)
+        self._free_slots = queue.Queue()
+        for slot in range(self.slots):
+            self._free_slots.put(slot)
+        self._result_queue = self._ctx.Queue()
+        for index in range(self.workers):
+            task_queue, process = self._spawn_worker(index)
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+        self._collector = threading.Thread(target=self._collect_results, name="pose-results", daemon=True)
+        self._collector.start()
+        logger.info("Pose worker pool started (%d workers, %d slots)", self.workers, self.slots)
+
+    def _spawn_worker(self, index: int):
+        task_queue = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._shm.name, self.max_frame_bytes, task_queue, self._result_queue,
+                  POSE_MAX_STREAMS_PER_WORKER),
+            name=f"pose-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return task_queue, process
+
+    def shutdown(self, timeout: float = 5.0):
+        """通知所有 worker 結束並釋放共用記憶體（同步，會阻塞）"""
+        if not self.running:
+            return
+        with self._lock:
+            self._stopping = True
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._result_queue.put(None)
+        self._collector.join(timeout)
+
+        with self._lock:
+            pending, self._futures = self._futures, {}
+        for _, _, future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("❌ Pose worker pool stopped"))
+
+        self._shm.close()
+        self._shm.unlink()
+        self._processes = []
+        self._task_queues = []
+        logger.info("Pose worker pool stopped")
+
+    def _collect_results(self):
+        while True:
+            try:
+                item = self._result_queue.get(timeout=POSE_WORKER_CHECK_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+                continue
+            if item is None:
+                break
+            slot, ticket, landmarks, error = item
+            with self._lock:
+                entry = self._futures.get(slot)
+                if entry is None or entry[0] != ticket:
+                    # 已結束的 worker 留下的舊結果，slot 已在重啟時回收
+                    continue
+                del self._futures[slot]
+            self._free_slots.put(slot)
+            future = entry[2]
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(RuntimeError(f"骨架解析失敗：{error}"))
+            else:
+                future.set_result(landmarks)
+
+    def _check_workers(self):
+        """回收意外結束的 worker 手上的 slot 與 Future，並重新啟動該 worker"""
+        for index, process in enumerate(self._processes):
+            if process.is_alive():
+                continue
+            with self._lock:
+                if self._stopping:
+                    return
+                lost = {slot: entry for slot, entry in self._futures.items() if entry[1] == index}
+                for slot in lost:
+                    del self._futures[slot]
+                # 舊佇列中尚未處理的工作一併捨棄，結束時也不必等它送完
+                self._task_queues[index].cancel_join_thread()
+                self._task_queues[index], self._processes[index] = self._spawn_worker(index)
+                self.restarts += 1
+            logger.warning("Pose worker %s exited (code %s), restarted; %d in-flight frames failed",
+                           process.name, process.exitcode, len(lost))
+            for slot, (_, _, future) in lost.items():
+                self._free_slots.put(slot)
+                if not future.done():
+                    future.set_exception(RuntimeError(f"❌ Pose worker exited: {process.name}"))
+
+    def _worker_index(self, stream_id) -> int:
+        # 同一串流固定交給同一個 worker，才能沿用 Pose 的追蹤狀態
+        if stream_id is None:
+            return next(self._round_robin) % self.workers
+        return hash(stream_id) % self.workers
+
+    def _dispatch(self, slot: int, frame: np.ndarray, stream_id) -> Future:
+        view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self._shm.buf, offset=slot * self.max_frame_bytes)
+        np.copyto(view, frame)
+        future = Future()
+        index = self._worker_index(stream_id)
+        ticket = next(self._tickets)
+        # 與 _check_workers 互斥：登記 Future 與放入佇列之間 worker 不會被替換
+        with self._lock:
+            self._futures[slot] = (ticket, index, future)
+            self._task_queues[index].put(("process", slot, ticket, frame.shape, stream_id))
+        return future
+
+    def _prepare_frame(self, frame: np.ndarray) -> np.ndarray:
+        if not self.running:
+            raise RuntimeError("❌ Pose worker pool not started")
+        if frame.dtype != np.uint8 or frame.ndim != 3 or frame.shape[2] != 3:
+            raise ValueError("影像必須為 3-channel 的 uint8 numpy.ndarray")
+        if frame.nbytes <= self.max_frame_bytes:
+            return frame
+        # 超過 slot 大小（例如 4K 影片）時等比例縮小；骨架座標為相對座標，不受縮放影響
+        import cv2
+
+        height, width = frame.shape[:2]
+        scale = (self.max_frame_bytes / frame.nbytes) ** 0.5
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    def submit(self, frame: np.ndarray, stream_id=None, timeout: float = None) -> Future:
+        """
+        送出一張 BGR 影像（同步版本，供 executor 中的程式使用）。
+        沒有空的 slot 時會阻塞等待，超過 timeout 拋出 RuntimeError。
+        """
+        frame = self._prepare_frame(frame)
+        try:
+            slot = self._free_slots.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError("❌ Pose worker pool has no free slot") from None
+        return self._dispatch(slot, frame, stream_id)
+
+    def result(self, future: Future, timeout: float = POSE_RESULT_TIMEOUT):
+        """
+        等待 submit() 回傳的 Future（同步，會阻塞），超過 timeout 時拋出 RuntimeError。
+        worker 意外結束時，Future 會由結果收集執行緒以 RuntimeError 結束，不必等到 timeout。
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise RuntimeError("❌ Pose worker timed out") from None
+
+    def warm_up(self, timeout: float = 120.0):
+        """
+        每個 worker 各處理一張空白影像，確保 mediapipe 已匯入且 Pose 模型已載入（同步，會阻塞）。
+        stream_id 為 None 時依序輪流分配，送出 workers 張即可涵蓋所有 worker。
+        """
+        deadline = time.monotonic() + timeout
+        blank = np.zeros((64, 64, 3), dtype=np.uint8)
+        futures = [self.submit(blank, timeout=timeout) for _ in range(self.workers)]
+        for future in futures:
+            self.result(future, timeout=max(0.0, deadline - time.monotonic()))
+
+    def end_stream(self, stream_id):
+        """影片處理完畢後釋放 worker 中該串流的 Pose 狀態"""
+        if self.running:
+            self._task_queues[self._worker_index(stream_id)].put(("end_stream", stream_id))
+
+pose_pool = PoseWorkerPool()
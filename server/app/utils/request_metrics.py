@@ -0,0 +1,72 @@
+import time
+from .metrics import registry
+
+# 沒有對應到任何路由的請求（404 等）統一歸在這個 label，避免任意路徑造成大量序列
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP 請求處理時間（秒），依路由樣板分類", ("method", "route")
+)
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP 請求數，依路由樣板與狀態碼分類", ("method", "route", "status")
+)
+http_requests_in_flight = registry.gauge("http_requests_in_flight", "處理中的 HTTP 請求數")
+websocket_connections = registry.gauge("websocket_connections", "目前開啟的 websocket 連線數", ("route",))
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+class RequestMetricsMiddleware:
+    """
+    記錄每個路由樣板（例如 /fall_video_file 而非實際網址）的延遲、狀態碼與進行中的請求數。
+    以純 ASGI middleware 實作，不會緩衝 StreamingResponse，每個請求只多幾次計時與加總。
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+            return
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            method = scope["method"]
+            route = _route_template(scope)
+            http_request_seconds.observe(elapsed, method, route)
+            http_requests_total.inc(1, method, route, str(status_code))
+
+    async def _websocket(self, scope, receive, send):
+        counted = None
+
+        async def receive_wrapper():
+            nonlocal counted
+            message = await receive()
+            if counted is None and message["type"] == "websocket.connect":
+                # 路由在收到 connect 前已比對完成
+                counted = _route_template(scope)
+                websocket_connections.inc(1, counted)
+            return message
+
+        try:
+            await self.app(scope, receive_wrapper, send)
+        finally:
+            if counted is not None:
+                websocket_connections.dec(1, counted)
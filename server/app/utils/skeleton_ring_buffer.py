@@ -0,0 +1,55 @@
+import numpy as np
+from .pose_normalize import NUM_LANDMARKS, COORD_DIM, FEATURE_DIM
+
+class SkeletonRingBuffer:
+    """
+    固定長度、以陣列實作的骨架環形緩衝區。
+    每收到一幀就就地寫入該幀的座標與相對前一幀的位移量，
+    取視窗時只需依時間順序複製兩段連續記憶體，不必重算整個視窗。
+    """
+    def __init__(self, time_steps: int = 120):
+        self.time_steps = time_steps
+        # 尚未寫入的列維持為 0，等同於 normalize 時前方補 0 的 padding
+        self._features = np.zeros((time_steps, FEATURE_DIM), dtype=np.float32)
+        self._last_frame = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+        self._delta = np.empty((NUM_LANDMARKS, 2), dtype=np.float32)
+        self._head = 0
+        self.frame_count = 0
+
+    def __len__(self):
+        return min(self.frame_count, self.time_steps)
+
+    @property
+    def is_full(self) -> bool:
+        return self.frame_count >= self.time_steps
+
+    def append(self, frame: np.ndarray):
+        """
+        加入一幀 (33, 3) 骨架點，並增量計算該幀的位移量。
+        """
+        row = self._features[self._head]
+        np.copyto(row[:COORD_DIM], frame.reshape(COORD_DIM), casting="unsafe")
+        np.subtract(frame[:, :2], self._last_frame[:, :2], out=self._delta, casting="unsafe")
+        np.hypot(self._delta[:, 0], self._delta[:, 1], out=row[COORD_DIM:])
+        np.copyto(self._last_frame, frame, casting="unsafe")
+        self._head = (self._head + 1) % self.time_steps
+        self.frame_count += 1
+
+    def window(self, out: np.ndarray = None) -> np.ndarray:
+        """
+        依時間順序取出 (time_steps, 132) 的特徵視窗（尚未經過 scaler）。
+        """
+        if out is None:
+            out = np.empty((self.time_steps, FEATURE_DIM), dtype=np.float32)
+        tail = self.time_steps - self._head
+        out[:tail] = self._features[self._head:]
+        out[tail:] = self._features[:self._head]
+        # 視窗內第一幀沒有前一幀，位移量與 normalize_skeleton_data 一致設為 0
+        out[0, COORD_DIM:] = 0
+        return out
+
+    def clear(self):
+        self._features.fill(0)
+        self._last_frame.fill(0)
+        self._head = 0
+        self.frame_count = 0
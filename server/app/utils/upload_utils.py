@@ -0,0 +1,138 @@
+import os
+import json
+import shutil
+import tempfile
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from ..exceptions import ValidationError, PayloadTooLargeError
+
+# 由暫存檔複製時每次讀取的大小
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# 影片上傳大小上限（MB）
+MAX_VIDEO_UPLOAD_BYTES = int(os.getenv("MAX_VIDEO_UPLOAD_MB", 200)) * 1024 * 1024
+# 整個請求 body 的上限：影片上限再加上 multipart 邊界與其他表單欄位的餘裕
+MAX_REQUEST_BODY_BYTES = MAX_VIDEO_UPLOAD_BYTES + 1024 * 1024
+
+# MP4 (ISO BMFF) 檔案開頭常見的 box 類型
+MP4_LEADING_BOXES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide"}
+
+def is_mp4_header(head: bytes) -> bool:
+    """
+    檢查檔案開頭是否為 MP4 box：前 4 bytes 為 box 大小，接著 4 bytes 為 box 類型。
+    """
+    if len(head) < 8:
+        return False
+    box_size = int.from_bytes(head[:4], "big")
+    return head[4:8] in MP4_LEADING_BOXES and (box_size == 1 or box_size >= 8)
+
+async def save_upload_file(
+    upload: UploadFile,
+    dest_dir: str,
+    filename: str,
+    max_bytes: int = MAX_VIDEO_UPLOAD_BYTES
+) -> str:
+    """
+    將上傳的 MP4 存到 dest_dir/filename，不將整個檔案讀入記憶體。
+    Starlette 解析表單時已把檔案暫存在 SpooledTemporaryFile（較大時為磁碟上的匿名暫存檔，無法直接改名），
+    這裡先檢查大小與檔頭，通過後才複製到同資料夾的暫存檔，完成後以 os.replace 原子性地改名。
+    整個請求 body 的大小上限由 BodySizeLimitMiddleware 在暫存之前檢查。
+
+    :return: 儲存後的檔案路徑
+    :raises ValidationError: 不是 MP4 或為空檔案
+    :raises PayloadTooLargeError: 超過大小上限
+    """
+    source = upload.file
+
+    def inspect():
+        source.seek(0, os.SEEK_END)
+        size = source.tell()
+        source.seek(0)
+        head = source.read(8)
+        source.seek(0)
+        return size, head
+
+    size, head = await run_in_threadpool(inspect)
+    if size == 0:
+        raise ValidationError("上傳的影片為空檔案")
+    if size > max_bytes:
+        raise PayloadTooLargeError(f"影片大小超過上限 {max_bytes // (1024 * 1024)} MB")
+    if not is_mp4_header(head):
+        raise ValidationError("檔案內容不是有效的 MP4 影片")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    save_path = os.path.join(dest_dir, filename)
+    fd, part_path = tempfile.mkstemp(prefix=f".{filename}.", suffix=".part", dir=dest_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            await run_in_threadpool(shutil.copyfileobj, source, f, UPLOAD_CHUNK_SIZE)
+        # mkstemp 建立的檔案權限為 0600，改為一般檔案權限
+        os.chmod(part_path, 0o644)
+        os.replace(part_path, save_path)
+        return save_path
+    except BaseException:
+        if os.path.exists(part_path):
+            os.unlink(part_path)
+        raise
+
+class BodySizeLimitMiddleware:
+    """
+    在 Starlette 解析表單（並將上傳檔案暫存到磁碟）之前限制請求 body 大小。
+    Content-Length 超過上限時直接回應 413；未提供 Content-Length（chunked）時邊接收邊計算，
+    超過上限即中止讀取並回應 413，不會先把整個 body 寫進暫存檔。
+    save_upload_file 仍會依單一檔案的上限再檢查一次。
+    """
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BODY_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def receive_wrapper():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise PayloadTooLargeError(f"請求大小超過上限 {self.max_bytes // (1024 * 1024)} MB")
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            # 超過上限後由 middleware 回應 413，忽略路由對解析失敗產生的回應
+            if exceeded and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            if not exceeded or response_started:
+                raise
+        if exceeded and not response_started:
+            await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps(
+            {"detail": f"請求大小超過上限 {self.max_bytes // (1024 * 1024)} MB"}, ensure_ascii=False
+        ).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,105 @@
+"""
+get_contact_relations 查詢比較：逐筆查使用者與角色 (3 + 2N) 與單一 JOIN 查詢。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_contact_relations [--contacts 10 50 200] [--db-latency-ms 1]
+
+以固定延遲模擬資料庫往返，回報查詢次數與耗時。
+"""
+import time
+import asyncio
+import argparse
+
+from app.dao.emergency_contacts_dao import select_contacts_by_user_id, select_contact_relations
+from app.dao.users_dao import select_user_by_id
+from app.dao.role_dao import select_role_name_by_id
+from app.exceptions import NotFoundError
+from benchmarks.fake_db import FakeConnection
+
+ELDER_ID = 1
+ROLES = {1: "長者", 2: "照護者", 3: "家屬"}
+
+def make_handler(contact_count: int):
+    users = {
+        uid: {"user_id": uid, "name": f"user{uid}", "phone": f"09{uid:08d}",
+              "role_id": 1 if uid == ELDER_ID else 2 + uid % 2, "line_id": f"U{uid}"}
+        for uid in range(1, contact_count + 2)
+    }
+    # 一半的關係由長者建立，一半由聯絡人建立
+    relations = [
+        {"user_id": ELDER_ID, "contact_id": uid, "priority": uid, "relationship": "家人"} if uid % 2
+        else {"user_id": uid, "contact_id": ELDER_ID, "priority": uid, "relationship": "照護"}
+        for uid in range(2, contact_count + 2)
+    ]
+
+    def other(rel):
+        return rel["contact_id"] if rel["user_id"] == ELDER_ID else rel["user_id"]
+
+    def handler(query, args):
+        if query.startswith("SELECT * FROM emergency_contacts WHERE user_id"):
+            return [r for r in relations if r["user_id"] == args[0]]
+        if query.startswith("SELECT * FROM emergency_contacts WHERE contact_id"):
+            return [r for r in relations if r["contact_id"] == args[0]]
+        if query.startswith("SELECT * FROM users WHERE user_id"):
+            return [users[args[0]]] if args[0] in users else []
+        if query.startswith("SELECT role_name FROM role"):
+            return [{"role_name": ROLES[args[0]]}]
+        if "UNION ALL" in query:
+            role_id = args[1] if len(args) == 5 else None
+            rows = []
+            for rel in relations:
+                user = users[other(rel)]
+                if role_id is None or user["role_id"] == role_id:
+                    rows.append({**user, "role_name": ROLES[user["role_id"]],
+                                 "priority": rel["priority"], "relationship": rel["relationship"]})
+            return rows
+        return []
+    return handler
+
+async def legacy(conn, role):
+    """舊版流程（兩次關係查詢 + 每位聯絡人查使用者與角色）"""
+    try:
+        contacts_as_user = list(await select_contacts_by_user_id(conn, ELDER_ID))
+    except NotFoundError:
+        contacts_as_user = []
+    async with conn.cursor() as cursor:
+        await cursor.execute("SELECT * FROM emergency_contacts WHERE contact_id = %s", (ELDER_ID,))
+        contacts_as_contact = list(await cursor.fetchall())
+    result = []
+    for c in contacts_as_user + contacts_as_contact:
+        other_id = c["contact_id"] if c["user_id"] == ELDER_ID else c["user_id"]
+        other_user = await select_user_by_id(conn, other_id)
+        role_name = await select_role_name_by_id(conn, other_user["role_id"])
+        result.append({**other_user, "role_name": role_name,
+                       "priority": c["priority"], "relationship": c["relationship"]})
+    if role is not None:
+        result = [c for c in result if c["role_id"] == role]
+    return result
+
+async def joined(conn, role):
+    return await select_contact_relations(conn, ELDER_ID, role)
+
+async def measure(func, contact_count, role, latency):
+    conn = FakeConnection(make_handler(contact_count), latency)
+    start = time.perf_counter()
+    rows = await func(conn, role)
+    return conn.query_count, (time.perf_counter() - start) * 1000, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="照護關係查詢比較")
+    parser.add_argument("--contacts", type=int, nargs="+", default=[10, 50, 200], help="聯絡人數量")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="模擬的單次查詢延遲")
+    args = parser.parse_args()
+    latency = args.db_latency_ms / 1000
+
+    print(f"{'contacts':>8} {'role':>5} {'old queries':>12} {'old ms':>8} {'new queries':>12} {'new ms':>8}")
+    for contact_count in args.contacts:
+        for role in (None, 2):
+            old_q, old_ms, old_rows = asyncio.run(measure(legacy, contact_count, role, latency))
+            new_q, new_ms, new_rows = asyncio.run(measure(joined, contact_count, role, latency))
+            key = lambda r: r["user_id"]
+            assert sorted(map(key, old_rows)) == sorted(map(key, new_rows))
+            print(f"{contact_count:>8} {str(role):>5} {old_q:>12} {old_ms:>8.1f} {new_q:>12} {new_ms:>8.1f}")
+
+if __name__ == "__main__":
+    main()
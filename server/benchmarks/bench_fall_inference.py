@@ -0,0 +1,80 @@
+"""
+跌倒偵測推論引擎吞吐量測試（CPU）。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_fall_inference path/to/videos [--repeat 3] [--stride 10]
+
+輸出每支影片的幀數與耗時，最後彙總 videos/min 與 frames/s。
+"""
+import os
+import sys
+import time
+import argparse
+
+from app.fall_model import FallModel
+from app.service.fall_inference_service import score_video, INFERENCE_STRIDE, PREDICT_BATCH_SIZE
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov")
+
+def collect_videos(paths):
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            videos.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.lower().endswith(VIDEO_EXTENSIONS)
+            )
+        else:
+            videos.append(path)
+    return videos
+
+def main():
+    parser = argparse.ArgumentParser(description="跌倒偵測推論吞吐量測試")
+    parser.add_argument("paths", nargs="+", help="影片檔或影片資料夾")
+    parser.add_argument("--repeat", type=int, default=1, help="重複執行次數")
+    parser.add_argument("--stride", type=int, default=INFERENCE_STRIDE, help="滑動視窗步距（幀）")
+    parser.add_argument("--batch-size", type=int, default=PREDICT_BATCH_SIZE, help="每次 predict 的視窗數")
+    args = parser.parse_args()
+
+    videos = collect_videos(args.paths)
+    if not videos:
+        sys.exit("找不到任何影片")
+
+    load_start = time.perf_counter()
+    FallModel.init_model()
+    print(f"model load      : {time.perf_counter() - load_start:.2f} s")
+    model, scaler = FallModel.get()
+    time_steps = FallModel.time_steps()
+
+    # 先跑一次讓 TensorFlow 完成 graph 建置，避免計入冷啟動
+    score_video(videos[0], model, scaler, time_steps, args.stride, args.batch_size)
+
+    total_frames = 0
+    total_windows = 0
+    total_inference = 0.0
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for video_path in videos:
+            stats = score_video(video_path, model, scaler, time_steps, args.stride, args.batch_size)
+            total_frames += stats["frame_count"]
+            total_windows += stats["window_count"]
+            total_inference += stats["inference_seconds"]
+            print(
+                f"{os.path.basename(video_path):30s} frames={stats['frame_count']:5d} "
+                f"windows={stats['window_count']:4d} score={stats['max_score']:.3f} "
+                f"time={stats['elapsed_seconds']:.2f}s"
+            )
+    elapsed = time.perf_counter() - started
+
+    video_count = len(videos) * args.repeat
+    print("-" * 60)
+    print(f"videos          : {video_count}")
+    print(f"frames          : {total_frames}")
+    print(f"windows         : {total_windows}")
+    print(f"elapsed         : {elapsed:.2f} s (model {total_inference:.2f} s)")
+    print(f"videos/min      : {video_count / elapsed * 60:.2f}")
+    print(f"frames/s        : {total_frames / elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+跌倒模型推論引擎比較：keras / onnx / tflite 的啟動時間、記憶體、每視窗延遲與數值一致性。
+
+用法（於 server/ 目錄下執行，需先以 python -m tools.export_fall_model 匯出模型）：
+    python -m benchmarks.bench_fall_runtime [--runtimes keras onnx tflite] [--iterations 200]
+
+每個 runtime 在獨立的子行程中量測，避免彼此已載入的函式庫影響結果：
+- load：匯入推論函式庫 + 載入模型與 scaler 的時間
+- RSS：載入前後的常駐記憶體
+- latency：batch 1 與 batch 32 的單次 predict 延遲（p50 / p99），以及換算的每視窗耗時
+- parity：與 keras 輸出的最大絕對誤差
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+
+RUNTIMES = ("keras", "onnx", "tflite")
+BATCH_SIZES = (1, 32)
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run_child(runtime: str, iterations: int, output: str):
+    from app.fall_model import load_fall_model
+    from app.utils.pose_normalize import FEATURE_DIM
+
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    model, _ = load_fall_model(runtime)
+    load_seconds = time.perf_counter() - start
+    time_steps = int(model.input_shape[1])
+
+    rng = np.random.default_rng(0)
+    result = {"runtime": runtime, "load": load_seconds, "rss_before": rss_before, "latency": {}}
+    for batch in BATCH_SIZES:
+        x = rng.random((batch, time_steps, FEATURE_DIM), dtype=np.float32)
+        # 第一次呼叫包含 graph 建置 / tensor 配置，不列入統計
+        first = time.perf_counter()
+        model.predict(x, verbose=0)
+        first = time.perf_counter() - first
+        samples = []
+        for _ in range(iterations):
+            t = time.perf_counter()
+            model.predict(x, verbose=0)
+            samples.append(time.perf_counter() - t)
+        samples = np.array(samples) * 1000
+        result["latency"][str(batch)] = {
+            "first": first * 1000,
+            "p50": float(np.percentile(samples, 50)),
+            "p99": float(np.percentile(samples, 99)),
+        }
+    result["rss_after"] = rss_mb()
+
+    parity_x = np.random.default_rng(1).random((64, time_steps, FEATURE_DIM), dtype=np.float32)
+    np.save(output + ".npy", np.asarray(model.predict(parity_x, verbose=0), dtype=np.float32))
+    with open(output + ".json", "w") as f:
+        json.dump(result, f)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runtimes", nargs="+", choices=RUNTIMES, default=list(RUNTIMES))
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--child", choices=RUNTIMES, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.iterations, args.output)
+        return
+
+    results, predictions = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for runtime in args.runtimes:
+            output = os.path.join(tmp, runtime)
+            env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="2")
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_fall_runtime", "--child", runtime,
+                 "--iterations", str(args.iterations), "--output", output],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+            )
+            if proc.returncode != 0:
+                print(f"{runtime:<7} ❌ 執行失敗：{proc.stderr.strip().splitlines()[-1:]}", file=sys.stderr)
+                continue
+            with open(output + ".json") as f:
+                results[runtime] = json.load(f)
+            predictions[runtime] = np.load(output + ".npy")
+
+    reference = predictions.get("keras")
+    for runtime, r in results.items():
+        b1, b32 = r["latency"]["1"], r["latency"]["32"]
+        parity = "n/a" if reference is None else f"{float(np.abs(predictions[runtime] - reference).max()):.2e}"
+        print(f"{runtime:<7} load={r['load']:6.2f}s  RSS +{r['rss_after'] - r['rss_before']:7.1f}MB "
+              f"(total {r['rss_after']:7.1f}MB) | batch1 p50={b1['p50']:7.2f}ms p99={b1['p99']:7.2f}ms "
+              f"| batch32 p50={b32['p50']:7.2f}ms ({b32['p50'] / 32:.3f}ms/window) | parity={parity}",
+              file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
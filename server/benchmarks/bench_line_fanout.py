@@ -0,0 +1,80 @@
+"""
+LINE 通知 fan-out 比較：每位收件者建立新 client 並逐一 push（舊寫法）與共用 client + multicast 批次送出。
+
+用法（於 server/ 目錄下執行，需安裝 uvicorn）：
+    python -m benchmarks.bench_line_fanout [--recipients 1000] [--latency-ms 20] [--error-rate 0.05]
+
+會在本機啟動模擬 LINE 伺服器，回報耗時、API 請求數與送達人數。
+"""
+import time
+import socket
+import asyncio
+import argparse
+import httpx
+import uvicorn
+
+from app.utils.line_client import LinePushClient, text_message
+from benchmarks.mock_line_server import create_mock_line_app
+
+MESSAGES = [text_message("⚠️ 注意！偵測到跌倒事件 ⚠️")]
+
+async def legacy_fan_out(base_url: str, recipients):
+    """原本 notify_line 的做法：每位收件者建立新的 AsyncClient，依序等待"""
+    sent, failed = [], []
+    for uid in recipients:
+        async with httpx.AsyncClient() as client:
+            response = await client.post(f"{base_url}/v2/bot/message/push",
+                                         json={"to": uid, "messages": MESSAGES})
+        (sent if response.status_code == 200 else failed).append(uid)
+    return sent, failed
+
+async def shared_fan_out(base_url: str, recipients):
+    client = LinePushClient(base_url=base_url, access_token="bench", retry_backoff=0.05)
+    await client.start()
+    try:
+        return await client.fan_out(recipients, MESSAGES)
+    finally:
+        await client.close()
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def run_case(name, fan_out, app, base_url, recipients):
+    app.state.stats.update(requests=0, errors=0, delivered=[])
+    start = time.perf_counter()
+    sent, failed = await fan_out(base_url, recipients)
+    elapsed = time.perf_counter() - start
+    stats = app.state.stats
+    print(f"{name:<22} {elapsed:>8.2f}s  requests={stats['requests']:<5} errors={stats['errors']:<4} "
+          f"sent={len(sent):<5} failed={len(failed):<4} delivered={len(set(stats['delivered']))}")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--recipients", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--skip-legacy", action="store_true", help="略過逐一 push 的舊寫法")
+    args = parser.parse_args()
+
+    app = create_mock_line_app(args.latency_ms, args.error_rate)
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}"
+    recipients = [f"U{i:032x}" for i in range(args.recipients)]
+    print(f"recipients={args.recipients} latency={args.latency_ms}ms error_rate={args.error_rate}")
+    try:
+        if not args.skip_legacy:
+            await run_case("legacy push (serial)", legacy_fan_out, app, base_url, recipients)
+        await run_case("shared multicast", shared_fan_out, app, base_url, recipients)
+    finally:
+        server.should_exit = True
+        await server_task
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""
+log 對 event loop 延遲的影響：直接 print 到 stdout 與 QueueHandler + 背景執行緒寫出。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_logging_latency [--seconds 3] [--producers 20] [--reader-kbps 256]
+
+stdout 接到一個讀取速度受限的子程序（模擬容器的 log driver 或緩慢的終端機），
+多個 coroutine 以約 1ms 間隔寫 log，同時量測 event loop 的排程延遲；
+sampled 模式另外以 LogSampler 對每個使用者取樣。
+"""
+import io
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import subprocess
+import numpy as np
+
+from app.utils.logging_utils import setup_logging, shutdown_logging, LogSampler
+
+# 每讀 4KB 就暫停，限制讀取速度
+READER = """
+import sys, time
+chunk = 4096
+delay = chunk / ({kbps} * 1024)
+while sys.stdin.buffer.read1(chunk):
+    time.sleep(delay)
+"""
+
+LINE = "骨架幀處理完成 user_id=%s frame=%d score=%.4f"
+
+def start_reader(kbps: int):
+    proc = subprocess.Popen([sys.executable, "-c", READER.format(kbps=kbps)], stdin=subprocess.PIPE)
+    # 與 start.sh 的 PYTHONUNBUFFERED=1 相同：每行都直接寫出
+    stream = io.TextIOWrapper(proc.stdin, encoding="utf-8", line_buffering=True, write_through=True)
+    return proc, stream
+
+async def probe(lags, stop_at):
+    interval = 0.005
+    while time.perf_counter() < stop_at:
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - expected)
+
+async def producer(user_id, emit, stop_at, counter):
+    frame = 0
+    while time.perf_counter() < stop_at:
+        emit(user_id, frame)
+        counter[0] += 1
+        frame += 1
+        await asyncio.sleep(0.001)
+
+async def run(mode: str, args) -> dict:
+    proc, stream = start_reader(args.reader_kbps)
+    if mode == "print":
+        def emit(user_id, frame):
+            print(LINE % (user_id, frame, 0.1234), file=stream)
+    elif mode == "queue":
+        setup_logging(stream=stream)
+        logger = logging.getLogger("app.bench")
+
+        def emit(user_id, frame):
+            logger.info(LINE, user_id, frame, 0.1234)
+    else:
+        # 與 ws_pose_router 相同：高頻率的 log 依使用者取樣
+        setup_logging(stream=stream)
+        logger = logging.getLogger("app.bench")
+        sampler = LogSampler(interval=0.1)
+
+        def emit(user_id, frame):
+            suppressed = sampler.allow(user_id)
+            if suppressed is not None:
+                logger.info(LINE, user_id, frame, 0.1234, extra={"suppressed": suppressed})
+
+    lags, counter = [], [0]
+    stop_at = time.perf_counter() + args.seconds
+    await asyncio.gather(
+        probe(lags, stop_at),
+        *(producer(f"user{i}", emit, stop_at, counter) for i in range(args.producers))
+    )
+    drain_start = time.perf_counter()
+    if mode != "print":
+        shutdown_logging()
+    stream.close()
+    proc.wait()
+    lags_ms = np.array(lags) * 1000
+    return {
+        "lines": counter[0],
+        "p50": np.percentile(lags_ms, 50),
+        "p99": np.percentile(lags_ms, 99),
+        "max": lags_ms.max(),
+        "drain": time.perf_counter() - drain_start,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3)
+    parser.add_argument("--producers", type=int, default=20)
+    parser.add_argument("--reader-kbps", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"producers={args.producers} seconds={args.seconds} reader={args.reader_kbps}KB/s", file=sys.stderr)
+    for mode in ("print", "queue", "sampled"):
+        r = await run(mode, args)
+        print(f"{mode:<7} events={r['lines']:<7} loop lag p50={r['p50']:7.2f}ms p99={r['p99']:8.2f}ms "
+              f"max={r['max']:8.2f}ms  (drain after run {r['drain']:.2f}s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""
+normalize_skeleton_data 向量化版本與舊版（Python list 實作）的速度比較。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_normalize [--repeat 5]
+
+對 T=60/120、batch 1~256 分別量測每批耗時與加速倍數。
+"""
+import time
+import argparse
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from app.utils.pose_normalize import FEATURE_DIM, NUM_LANDMARKS, prepare_model_inputs
+
+BATCH_SIZES = (1, 4, 16, 64, 256)
+TIME_STEPS = (60, 120)
+
+def legacy_prepare_model_input(skeleton_data, scaler, time_steps=120):
+    """舊版實作（逐幀 list comprehension + np.hstack），僅供比較用。"""
+    if len(skeleton_data) < time_steps:
+        padding = [[(0, 0, 0)] * 33] * (time_steps - len(skeleton_data))
+        skeleton_data = padding + skeleton_data
+    else:
+        skeleton_data = skeleton_data[-time_steps:]
+
+    accel = []
+    for i in range(1, len(skeleton_data)):
+        frame_accel = [((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)**0.5
+                       for p1, p2 in zip(skeleton_data[i - 1], skeleton_data[i])]
+        accel.append(frame_accel)
+
+    if len(accel) < time_steps:
+        accel = [[0] * 33] * (time_steps - len(accel)) + accel
+
+    combo = []
+    for i in range(time_steps):
+        skeleton_frame = np.array(skeleton_data[i]).flatten()
+        accel_frame = np.array(accel[i])
+        combo.append(np.hstack((skeleton_frame, accel_frame)))
+
+    combo = np.array(combo).reshape(1, time_steps, -1)
+    flat = combo.reshape(1, -1)
+    scaled = scaler.transform(flat)
+    return scaled.reshape(1, time_steps, -1)
+
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="normalize_skeleton_data 速度比較")
+    parser.add_argument("--repeat", type=int, default=5, help="每組取最佳的重複次數")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'T':>4} {'batch':>6} {'legacy ms':>12} {'vector ms':>12} {'speedup':>9}")
+    for time_steps in TIME_STEPS:
+        scaler = MinMaxScaler().fit(rng.random((64, time_steps * FEATURE_DIM)))
+        for batch_size in BATCH_SIZES:
+            skeletons = rng.random((batch_size, time_steps, NUM_LANDMARKS, 3), dtype=np.float32)
+            as_lists = [[[tuple(p) for p in frame] for frame in video] for video in skeletons]
+            out = np.empty((batch_size, time_steps, FEATURE_DIM), dtype=np.float32)
+            work = np.empty((batch_size, time_steps - 1, NUM_LANDMARKS, 2), dtype=np.float32)
+
+            legacy = best_of(
+                lambda: [legacy_prepare_model_input(video, scaler, time_steps) for video in as_lists],
+                args.repeat
+            )
+            vector = best_of(lambda: prepare_model_inputs(skeletons, scaler, out=out, work=work), args.repeat)
+
+            expected = np.concatenate([legacy_prepare_model_input(v, scaler, time_steps) for v in as_lists[:1]])
+            assert np.allclose(out[:1], expected, atol=1e-5), "向量化結果與舊版不一致"
+            print(f"{time_steps:>4} {batch_size:>6} {legacy * 1000:>12.3f} {vector * 1000:>12.3f} {legacy / vector:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
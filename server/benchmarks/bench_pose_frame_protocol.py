@@ -0,0 +1,61 @@
+"""
+/ws/pose 骨架幀格式比較：JSON 文字與二進位（float16 / float32）。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_pose_frame_protocol [--frames 10000]
+
+輸出每幀的傳輸大小、解碼耗時，以及 30 FPS 單一鏡頭的每秒頻寬。
+"""
+import json
+import time
+import argparse
+import numpy as np
+
+from app.utils.pose_frame_protocol import encode_pose_frame, decode_pose_frame
+
+FPS = 30
+
+def bench(decode, payloads):
+    start = time.perf_counter()
+    for payload in payloads:
+        decode(payload)
+    return (time.perf_counter() - start) / len(payloads)
+
+def decode_json(payload):
+    return np.asarray(json.loads(payload)["keypoints"], dtype=np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description="骨架幀 JSON 與二進位格式比較")
+    parser.add_argument("--frames", type=int, default=10000, help="測試幀數")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = rng.random((args.frames, 33, 3), dtype=np.float32)
+
+    formats = {
+        "json": (
+            [json.dumps({"seq": i, "timestamp": time.time(), "keypoints": f.tolist()}) for i, f in enumerate(frames)],
+            decode_json,
+        ),
+        "binary float32": (
+            [encode_pose_frame(f, i, time.time(), "float32") for i, f in enumerate(frames)],
+            lambda payload: decode_pose_frame(payload)[1],
+        ),
+        "binary float16": (
+            [encode_pose_frame(f, i, time.time(), "float16") for i, f in enumerate(frames)],
+            lambda payload: decode_pose_frame(payload)[1],
+        ),
+    }
+
+    print(f"{'format':16s} {'bytes/frame':>12s} {'KB/s @30fps':>12s} {'decode us':>10s}")
+    for name, (payloads, decode) in formats.items():
+        size = sum(len(p) for p in payloads) / len(payloads)
+        per_frame = bench(decode, payloads)
+        print(f"{name:16s} {size:>12.0f} {size * FPS / 1024:>12.1f} {per_frame * 1e6:>10.2f}")
+
+    # float16 量化誤差（正規化座標 0~1）
+    decoded = np.stack([decode_pose_frame(p)[1] for p in formats["binary float16"][0]]).astype(np.float32)
+    print(f"float16 max abs error: {np.abs(decoded - frames).max():.2e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+/fall_video_file 拖曳播放情境測試：多位使用者同時以 Range 隨機跳轉讀取影片。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_range_playback [--clients 20] [--seeks 50] [--db-latency-ms 2]
+
+比較 record_id → 檔名查詢「每次查資料庫」與「經過 TTLCache」兩種情況的
+每秒請求數、延遲百分位數與資料庫查詢次數（資料庫以固定延遲模擬）。
+"""
+import os
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import httpx
+import numpy as np
+from fastapi import FastAPI, Request
+
+from app.utils.cache_utils import TTLCache
+from app.utils.conditional_response import cached_file_response
+
+RANGE_BYTES = 256 * 1024
+
+def build_app(video_dir: str, filenames: dict, db_latency: float, cache: TTLCache, counter: dict):
+    app = FastAPI()
+
+    async def lookup(record_id: int) -> str:
+        if cache is not None:
+            cached = cache.get(record_id)
+            if cached is not None:
+                return cached
+        counter["db_queries"] += 1
+        await asyncio.sleep(db_latency)
+        if cache is not None:
+            cache.set(record_id, filenames[record_id])
+        return filenames[record_id]
+
+    @app.get("/fall_video_file")
+    async def fall_video_file(request: Request, record_id: int):
+        filename = await lookup(record_id)
+        return cached_file_response(request, os.path.join(video_dir, filename), "video/mp4", filename)
+
+    return app
+
+async def run_clients(app, record_ids, size: int, clients: int, seeks: int):
+    latencies = []
+
+    async def client(seed: int):
+        rng = random.Random(seed)
+        record_id = rng.choice(record_ids)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+            for _ in range(seeks):
+                start = rng.randrange(0, size - RANGE_BYTES)
+                begin = time.perf_counter()
+                response = await http.get(
+                    "/fall_video_file",
+                    params={"record_id": record_id},
+                    headers={"Range": f"bytes={start}-{start + RANGE_BYTES - 1}"}
+                )
+                assert response.status_code == 206 and len(response.content) == RANGE_BYTES
+                latencies.append(time.perf_counter() - begin)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return time.perf_counter() - started, np.array(latencies) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Range 拖曳播放壓力測試")
+    parser.add_argument("--clients", type=int, default=20, help="同時播放的使用者數")
+    parser.add_argument("--seeks", type=int, default=50, help="每位使用者跳轉次數")
+    parser.add_argument("--videos", type=int, default=5, help="影片數量")
+    parser.add_argument("--size-mb", type=int, default=32, help="每支影片大小（MB）")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="模擬的資料庫查詢延遲")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as video_dir:
+        filenames = {}
+        for record_id in range(1, args.videos + 1):
+            filenames[record_id] = f"{record_id}.mp4"
+            with open(os.path.join(video_dir, filenames[record_id]), "wb") as f:
+                f.write(os.urandom(args.size_mb * 1024 * 1024))
+        size = args.size_mb * 1024 * 1024
+
+        print(f"{'lookup':8s} {'req/s':>9s} {'p50 ms':>8s} {'p99 ms':>8s} {'db queries':>11s}")
+        for name, cache in (("db", None), ("cached", TTLCache(maxsize=1024, ttl=3600))):
+            counter = {"db_queries": 0}
+            app = build_app(video_dir, filenames, args.db_latency_ms / 1000, cache, counter)
+            elapsed, latencies = asyncio.run(
+                run_clients(app, list(filenames), size, args.clients, args.seeks)
+            )
+            total = args.clients * args.seeks
+            print(
+                f"{name:8s} {total / elapsed:>9.1f} {np.percentile(latencies, 50):>8.2f} "
+                f"{np.percentile(latencies, 99):>8.2f} {counter['db_queries']:>11d}"
+            )
+
+if __name__ == "__main__":
+    main()
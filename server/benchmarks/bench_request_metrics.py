@@ -0,0 +1,84 @@
+"""
+指標記錄的額外開銷：同一個 FastAPI app 加上 / 不加 RequestMetricsMiddleware，
+以及 DAO cursor 經過 / 不經過計時代理。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_request_metrics [--requests 20000] [--rounds 3]
+
+直接呼叫 ASGI app（不經過網路），回報每個請求的平均耗時與差值（微秒）。
+"""
+import time
+import asyncio
+import argparse
+from fastapi import FastAPI
+
+from app.db import _TimedConnection
+from app.utils.request_metrics import RequestMetricsMiddleware
+from benchmarks.fake_db import FakeConnection
+
+def make_app(with_metrics: bool) -> FastAPI:
+    app = FastAPI()
+    if with_metrics:
+        app.add_middleware(RequestMetricsMiddleware)
+
+    @app.get("/fall_video_data/{record_id}")
+    async def endpoint(record_id: int):
+        return {"record_id": record_id}
+
+    return app
+
+async def call(app, path: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+async def time_requests(app, count: int) -> float:
+    for i in range(200):
+        await call(app, f"/fall_video_data/{i}")
+    start = time.perf_counter()
+    for i in range(count):
+        await call(app, f"/fall_video_data/{i}")
+    return (time.perf_counter() - start) / count * 1e6
+
+async def select_one(conn):
+    async with conn.cursor() as cursor:
+        await cursor.execute("SELECT 1")
+        return await cursor.fetchone()
+
+async def time_queries(conn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        await select_one(conn)
+    return (time.perf_counter() - start) / count * 1e6
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    # 交替執行數輪並取最佳值，降低其他程序干擾造成的誤差
+    plain_app, measured_app = make_app(False), make_app(True)
+    plain = measured = float("inf")
+    for _ in range(args.rounds):
+        plain = min(plain, await time_requests(plain_app, args.requests))
+        measured = min(measured, await time_requests(measured_app, args.requests))
+    print(f"HTTP request    plain={plain:7.1f}us  with metrics={measured:7.1f}us  overhead={measured - plain:6.1f}us")
+
+    conn = FakeConnection(lambda query, args: [{"1": 1}], latency=0)
+    plain = await time_queries(conn, args.requests)
+    measured = await time_queries(_TimedConnection(conn), args.requests)
+    print(f"DAO query       plain={plain:7.1f}us  with metrics={measured:7.1f}us  overhead={measured - plain:6.1f}us")
+
+if __name__ == "__main__":
+    asyncio.run(main())
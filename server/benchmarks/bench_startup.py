@@ -0,0 +1,100 @@
+"""
+server 啟動時間：lifespan 等待模型載入（舊行為）與背景 warm-up 的比較。
+
+用法（於 server/ 目錄下執行，需要 models/ 下的模型檔）：
+    python -m benchmarks.bench_startup [--with-db] [--repeat 3]
+
+每次在新的子行程中量測：
+- import：匯入 app 的時間，以及匯入後已載入的重量級套件
+- serving：lifespan 進入到 yield（開始接受請求）的時間
+- ready：模型 warm-up 完成（/ready 回傳 200）的時間
+blocking 模式在 yield 前等待 warm-up 完成，等同原本在 lifespan 中同步載入模型。
+預設不連線資料庫（init_pool / RoleCache.load 以空操作取代），--with-db 時使用 .env 的設定。
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+HEAVY_MODULES = ("tensorflow", "keras", "cv2", "mediapipe", "sklearn", "openai", "onnxruntime")
+MODES = ("blocking", "deferred")
+
+async def run_child(mode: str, with_db: bool) -> dict:
+    started = time.perf_counter()
+    import app
+    from app.db import Database
+    from app.service.model_warmup import model_warmup
+    from app.service.role_id_service import RoleCache
+    imported = time.perf_counter()
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    if not with_db:
+        async def noop(*args, **kwargs):
+            return None
+        Database.init_pool = noop
+        Database.close_pool = noop
+        RoleCache.load = noop
+
+    application = app.create_app()
+    lifespan = application.router.lifespan_context(application)
+    entered = time.perf_counter()
+    await lifespan.__aenter__()
+    if mode == "blocking":
+        await model_warmup.wait_ready()
+    serving = time.perf_counter()
+    loaded_at_serving = [name for name in HEAVY_MODULES if name in sys.modules]
+    await model_warmup.wait_ready()
+    ready = time.perf_counter()
+    status = model_warmup.status()
+    await lifespan.__aexit__(None, None, None)
+    return {
+        "import": imported - started,
+        "serving": serving - entered,
+        "ready": ready - entered,
+        "loaded_at_import": loaded,
+        "loaded_at_serving": loaded_at_serving,
+        "error": status["error"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--with-db", action="store_true")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = asyncio.run(run_child(args.child, args.with_db))
+        print(json.dumps(result))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            NOTIFY_QUEUE_PATH=os.path.join(tmp, "queue.sqlite3"),
+            NEWS_AUDIO_BACKEND="stub",
+            LOG_LEVEL="WARNING",
+            TF_CPP_MIN_LOG_LEVEL="2",
+        )
+        for mode in MODES:
+            runs = []
+            for _ in range(args.repeat):
+                command = [sys.executable, "-m", "benchmarks.bench_startup", "--child", mode]
+                if args.with_db:
+                    command.append("--with-db")
+                proc = subprocess.run(command, env=env, capture_output=True, text=True)
+                if proc.returncode != 0:
+                    sys.exit(f"{mode} 執行失敗：\n{proc.stderr}")
+                runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+            best = min(runs, key=lambda r: r["serving"])
+            print(f"{mode:<9} import={min(r['import'] for r in runs):6.2f}s "
+                  f"serving={best['serving']:6.2f}s ready={min(r['ready'] for r in runs):6.2f}s "
+                  f"| loaded at import={best['loaded_at_import'] or '-'} at serving={best['loaded_at_serving'] or '-'}"
+                  + (f" | warm-up error: {best['error']}" if best["error"] else ""), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+影片上傳的記憶體用量比較：整檔 read() 與分段串流寫入。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_upload_memory [--sizes 16 64 256]
+
+每次上傳在獨立的子程序中執行，回報該次上傳使 peak RSS 增加多少 MB。
+"""
+import os
+import asyncio
+import argparse
+import resource
+import tempfile
+import multiprocessing
+from fastapi import UploadFile
+
+from app.utils.upload_utils import save_upload_file
+
+MP4_HEADER = (24).to_bytes(4, "big") + b"ftypisom" + b"\x00" * 12
+
+def make_source(path: str, size_mb: int):
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        f.write(MP4_HEADER)
+        for _ in range(size_mb):
+            f.write(block)
+
+def peak_rss_mb() -> float:
+    # Linux 的 ru_maxrss 單位為 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+async def upload_read_all(upload: UploadFile, dest_dir: str):
+    with open(os.path.join(dest_dir, "read_all.mp4"), "wb") as f:
+        f.write(await upload.read())
+
+async def upload_streaming(upload: UploadFile, dest_dir: str):
+    await save_upload_file(upload, dest_dir, "streaming.mp4", max_bytes=1 << 40)
+
+def run_upload(method: str, source: str, dest_dir: str, result):
+    baseline = peak_rss_mb()
+    with open(source, "rb") as f:
+        upload = UploadFile(file=f, filename="video.mp4")
+        func = upload_read_all if method == "read_all" else upload_streaming
+        asyncio.run(func(upload, dest_dir))
+    result.put(peak_rss_mb() - baseline)
+
+def measure(method: str, source: str, dest_dir: str) -> float:
+    ctx = multiprocessing.get_context("fork")
+    result = ctx.Queue()
+    process = ctx.Process(target=run_upload, args=(method, source, dest_dir, result))
+    process.start()
+    delta = result.get()
+    process.join()
+    return delta
+
+def main():
+    parser = argparse.ArgumentParser(description="影片上傳記憶體用量比較")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256], help="影片大小（MB）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'size MB':>8} {'read() +RSS MB':>16} {'stream +RSS MB':>16}")
+        for size_mb in args.sizes:
+            source = os.path.join(workdir, f"source_{size_mb}.mp4")
+            make_source(source, size_mb)
+            read_all = measure("read_all", source, workdir)
+            streaming = measure("streaming", source, workdir)
+            print(f"{size_mb:>8} {read_all:>16.1f} {streaming:>16.1f}")
+            os.unlink(source)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+get_video_filename_for_fall_event 的收藏狀態查詢：逐筆 (N+1) 與批次 IN (...) 比較。
+
+用法（於 server/ 目錄下執行）：
+    python -m benchmarks.bench_watchlist_lookup [--db-latency-ms 1]
+
+以固定延遲模擬資料庫往返，回報不同筆數下的查詢次數與耗時。
+"""
+import time
+import asyncio
+import argparse
+import datetime
+
+from app.dao.fall_events_dao import select_fall_event_records_by_user_and_time_range
+from app.dao.video_watchlist_dao import select_watchlist_entry_by_user_and_record, select_watchlisted_record_ids
+from app.exceptions import NotFoundError
+from benchmarks.fake_db import FakeConnection
+
+LIMITS = (5, 20, 100, 500)
+
+def make_handler(limit: int):
+    watchlisted = set(range(0, limit, 3))
+
+    def handler(query, args):
+        if query.startswith("SELECT record_id, user_id, detected_time"):
+            return [
+                {"record_id": i, "user_id": args[0], "detected_time": datetime.datetime.now(),
+                 "location": "客廳", "pose_before_fall": "走路中", "video_filename": f"{i}.mp4"}
+                for i in range(limit)
+            ]
+        if "IN (" in query:
+            return [{"record_id": r} for r in args[1:] if r in watchlisted]
+        if query.startswith("SELECT * FROM video_watchlist"):
+            return [{"user_id": args[0], "record_id": args[1]}] if args[1] in watchlisted else []
+        return []
+    return handler
+
+async def per_row(conn, limit):
+    rows = await select_fall_event_records_by_user_and_time_range(conn, 1, limit=limit)
+    for row in rows:
+        try:
+            row["in_watchlist"] = await select_watchlist_entry_by_user_and_record(conn, 2, row["record_id"]) is not None
+        except NotFoundError:
+            row["in_watchlist"] = False
+    return rows
+
+async def batched(conn, limit):
+    rows = await select_fall_event_records_by_user_and_time_range(conn, 1, limit=limit)
+    watchlisted = await select_watchlisted_record_ids(conn, 2, [row["record_id"] for row in rows])
+    for row in rows:
+        row["in_watchlist"] = row["record_id"] in watchlisted
+    return rows
+
+async def measure(func, limit, latency):
+    conn = FakeConnection(make_handler(limit), latency)
+    start = time.perf_counter()
+    rows = await func(conn, limit)
+    return conn.query_count, (time.perf_counter() - start) * 1000, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="觀看清單 N+1 與批次查詢比較")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="模擬的單次查詢延遲")
+    args = parser.parse_args()
+    latency = args.db_latency_ms / 1000
+
+    print(f"{'limit':>6} {'N+1 queries':>12} {'N+1 ms':>9} {'batch queries':>14} {'batch ms':>9}")
+    for limit in LIMITS:
+        old_queries, old_ms, old_rows = asyncio.run(measure(per_row, limit, latency))
+        new_queries, new_ms, new_rows = asyncio.run(measure(batched, limit, latency))
+        assert [r["in_watchlist"] for r in old_rows] == [r["in_watchlist"] for r in new_rows]
+        print(f"{limit:>6} {old_queries:>12} {old_ms:>9.1f} {new_queries:>14} {new_ms:>9.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+DAO 效能測試用的模擬連線：每次 execute 固定延遲（模擬網路往返），並記錄查詢次數。
+handler(query, args) 回傳該次查詢的資料列。
+"""
+import asyncio
+
+class FakeCursor:
+    def __init__(self, conn):
+        self._conn = conn
+        self._rows = []
+        self.rowcount = 0
+        self.lastrowid = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query, args=None):
+        self._conn.query_count += 1
+        await asyncio.sleep(self._conn.latency)
+        self._rows = list(self._conn.handler(" ".join(query.split()), args or ()))
+        self.rowcount = len(self._rows)
+
+    async def fetchall(self):
+        return self._rows
+
+    async def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    async def fetchmany(self, size=1):
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    async def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, handler, latency: float = 0.001):
+        self.handler = handler
+        self.latency = latency
+        self.query_count = 0
+
+    def cursor(self, *args):
+        return FakeCursor(self)
+
+    async def commit(self):
+        pass
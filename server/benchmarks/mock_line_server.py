@@ -0,0 +1,64 @@
+"""
+本機模擬的 LINE Messaging API（push / multicast），供 LinePushClient 測試與 benchmark 使用。
+
+單獨啟動（於 server/ 目錄下執行）：
+    python -m benchmarks.mock_line_server --port 8089 --latency-ms 20 --error-rate 0.05
+接著將 LINE_API_BASE 設為 http://127.0.0.1:8089 即可讓伺服器改送到這裡。
+"""
+import random
+import asyncio
+import argparse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+def create_mock_line_app(latency_ms: float = 20, error_rate: float = 0.0, retry_after: float = 0.05,
+                         seed: int = 0) -> FastAPI:
+    """
+    建立模擬 LINE API。error_rate 的比例會隨機回傳 429（附 Retry-After）或 500。
+    app.state.stats 記錄請求數、錯誤數與實際送達的收件者。
+    """
+    app = FastAPI()
+    rng = random.Random(seed)
+    app.state.stats = {"requests": 0, "errors": 0, "delivered": []}
+
+    def maybe_fail():
+        if rng.random() >= error_rate:
+            return None
+        app.state.stats["errors"] += 1
+        if rng.random() < 0.5:
+            return JSONResponse({"message": "Too Many Requests"}, status_code=429,
+                                headers={"Retry-After": str(retry_after)})
+        return JSONResponse({"message": "Internal Server Error"}, status_code=500)
+
+    async def handle(request: Request, recipients_of):
+        app.state.stats["requests"] += 1
+        await asyncio.sleep(latency_ms / 1000)
+        failure = maybe_fail()
+        if failure is not None:
+            return failure
+        payload = await request.json()
+        recipients = recipients_of(payload)
+        if not recipients or len(recipients) > 500 or not payload.get("messages"):
+            return JSONResponse({"message": "The request body has 1 error(s)"}, status_code=400)
+        app.state.stats["delivered"].extend(recipients)
+        return JSONResponse({})
+
+    @app.post("/v2/bot/message/push")
+    async def push(request: Request):
+        return await handle(request, lambda payload: [payload["to"]] if payload.get("to") else [])
+
+    @app.post("/v2/bot/message/multicast")
+    async def multicast(request: Request):
+        return await handle(request, lambda payload: payload.get("to") or [])
+
+    return app
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="模擬 LINE Messaging API")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    uvicorn.run(create_mock_line_app(args.latency_ms, args.error_rate), host="127.0.0.1", port=args.port)
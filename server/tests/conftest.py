@@ -0,0 +1,7 @@
+"""測試以 server/ 為工作目錄執行（與 run.py 相同），讓 app 套件可以被匯入"""
+import os
+import sys
+
+SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_ROOT not in sys.path:
+    sys.path.insert(0, SERVER_ROOT)
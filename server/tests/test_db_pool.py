@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from app import db
+from app.db import Database, pool_ping_failures
+
+class FakeConnection:
+    def __init__(self, idle: float, alive: bool = True):
+        self.last_usage = asyncio.get_event_loop().time() - idle
+        self.alive = alive
+        self.pings = 0
+        self.closed = False
+
+    async def ping(self, reconnect=True):
+        self.pings += 1
+        if not self.alive:
+            raise ConnectionError("MySQL server has gone away")
+
+    def close(self):
+        self.closed = True
+
+class FakePool:
+    """依序交出預先建立的連線，並記錄歸還的連線"""
+    def __init__(self, connections, maxsize=2):
+        self.connections = list(connections)
+        self.released = []
+        self.maxsize = maxsize
+
+    async def acquire(self):
+        return self.connections.pop(0)
+
+    def release(self, conn):
+        self.released.append(conn)
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(None)
+        return future
+
+@pytest.fixture
+def use_pool(monkeypatch):
+    monkeypatch.setattr(db, "DB_POOL_PING_IDLE", 30)
+
+    def use(pool):
+        monkeypatch.setattr(Database, "_pool", pool)
+        return pool
+
+    return use
+
+def test_recently_used_connection_is_not_pinged(use_pool):
+    async def main():
+        conn = FakeConnection(idle=1)
+        pool = use_pool(FakePool([conn]))
+        assert await Database.get_connection() is conn
+        assert conn.pings == 0 and pool.released == []
+
+    asyncio.run(main())
+
+def test_idle_connection_is_pinged_on_checkout(use_pool):
+    async def main():
+        conn = FakeConnection(idle=60)
+        use_pool(FakePool([conn]))
+        assert await Database.get_connection() is conn
+        assert conn.pings == 1 and not conn.closed
+
+    asyncio.run(main())
+
+def test_stale_connection_is_closed_and_replaced(use_pool):
+    async def main():
+        stale, fresh = FakeConnection(idle=60, alive=False), FakeConnection(idle=0)
+        pool = use_pool(FakePool([stale, fresh]))
+        failures = pool_ping_failures.value()
+        assert await Database.get_connection() is fresh
+        # 失效的連線先關閉再交還連線池，由連線池丟棄
+        assert stale.closed and pool.released == [stale]
+        assert pool_ping_failures.value() == failures + 1
+
+    asyncio.run(main())
+
+def test_gives_up_when_every_connection_is_stale(use_pool):
+    async def main():
+        pool = use_pool(FakePool([FakeConnection(idle=60, alive=False) for _ in range(3)], maxsize=2))
+        with pytest.raises(RuntimeError, match="healthy"):
+            await Database.get_connection()
+        assert len(pool.released) == 3
+
+    asyncio.run(main())
+
+def test_connection_context_releases_to_pool(use_pool):
+    async def main():
+        conn = FakeConnection(idle=0)
+        pool = use_pool(FakePool([conn]))
+        async with Database.connection():
+            assert pool.released == []
+        assert pool.released == [conn]
+
+    asyncio.run(main())
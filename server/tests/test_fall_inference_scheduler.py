@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+from app.service.fall_inference_scheduler import FallInferenceScheduler
+from app.utils.pose_normalize import FEATURE_DIM
+
+TIME_STEPS = 4
+
+class FakeModel:
+    """分數為視窗第一個值，並記錄每次 predict 的 batch 大小"""
+    def __init__(self, gate: threading.Event = None):
+        self.batches = []
+        self.gate = gate
+
+    def predict(self, x, verbose=0):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.batches.append(len(x))
+        return x[:, 0, :1].copy()
+
+def window(value: float) -> np.ndarray:
+    return np.full((TIME_STEPS, FEATURE_DIM), value, dtype=np.float32)
+
+def test_merges_concurrent_windows_into_batches():
+    async def main():
+        model = FakeModel()
+        scheduler = FallInferenceScheduler(max_batch_size=4, max_wait_ms=50)
+        await scheduler.start(model, TIME_STEPS)
+        scores = await asyncio.gather(*(scheduler.submit(window(i / 10)) for i in range(10)))
+        await scheduler.stop()
+        return model, scores
+
+    model, scores = asyncio.run(main())
+    assert scores == pytest.approx([i / 10 for i in range(10)])
+    assert sum(model.batches) == 10
+    assert max(model.batches) == 4 and len(model.batches) == 3
+
+def test_timeout_flushes_partial_batch():
+    async def main():
+        model = FakeModel()
+        scheduler = FallInferenceScheduler(max_batch_size=32, max_wait_ms=20)
+        await scheduler.start(model, TIME_STEPS)
+        score = await asyncio.wait_for(scheduler.submit(window(0.5)), timeout=2)
+        # 逾時後 getter 不會殘留在佇列上搶走下一個視窗
+        second = await asyncio.wait_for(scheduler.submit(window(0.25)), timeout=2)
+        await scheduler.stop()
+        return model, score, second
+
+    model, score, second = asyncio.run(main())
+    assert (score, second) == pytest.approx((0.5, 0.25))
+    assert model.batches == [1, 1]
+
+def test_stop_fails_pending_windows():
+    gate = threading.Event()
+
+    async def main():
+        scheduler = FallInferenceScheduler(max_batch_size=2, max_wait_ms=1000)
+        await scheduler.start(FakeModel(gate), TIME_STEPS)
+        # 第一批卡在 predict，第二批收集到一半，其餘留在佇列
+        tasks = [asyncio.create_task(scheduler.submit(window(i))) for i in range(5)]
+        await asyncio.sleep(0.1)
+        await scheduler.stop()
+        gate.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=2)
+
+    results = asyncio.run(main())
+    assert len(results) == 5
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+def test_submit_requires_running_scheduler():
+    with pytest.raises(RuntimeError):
+        asyncio.run(FallInferenceScheduler().submit(window(0)))
+
+def test_stop_while_collecting_fails_collected_windows():
+    async def main():
+        scheduler = FallInferenceScheduler(max_batch_size=8, max_wait_ms=5000)
+        await scheduler.start(FakeModel(), TIME_STEPS)
+        # 視窗已被取出放進收集中的批次，排程器正等待更多視窗
+        task = asyncio.create_task(scheduler.submit(window(1)))
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+        return await asyncio.wait_for(asyncio.gather(task, return_exceptions=True), timeout=2)
+
+    (result,) = asyncio.run(main())
+    assert isinstance(result, RuntimeError)
@@ -0,0 +1,51 @@
+"""OnnxFallModel 以一個小型 ONNX graph 測試（不需要 tensorflow）"""
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from onnx import TensorProto, helper, numpy_helper
+from app.fall_model import OnnxFallModel
+from app.utils.pose_normalize import FEATURE_DIM
+
+TIME_STEPS = 16
+
+def reference_predict(x, weights):
+    """graph 的 numpy 版本：時間軸取平均後接 Dense(1, sigmoid)"""
+    return 1 / (1 + np.exp(-(x.mean(axis=1) @ weights)))
+
+@pytest.fixture(scope="module")
+def onnx_model(tmp_path_factory):
+    weights = np.random.default_rng(0).normal(size=(FEATURE_DIM, 1)).astype(np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node("ReduceMean", ["skeleton_features"], ["pooled"], axes=[1], keepdims=0),
+            helper.make_node("MatMul", ["pooled", "weights"], ["logits"]),
+            helper.make_node("Sigmoid", ["logits"], ["score"]),
+        ],
+        "fall",
+        [helper.make_tensor_value_info("skeleton_features", TensorProto.FLOAT, ["batch", TIME_STEPS, FEATURE_DIM])],
+        [helper.make_tensor_value_info("score", TensorProto.FLOAT, ["batch", 1])],
+        initializer=[numpy_helper.from_array(weights, "weights")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.checker.check_model(model)
+    path = str(tmp_path_factory.mktemp("onnx") / "fall.onnx")
+    onnx.save(model, path)
+    return path, weights
+
+def test_input_shape_has_dynamic_batch(onnx_model):
+    path, _ = onnx_model
+    assert OnnxFallModel(path).input_shape == (None, TIME_STEPS, FEATURE_DIM)
+
+@pytest.mark.parametrize("batch", [1, 7, 32])
+def test_predict_matches_reference(onnx_model, batch):
+    path, weights = onnx_model
+    model = OnnxFallModel(path, threads=1)
+    x = np.random.default_rng(batch).random((batch, TIME_STEPS, FEATURE_DIM))
+    # float64 / 非連續的輸入也會轉為 float32
+    predictions = model.predict(x[:, ::-1], verbose=0)
+    assert predictions.shape == (batch, 1) and predictions.dtype == np.float32
+    np.testing.assert_allclose(predictions, reference_predict(x[:, ::-1].astype(np.float32), weights), rtol=1e-5, atol=1e-6)
@@ -0,0 +1,50 @@
+"""
+匯出的 ONNX / TFLite 模型與 Keras 輸出的數值一致性（與 tools.export_fall_model 使用相同的檢查）。
+需要 tensorflow，沒有安裝時略過；ONNX 另需 tf2onnx 與 onnxruntime。
+"""
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from app.fall_model import OnnxFallModel, TFLiteFallModel, _load_keras_model
+from app.utils.pose_normalize import FEATURE_DIM
+from tools.export_fall_model import check_parity, export_onnx, export_tflite, model_time_steps, parity_inputs
+
+TIME_STEPS = 16
+ATOL = 1e-4
+
+@pytest.fixture(scope="module")
+def keras_model(tmp_path_factory):
+    """與正式模型相同的 Conv1D + LSTM 結構（縮小），存成 .h5 後以 server 的 loader 載入"""
+    from tensorflow.keras import layers, models
+
+    tf.keras.utils.set_random_seed(0)
+    model = models.Sequential([
+        layers.Conv1D(8, kernel_size=3, activation="relu", input_shape=(TIME_STEPS, FEATURE_DIM)),
+        layers.MaxPooling1D(pool_size=2),
+        layers.LSTM(8, return_sequences=True),
+        layers.LSTM(8),
+        layers.Dense(1, activation="sigmoid"),
+    ])
+    model.compile(optimizer="adam", loss="binary_crossentropy")
+    path = str(tmp_path_factory.mktemp("model") / "fall.h5")
+    model.save(path)
+    return _load_keras_model(path)
+
+def test_keras_time_steps(keras_model):
+    assert model_time_steps(keras_model) == TIME_STEPS
+
+def test_onnx_parity(keras_model, tmp_path):
+    pytest.importorskip("tf2onnx")
+    pytest.importorskip("onnxruntime")
+    path = str(tmp_path / "fall.onnx")
+    export_onnx(keras_model, path, TIME_STEPS)
+    assert check_parity(keras_model, OnnxFallModel(path), parity_inputs(TIME_STEPS)) <= ATOL
+
+def test_tflite_parity(keras_model, tmp_path):
+    path = str(tmp_path / "fall.tflite")
+    export_tflite(keras_model, path, TIME_STEPS)
+    candidate = TFLiteFallModel(path)
+    assert candidate.input_shape == (None, TIME_STEPS, FEATURE_DIM)
+    assert check_parity(keras_model, candidate, parity_inputs(TIME_STEPS)) <= ATOL
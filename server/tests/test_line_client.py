@@ -0,0 +1,110 @@
+import asyncio
+import json
+import time
+import httpx
+import pytest
+from app.utils.line_client import LinePushClient, text_message
+from benchmarks.mock_line_server import create_mock_line_app
+
+MESSAGES = [text_message("跌倒通知")]
+
+class ScriptedLine:
+    """依序回傳預先指定的回應，並記錄每次請求"""
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    @property
+    def retry_keys(self):
+        return [request.headers.get("X-Line-Retry-Key") for request in self.requests]
+
+def run(handler, call, **client_options):
+    async def main():
+        client = LinePushClient(base_url="https://line.test", access_token="token",
+                                **{"retry_backoff": 0.001, **client_options})
+        await client.start(transport=httpx.MockTransport(handler))
+        try:
+            return await call(client)
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+def test_push_sends_token_and_payload():
+    line = ScriptedLine(httpx.Response(200, json={}))
+    assert run(line, lambda client: client.push("U1", MESSAGES)) == 200
+    (request,) = line.requests
+    assert request.url.path == "/v2/bot/message/push"
+    assert request.headers["Authorization"] == "Bearer token"
+    assert json.loads(request.content) == {"to": "U1", "messages": MESSAGES}
+
+def test_retries_server_errors_with_the_same_retry_key():
+    line = ScriptedLine(httpx.Response(500), httpx.ConnectError("reset"), httpx.Response(200, json={}))
+    assert run(line, lambda client: client.push("U1", MESSAGES)) == 200
+    assert len(line.requests) == 3
+    assert len(set(line.retry_keys)) == 1 and line.retry_keys[0]
+
+def test_each_send_gets_its_own_retry_key():
+    line = ScriptedLine(httpx.Response(200, json={}), httpx.Response(200, json={}))
+
+    async def call(client):
+        await client.push("U1", MESSAGES)
+        await client.push("U1", MESSAGES)
+
+    run(line, call)
+    assert line.retry_keys[0] != line.retry_keys[1]
+
+def test_conflict_after_retry_counts_as_sent():
+    # 第一次其實已被 LINE 接受但回應逾時，重試時收到 409
+    line = ScriptedLine(httpx.ReadTimeout("timeout"), httpx.Response(409, json={}))
+    assert run(line, lambda client: client.push("U1", MESSAGES)) == 200
+
+def test_conflict_on_first_attempt_is_not_success():
+    line = ScriptedLine(httpx.Response(409, json={}))
+    assert run(line, lambda client: client.push("U1", MESSAGES)) == 409
+    assert len(line.requests) == 1
+
+def test_client_errors_are_not_retried():
+    line = ScriptedLine(httpx.Response(400, json={}))
+    assert run(line, lambda client: client.push("U1", MESSAGES)) == 400
+    assert len(line.requests) == 1
+
+def test_honours_retry_after():
+    line = ScriptedLine(httpx.Response(429, headers={"Retry-After": "0.2"}), httpx.Response(200, json={}))
+    start = time.perf_counter()
+    # 退避時間設得很長：只有依 Retry-After 等待才會在時限內完成
+    assert run(line, lambda client: client.push("U1", MESSAGES), retry_backoff=30) == 200
+    assert 0.2 <= time.perf_counter() - start < 5
+
+def test_gives_up_after_max_retries():
+    line = ScriptedLine(*[httpx.ConnectError("down")] * 3)
+    assert run(line, lambda client: client.push("U1", MESSAGES), max_retries=2) == 0
+    assert len(line.requests) == 3
+
+def test_requires_start():
+    with pytest.raises(RuntimeError):
+        asyncio.run(LinePushClient().push("U1", MESSAGES))
+
+def test_fan_out_batches_and_dedupes_against_mock_server():
+    mock = create_mock_line_app(latency_ms=0)
+    recipients = [f"U{i}" for i in range(1200)] + ["U0", "", None]
+
+    async def main():
+        client = LinePushClient(base_url="http://line.test", access_token="token", multicast_size=500)
+        await client.start(transport=httpx.ASGITransport(app=mock))
+        try:
+            return await client.fan_out(recipients, MESSAGES)
+        finally:
+            await client.close()
+
+    sent, failed = asyncio.run(main())
+    assert failed == [] and len(sent) == 1200
+    assert mock.state.stats["requests"] == 3
+    assert sorted(mock.state.stats["delivered"]) == sorted(f"U{i}" for i in range(1200))
@@ -0,0 +1,28 @@
+from app.utils.logging_utils import LogSampler
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_allows_once_per_interval_and_counts_suppressed():
+    clock = FakeClock()
+    sampler = LogSampler(interval=10, clock=clock)
+    assert sampler.allow("a") == 0
+    assert sampler.allow("a") is None
+    assert sampler.allow("a") is None
+    # 其他 key 不受影響
+    assert sampler.allow("b") == 0
+    clock.now += 10
+    assert sampler.allow("a") == 2
+    assert sampler.allow("a") is None
+
+def test_clears_state_when_too_many_keys():
+    sampler = LogSampler(interval=10, max_keys=2, clock=FakeClock())
+    assert sampler.allow("a") == 0
+    assert sampler.allow("b") == 0
+    assert sampler.allow("c") == 0
+    # 超過 max_keys 後舊的狀態被清除，"a" 重新放行
+    assert sampler.allow("a") == 0
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.service import model_warmup as warmup_module
+from app.service.model_warmup import ModelWarmup
+
+class FakeScheduler:
+    def __init__(self):
+        self.started = False
+
+    async def start(self, model, time_steps):
+        self.started = True
+
+@pytest.fixture
+def warmup(monkeypatch):
+    monkeypatch.setattr(warmup_module, "fall_scheduler", FakeScheduler())
+    monkeypatch.setattr(warmup_module.FallModel, "get", classmethod(lambda cls: (object(), object())))
+    monkeypatch.setattr(warmup_module.FallModel, "time_steps", classmethod(lambda cls: 120))
+    monkeypatch.setattr(ModelWarmup, "_start_pose_pool", staticmethod(lambda: None))
+    monkeypatch.setattr(ModelWarmup, "_load_fall_model", staticmethod(lambda: None))
+    monkeypatch.setattr(warmup_module, "MODEL_WARMUP_BACKOFF", 0.01)
+    return ModelWarmup()
+
+def test_stop_waits_for_running_step(warmup, monkeypatch):
+    finished = threading.Event()
+
+    def slow_pose_pool():
+        time.sleep(0.3)
+        finished.set()
+
+    monkeypatch.setattr(ModelWarmup, "_start_pose_pool", staticmethod(slow_pose_pool))
+
+    async def main():
+        warmup.start()
+        await asyncio.sleep(0.05)
+        await warmup.stop()
+        # stop() 回傳時 executor 中的步驟必須已結束，之後才能安全釋放資源
+        assert finished.is_set()
+        assert not warmup.is_ready()
+
+    asyncio.run(main())
+
+def test_retries_failed_steps_with_backoff(warmup, monkeypatch):
+    calls = {"pose_pool": 0, "fall_model": 0}
+
+    def pose_pool():
+        calls["pose_pool"] += 1
+
+    def flaky_model():
+        calls["fall_model"] += 1
+        if calls["fall_model"] < 3:
+            raise OSError("model file not ready")
+
+    monkeypatch.setattr(ModelWarmup, "_start_pose_pool", staticmethod(pose_pool))
+    monkeypatch.setattr(ModelWarmup, "_load_fall_model", staticmethod(flaky_model))
+
+    async def main():
+        warmup.start()
+        assert await warmup.wait_ready()
+        status = warmup.status()
+        assert status["attempts"] == 3 and status["error"] is None
+        # 已完成的步驟不會重做
+        assert calls == {"pose_pool": 1, "fall_model": 3}
+        await warmup.stop()
+
+    asyncio.run(main())
+
+def test_gives_up_after_max_retries(warmup, monkeypatch):
+    def broken():
+        raise OSError("missing model")
+
+    monkeypatch.setattr(ModelWarmup, "_load_fall_model", staticmethod(broken))
+    monkeypatch.setattr(warmup_module, "MODEL_WARMUP_RETRIES", 2)
+
+    async def main():
+        warmup.start()
+        assert not await warmup.wait_ready()
+        status = warmup.status()
+        assert status["attempts"] == 3 and status["error"] == "missing model"
+        assert status["components"] == {"pose_pool": True, "fall_model": False, "fall_scheduler": False}
+        await warmup.stop()
+
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+import asyncio
+import time
+import pytest
+from app.service import notification_queue as queue_module
+from app.service.notification_queue import (
+    STATUS_CANCELLED, STATUS_DEAD, STATUS_PENDING, STATUS_SENDING, STATUS_SENT,
+    NotificationQueue, NotificationStore
+)
+
+@pytest.fixture
+def store(tmp_path):
+    store = NotificationStore(str(tmp_path / "queue.sqlite3"))
+    store.open()
+    yield store
+    store.close()
+
+def statuses(store, job_key):
+    return {row["recipient"]: row["status"] for row in store.select_by_job_key(job_key)}
+
+def test_enqueue_dedupes_job_key_and_recipient(store):
+    assert store.enqueue("fall:1", 1, ["U1", "U2", "U1", "", None], "跌倒") == 2
+    # 同一個 job_key 重複寫入只會新增沒見過的收件者
+    assert store.enqueue("fall:1", 1, ["U2", "U3"], "跌倒") == 1
+    # 不同 job_key 的相同收件者是另一筆工作
+    assert store.enqueue("fall:2", 2, ["U1"], "跌倒") == 1
+    assert statuses(store, "fall:1") == {"U1": STATUS_PENDING, "U2": STATUS_PENDING, "U3": STATUS_PENDING}
+
+def test_claim_marks_sending_and_respects_delay(store):
+    store.enqueue("fall:1", 1, ["U1"], "跌倒")
+    store.enqueue("fall:2", 2, ["U2"], "跌倒", delay=60)
+    (job,) = store.claim(10)
+    assert job["recipient"] == "U1" and job["attempts"] == 0
+    assert statuses(store, "fall:1") == {"U1": STATUS_SENDING}
+    assert store.select_by_job_key("fall:1")[0]["attempts"] == 1
+    # 已取出的與尚未到期的都不會再被取出
+    assert store.claim(10) == []
+
+def test_mark_sent(store):
+    store.enqueue("fall:1", 1, ["U1", "U2"], "跌倒")
+    jobs = store.claim(10)
+    store.mark_sent([job["job_id"] for job in jobs])
+    assert statuses(store, "fall:1") == {"U1": STATUS_SENT, "U2": STATUS_SENT}
+    assert store.count_by_status() == {STATUS_SENT: 2}
+
+def test_mark_failed_reschedules_with_backoff(store, monkeypatch):
+    monkeypatch.setattr(queue_module, "NOTIFY_RETRY_BASE", 5)
+    store.enqueue("fall:1", 1, ["U1"], "跌倒")
+    before = time.time()
+    store.mark_failed(store.claim(10), "LINE API 回應失敗")
+    (row,) = store.select_by_job_key("fall:1")
+    assert row["status"] == STATUS_PENDING and row["last_error"] == "LINE API 回應失敗"
+    assert row["next_attempt_at"] >= before + 5
+    assert store.claim(10) == []
+
+def test_mark_failed_marks_dead_at_max_attempts(store, monkeypatch):
+    monkeypatch.setattr(queue_module, "NOTIFY_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(queue_module, "NOTIFY_RETRY_BASE", 0)
+    store.enqueue("fall:1", 1, ["U1"], "跌倒")
+    store.mark_failed(store.claim(10), "down")
+    assert statuses(store, "fall:1") == {"U1": STATUS_PENDING}
+    store.mark_failed(store.claim(10), "down")
+    assert statuses(store, "fall:1") == {"U1": STATUS_DEAD}
+    assert store.claim(10) == []
+
+def test_mark_failed_ignores_jobs_no_longer_sending(store, monkeypatch):
+    monkeypatch.setattr(queue_module, "NOTIFY_RETRY_BASE", 0)
+    store.enqueue("fall:1", 1, ["U1"], "跌倒")
+    jobs = store.claim(10)
+    store.mark_sent([job["job_id"] for job in jobs])
+    # 例如 worker 出錯後把整批重新排程，已送出的不會被改回 pending
+    store.mark_failed(jobs, "late")
+    assert statuses(store, "fall:1") == {"U1": STATUS_SENT}
+
+def test_cancel_only_affects_pending_jobs(store):
+    store.enqueue("fall:1", 1, ["U1"], "跌倒")
+    store.mark_sent([job["job_id"] for job in store.claim(10)])
+    store.enqueue("fall:1", 1, ["U2"], "跌倒")
+    store.enqueue("fall:2", 2, ["U1"], "跌倒")
+    store.claim(10)
+    store.enqueue("fall:1", 1, ["U3"], "跌倒")
+    # 已送出與送出中的工作不會被取消
+    assert store.cancel("fall:1") == 1
+    assert statuses(store, "fall:1") == {"U1": STATUS_SENT, "U2": STATUS_SENDING, "U3": STATUS_CANCELLED}
+    assert store.cancel("fall:1") == 0
+    assert statuses(store, "fall:2") == {"U1": STATUS_SENDING}
+
+def test_open_requeues_jobs_left_sending(tmp_path):
+    path = str(tmp_path / "queue.sqlite3")
+    store = NotificationStore(path)
+    store.open()
+    store.enqueue("fall:1", 1, ["U1"], "跌倒")
+    store.claim(10)
+    store.close()
+
+    # 模擬送到一半時行程中斷，重啟後工作回到 pending 並可再次取出
+    store.open()
+    try:
+        assert statuses(store, "fall:1") == {"U1": STATUS_PENDING}
+        (job,) = store.claim(10)
+        assert job["attempts"] == 1
+    finally:
+        store.close()
+
+class FakeSender:
+    """記錄收件者，回傳全部送出成功"""
+    def __init__(self):
+        self.recipients = []
+        self.delivered = asyncio.Event()
+
+    async def __call__(self, recipients, messages):
+        self.recipients.extend(recipients)
+        self.delivered.set()
+        return list(recipients), []
+
+def test_queue_delivers_and_restarts_dead_worker(tmp_path):
+    async def main():
+        sender = FakeSender()
+        queue = NotificationQueue(str(tmp_path / "queue.sqlite3"), workers=1, sender=sender)
+        run = queue._run
+        calls = []
+
+        async def crash_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise SystemError("worker crashed")
+            await run()
+
+        queue._run = crash_once
+        await queue.start()
+        try:
+            # 第一個 worker 立即結束，由 done callback 補上新的 worker 繼續送出
+            await asyncio.sleep(0)
+            await queue.enqueue("fall:1", ["U1", "U2"], "跌倒", record_id=1)
+            await asyncio.wait_for(sender.delivered.wait(), 5)
+            assert queue.worker_restarts == 1
+            assert queue.alive_workers() == 1
+            return sender.recipients, await queue.status("fall:1")
+        finally:
+            await queue.stop()
+
+    recipients, status = asyncio.run(main())
+    assert sorted(recipients) == ["U1", "U2"]
+    assert {row["recipient"] for row in status} == {"U1", "U2"}
+
+def test_stopped_queue_does_not_restart_workers(tmp_path):
+    async def main():
+        queue = NotificationQueue(str(tmp_path / "queue.sqlite3"), workers=2, sender=FakeSender())
+        await queue.start()
+        await queue.stop()
+        return queue.worker_restarts, queue.alive_workers()
+
+    assert asyncio.run(main()) == (0, 0)
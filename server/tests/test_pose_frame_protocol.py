@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+from app.utils.pose_frame_protocol import HEADER_SIZE, decode_pose_frame, encode_pose_frame
+
+@pytest.fixture
+def keypoints():
+    return np.random.default_rng(0).random((33, 3), dtype=np.float32)
+
+@pytest.mark.parametrize("dtype", ["float16", "float32"])
+def test_round_trip(keypoints, dtype):
+    data = encode_pose_frame(keypoints, seq=7, timestamp=1700000000.25, dtype=dtype)
+    assert len(data) == HEADER_SIZE + keypoints.size * np.dtype(dtype).itemsize
+    header, decoded = decode_pose_frame(data)
+    assert (header.seq, header.timestamp, header.landmark_count, header.channels) == (7, 1700000000.25, 33, 3)
+    assert decoded.dtype == np.dtype(dtype) and not decoded.flags.writeable
+    np.testing.assert_allclose(decoded, keypoints, atol=1e-3 if dtype == "float16" else 0)
+
+def test_seq_wraps_to_uint32(keypoints):
+    header, _ = decode_pose_frame(encode_pose_frame(keypoints, seq=2 ** 32 + 5, timestamp=0.0))
+    assert header.seq == 5
+
+def test_decode_accepts_memoryview(keypoints):
+    data = encode_pose_frame(keypoints, seq=1, timestamp=0.0, dtype="float32")
+    _, decoded = decode_pose_frame(memoryview(data))
+    np.testing.assert_array_equal(decoded, keypoints)
+
+@pytest.mark.parametrize("mutate, message", [
+    (lambda data: data[:HEADER_SIZE - 1], "長度不足"),
+    (lambda data: b"XX" + data[2:], "magic"),
+    (lambda data: data[:2] + b"\x09" + data[3:], "版本"),
+    (lambda data: data[:3] + b"\x07" + data[4:], "型別"),
+    (lambda data: data[:-1], "關節數不符"),
+])
+def test_decode_rejects_malformed(keypoints, mutate, message):
+    data = encode_pose_frame(keypoints, seq=1, timestamp=0.0)
+    with pytest.raises(ValueError, match=message):
+        decode_pose_frame(mutate(data))
+
+def test_encode_rejects_bad_input(keypoints):
+    with pytest.raises(ValueError):
+        encode_pose_frame(keypoints, seq=1, timestamp=0.0, dtype="int32")
+    with pytest.raises(ValueError):
+        encode_pose_frame(keypoints.reshape(-1), seq=1, timestamp=0.0)
@@ -0,0 +1,60 @@
+import asyncio
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from app.utils.pose_normalize import (
+    FEATURE_DIM, NUM_LANDMARKS, build_features, normalize_skeleton_data,
+    prepare_model_input, prepare_model_inputs, scale_features, to_skeleton_array
+)
+
+def reference_features(skeleton):
+    """baseline 的逐幀寫法：座標攤平後接上與前一幀 (x, y) 的距離，第一幀為 0"""
+    rows = []
+    for t, frame in enumerate(skeleton):
+        accel = np.zeros(NUM_LANDMARKS) if t == 0 else np.linalg.norm(frame[:, :2] - skeleton[t - 1][:, :2], axis=1)
+        rows.append(np.concatenate([frame.reshape(-1), accel]))
+    return np.array(rows, dtype=np.float32)
+
+@pytest.fixture
+def frames():
+    return np.random.default_rng(0).random((50, NUM_LANDMARKS, 3), dtype=np.float32)
+
+def test_to_skeleton_array_pads_front(frames):
+    out = to_skeleton_array(frames[:10], time_steps=16)
+    assert out.shape == (16, NUM_LANDMARKS, 3)
+    assert not out[:6].any()
+    np.testing.assert_array_equal(out[6:], frames[:10])
+
+def test_to_skeleton_array_keeps_latest_frames(frames):
+    out = to_skeleton_array(list(frames), time_steps=20)
+    np.testing.assert_array_equal(out, frames[-20:])
+
+def test_build_features_matches_reference(frames):
+    features = build_features(frames)
+    assert features.shape == (50, FEATURE_DIM)
+    np.testing.assert_allclose(features, reference_features(frames), rtol=1e-6, atol=1e-6)
+
+def test_build_features_batched(frames):
+    batch = np.stack([frames[:20], frames[20:40]])
+    features = build_features(batch)
+    for i in range(2):
+        np.testing.assert_allclose(features[i], reference_features(batch[i]), rtol=1e-6, atol=1e-6)
+
+@pytest.mark.parametrize("scaler_cls", [MinMaxScaler, StandardScaler])
+def test_scale_features_matches_sklearn(frames, scaler_cls):
+    windows = build_features(np.stack([frames[i:i + 10] for i in range(0, 40, 5)]))
+    scaler = scaler_cls().fit(windows.reshape(len(windows), -1))
+    expected = scaler.transform(windows.reshape(len(windows), -1)).reshape(windows.shape)
+    np.testing.assert_allclose(scale_features(windows.copy(), scaler), expected, rtol=1e-5, atol=1e-5)
+
+def test_prepare_model_input_shape_and_batch_parity(frames):
+    scaler = MinMaxScaler().fit(np.random.default_rng(1).random((4, 30 * FEATURE_DIM)))
+    single = prepare_model_input(frames[:30], scaler, time_steps=30)
+    assert single.shape == (1, 30, FEATURE_DIM)
+    batched = prepare_model_inputs(frames[None, :30].copy(), scaler)
+    np.testing.assert_array_equal(single, batched)
+
+def test_normalize_skeleton_data_async(frames):
+    scaler = StandardScaler().fit(np.random.default_rng(1).random((4, 12 * FEATURE_DIM)))
+    result = asyncio.run(normalize_skeleton_data(frames, scaler, time_steps=12))
+    np.testing.assert_array_equal(result, prepare_model_input(frames, scaler, time_steps=12))
@@ -0,0 +1,84 @@
+import time
+from concurrent.futures import Future
+import numpy as np
+import pytest
+from app.utils import pose_worker_pool
+from app.utils.pose_worker_pool import PoseWorkerPool
+
+def _crashing_worker(shm_name, slot_bytes, task_queue, result_queue, max_streams):
+    """收到第一個工作就結束，模擬 worker 當掉（例如 mediapipe 原生程式錯誤）"""
+    import os
+
+    task_queue.get()
+    os._exit(3)
+
+def _echo_worker(shm_name, slot_bytes, task_queue, result_queue, max_streams):
+    """不依賴 mediapipe 的 worker：以影像左上角的像素值作為骨架結果"""
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            if task[0] != "process":
+                continue
+            _, slot, ticket, shape, _ = task
+            frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * slot_bytes)
+            result_queue.put((slot, ticket, np.full((33, 3), frame[0, 0, 0], dtype=np.float32), None))
+    finally:
+        shm.close()
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    pools = []
+    monkeypatch.setattr(pose_worker_pool, "POSE_WORKER_CHECK_INTERVAL", 0.1)
+
+    def make(worker, workers=1, slots=2):
+        monkeypatch.setattr(pose_worker_pool, "_worker_main", worker)
+        pool = PoseWorkerPool(workers=workers, slots=slots, max_frame_bytes=16 * 16 * 3)
+        pool.start()
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown(timeout=2)
+
+def frame(value: int) -> np.ndarray:
+    return np.full((16, 16, 3), value, dtype=np.uint8)
+
+def wait_for_free_slots(pool, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while pool._free_slots.qsize() < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return pool._free_slots.qsize()
+
+def test_round_trip(make_pool):
+    pool = make_pool(_echo_worker, workers=2, slots=4)
+    futures = [pool.submit(frame(i), stream_id=i % 3, timeout=5) for i in range(20)]
+    assert [int(pool.result(future, timeout=10)[0, 0]) for future in futures] == list(range(20))
+    assert wait_for_free_slots(pool, 4) == 4
+
+def test_dead_worker_fails_futures_returns_slots_and_restarts(make_pool):
+    pool = make_pool(_crashing_worker, workers=1, slots=2)
+    futures = [pool.submit(frame(1), stream_id="video", timeout=5) for _ in range(2)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="exited"):
+            pool.result(future, timeout=10)
+    # slot 全部回收，同一串流的下一個工作交給重新啟動的 worker
+    assert wait_for_free_slots(pool, 2) == 2
+    assert pool.restarts >= 1
+    with pytest.raises(RuntimeError, match="exited"):
+        pool.result(pool.submit(frame(1), stream_id="video", timeout=5), timeout=10)
+    assert wait_for_free_slots(pool, 2) == 2
+
+def test_result_times_out(make_pool):
+    pool = make_pool(_echo_worker)
+    with pytest.raises(RuntimeError, match="timed out"):
+        pool.result(Future(), timeout=0.1)
+
+def test_submit_requires_started_pool():
+    with pytest.raises(RuntimeError, match="not started"):
+        PoseWorkerPool(workers=1, slots=1).submit(frame(0))
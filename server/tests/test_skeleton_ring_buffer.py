@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from app.utils.pose_normalize import NUM_LANDMARKS, build_features, to_skeleton_array
+from app.utils.skeleton_ring_buffer import SkeletonRingBuffer
+
+def expected_window(frames, time_steps):
+    """與串流前的做法相同：取最近 time_steps 幀（前方補 0）後整段重算特徵"""
+    return build_features(to_skeleton_array(frames, time_steps))
+
+@pytest.mark.parametrize("count", [1, 5, 8, 13, 40])
+def test_window_matches_full_recompute(count):
+    time_steps = 8
+    frames = np.random.default_rng(count).random((count, NUM_LANDMARKS, 3), dtype=np.float32)
+    buffer = SkeletonRingBuffer(time_steps)
+    for frame in frames:
+        buffer.append(frame)
+    assert len(buffer) == min(count, time_steps)
+    assert buffer.is_full == (count >= time_steps)
+    np.testing.assert_allclose(buffer.window(), expected_window(frames, time_steps), rtol=1e-6, atol=1e-6)
+
+def test_window_reuses_output_buffer():
+    buffer = SkeletonRingBuffer(4)
+    frame = np.full((NUM_LANDMARKS, 3), 0.5, dtype=np.float32)
+    for _ in range(6):
+        buffer.append(frame)
+    out = np.empty((4, buffer.window().shape[1]), dtype=np.float32)
+    assert buffer.window(out=out) is out
+
+def test_clear_resets_state():
+    frames = np.random.default_rng(0).random((10, NUM_LANDMARKS, 3), dtype=np.float32)
+    buffer = SkeletonRingBuffer(6)
+    for frame in frames:
+        buffer.append(frame)
+    buffer.clear()
+    assert len(buffer) == 0 and not buffer.is_full
+    assert not buffer.window().any()
+    for frame in frames[:3]:
+        buffer.append(frame)
+    np.testing.assert_allclose(buffer.window(), expected_window(frames[:3], 6), rtol=1e-6, atol=1e-6)
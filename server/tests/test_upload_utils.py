@@ -0,0 +1,83 @@
+import asyncio
+import io
+import os
+import pytest
+from starlette.applications import Starlette
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.exceptions import PayloadTooLargeError, ValidationError
+from app.utils.upload_utils import BodySizeLimitMiddleware, is_mp4_header, save_upload_file
+
+MP4_HEAD = (24).to_bytes(4, "big") + b"ftypisom" + b"\0" * 12
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="video.mp4")
+
+class FailingFile(io.BytesIO):
+    """檔頭檢查後、複製途中失敗（例如磁碟已滿）"""
+    def read(self, size=-1):
+        if self.tell() >= len(MP4_HEAD):
+            raise OSError("disk full")
+        return super().read(size)
+
+def test_is_mp4_header():
+    assert is_mp4_header(MP4_HEAD)
+    assert not is_mp4_header(b"RIFF\0\0\0\0AVI ")
+    assert not is_mp4_header(b"\0\0")
+
+def test_save_upload_file(tmp_path):
+    data = MP4_HEAD + os.urandom(3 * 1024 * 1024)
+    path = asyncio.run(save_upload_file(upload(data), str(tmp_path), "a.mp4"))
+    assert path == str(tmp_path / "a.mp4")
+    assert (tmp_path / "a.mp4").read_bytes() == data
+    assert os.listdir(tmp_path) == ["a.mp4"]
+
+@pytest.mark.parametrize("data, error", [
+    (b"", ValidationError),
+    (b"not an mp4 file at all", ValidationError),
+    (MP4_HEAD + b"x" * 100, PayloadTooLargeError),
+])
+def test_rejects_before_writing(tmp_path, data, error):
+    with pytest.raises(error):
+        asyncio.run(save_upload_file(upload(data), str(tmp_path), "a.mp4", max_bytes=64))
+    assert os.listdir(tmp_path) == []
+
+def test_removes_part_file_on_failure(tmp_path):
+    broken = UploadFile(FailingFile(MP4_HEAD + b"x" * 1024), filename="video.mp4")
+    with pytest.raises(OSError):
+        asyncio.run(save_upload_file(broken, str(tmp_path), "a.mp4"))
+    assert os.listdir(tmp_path) == []
+
+@pytest.fixture
+def client():
+    async def upload_route(request: Request):
+        form = await request.form()
+        return JSONResponse({"size": len(await form["video"].read())})
+
+    app = Starlette(routes=[Route("/upload", upload_route, methods=["POST"])])
+    app.add_middleware(BodySizeLimitMiddleware, max_bytes=1024)
+    return TestClient(app)
+
+def test_body_within_limit(client):
+    response = client.post("/upload", files={"video": ("a.mp4", b"x" * 100, "video/mp4")})
+    assert response.status_code == 200 and response.json() == {"size": 100}
+
+def test_content_length_over_limit(client):
+    response = client.post("/upload", files={"video": ("a.mp4", b"x" * 4096, "video/mp4")})
+    assert response.status_code == 413
+
+def test_chunked_body_over_limit(client):
+    def chunks():
+        # 沒有 Content-Length，只能邊接收邊計算
+        yield b"--b\r\nContent-Disposition: form-data; name=\"video\"; filename=\"a.mp4\"\r\n\r\n"
+        for _ in range(8):
+            yield b"x" * 512
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=chunks(),
+                           headers={"Content-Type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+    assert "上限" in response.json()["detail"]
@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+import pytest
+from app.service import emergency_contacts_service, user_service
+from app.service.emergency_contacts_service import alert_contact_index
+
+USER = {"user_id": 7, "phone": "0900000007", "line_id": "U-old"}
+# user 7 是長者 1、2 的聯絡人
+RELATIONS = [{"user_id": 1}, {"user_id": 2}]
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    calls = []
+
+    @asynccontextmanager
+    async def connection():
+        yield "conn"
+
+    async def select_user_by_phone(conn, phone):
+        return USER
+
+    async def select_contact_relations(conn, user_id, role_id=None):
+        calls.append(("relations", user_id))
+        return RELATIONS
+
+    async def update_user(conn, user_id, **data):
+        calls.append(("update", user_id))
+        return True
+
+    async def delete_user(conn, phone):
+        calls.append(("delete", phone))
+        return True
+
+    monkeypatch.setattr(user_service.Database, "connection", connection)
+    monkeypatch.setattr(user_service, "select_user_by_phone", select_user_by_phone)
+    monkeypatch.setattr(user_service, "update_user", update_user)
+    monkeypatch.setattr(user_service, "delete_user", delete_user)
+    monkeypatch.setattr(emergency_contacts_service, "select_contact_relations", select_contact_relations)
+    alert_contact_index.clear()
+    for elder_id in (1, 2, 3, 7):
+        alert_contact_index.set(elder_id, [["U-old"]])
+    yield calls
+    alert_contact_index.clear()
+
+def cached():
+    return sorted(key for key in (1, 2, 3, 7) if key in alert_contact_index)
+
+def test_line_id_update_invalidates_related_elders(fake_db):
+    assert asyncio.run(user_service.update_user_info(USER["phone"], line_id="U-new"))
+    # 關係須在更新前查出
+    assert fake_db == [("relations", 7), ("update", 7)]
+    assert cached() == [3]
+
+def test_other_updates_keep_cache(fake_db):
+    assert asyncio.run(user_service.update_user_info(USER["phone"], name="王小明"))
+    assert fake_db == [("update", 7)]
+    assert cached() == [1, 2, 3, 7]
+
+def test_delete_invalidates_related_elders(fake_db):
+    assert asyncio.run(user_service.delete_user_account(USER["phone"]))
+    assert fake_db == [("relations", 7), ("delete", USER["phone"])]
+    assert cached() == [3]
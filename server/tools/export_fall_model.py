@@ -0,0 +1,93 @@
+"""
+將 Keras 跌倒模型（models/cnn_lstm_fall_detection_model.h5）匯出為 ONNX / TFLite，並檢查數值一致性。
+
+用法（於 server/ 目錄下執行，需要 tensorflow；ONNX 另需 tf2onnx 與 onnxruntime）：
+    python -m tools.export_fall_model [--format onnx tflite] [--atol 1e-4]
+
+匯出後以 FALL_MODEL_RUNTIME=onnx 或 tflite 啟動 server 即可改用輕量的推論引擎。
+一致性檢查：以固定 seed 產生不同 batch 大小的輸入（與 scaler 縮放後的值域相同，大致落在 [0, 1]），
+比較匯出模型與 Keras 的輸出，最大誤差超過 atol 時以非 0 狀態碼結束。
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+from app.fall_model import (
+    DEFAULT_TIME_STEPS, MODEL_PATH, ONNX_MODEL_PATH, TFLITE_MODEL_PATH,
+    OnnxFallModel, TFLiteFallModel, _load_keras_model
+)
+from app.utils.pose_normalize import FEATURE_DIM
+
+PARITY_BATCH_SIZES = (1, 7, 32)
+
+def model_time_steps(model) -> int:
+    shape = model.input_shape
+    return int(shape[1]) if shape[1] else DEFAULT_TIME_STEPS
+
+def export_onnx(model, path: str, time_steps: int, opset: int = 13):
+    import tensorflow as tf
+    import tf2onnx
+
+    spec = [tf.TensorSpec((None, time_steps, FEATURE_DIM), tf.float32, name="skeleton_features")]
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=opset, output_path=path)
+
+def export_tflite(model, path: str, time_steps: int):
+    import tensorflow as tf
+
+    # 固定時間步數、batch 維度保持動態，LSTM 會轉為 TFLite 內建的 UnidirectionalSequenceLSTM
+    run = tf.function(lambda x: model(x, training=False))
+    concrete = run.get_concrete_function(tf.TensorSpec((None, time_steps, FEATURE_DIM), tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS]
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+
+EXPORTERS = {
+    "onnx": (export_onnx, ONNX_MODEL_PATH, OnnxFallModel),
+    "tflite": (export_tflite, TFLITE_MODEL_PATH, TFLiteFallModel),
+}
+
+def parity_inputs(time_steps: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [rng.random((batch, time_steps, FEATURE_DIM), dtype=np.float32) for batch in PARITY_BATCH_SIZES]
+
+def check_parity(reference, candidate, inputs) -> float:
+    """回傳所有輸入中兩個模型輸出的最大絕對誤差"""
+    max_diff = 0.0
+    for x in inputs:
+        expected = np.asarray(reference.predict(x, verbose=0), dtype=np.float32)
+        actual = np.asarray(candidate.predict(x, verbose=0), dtype=np.float32)
+        if expected.shape != actual.shape:
+            raise ValueError(f"輸出形狀不一致：{expected.shape} vs {actual.shape}")
+        max_diff = max(max_diff, float(np.abs(expected - actual).max()))
+    return max_diff
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="匯出跌倒模型為 ONNX / TFLite 並檢查數值一致性")
+    parser.add_argument("--format", nargs="+", choices=list(EXPORTERS), default=list(EXPORTERS))
+    parser.add_argument("--model", default=MODEL_PATH, help="Keras 模型路徑")
+    parser.add_argument("--atol", type=float, default=1e-4, help="允許的最大絕對誤差")
+    args = parser.parse_args()
+
+    model = _load_keras_model(args.model)
+    time_steps = model_time_steps(model)
+    inputs = parity_inputs(time_steps)
+
+    failed = False
+    for fmt in args.format:
+        export, path, adapter = EXPORTERS[fmt]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        start = time.perf_counter()
+        export(model, path, time_steps)
+        size_kb = os.path.getsize(path) / 1024
+        max_diff = check_parity(model, adapter(path), inputs)
+        ok = max_diff <= args.atol
+        failed |= not ok
+        print(f"{fmt:<6} → {path} ({size_kb:.0f} KB, {time.perf_counter() - start:.1f}s) "
+              f"max |diff|={max_diff:.2e} {'✅' if ok else '❌ 超過 atol'}", file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())